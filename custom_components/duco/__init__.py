@@ -1,17 +1,17 @@
-import inspect
-
 from homeassistant.config_entries import SOURCE_REAUTH, ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
 
 from .const import DOMAIN, LOGGER, PLATFORMS
 from .coordinator import DucoDeviceUpdateCoordinator
+from .services import async_setup_services
+from .write_governor import async_remove_write_budget
 
 type DucoConfigEntry = ConfigEntry[DucoDeviceUpdateCoordinator]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: DucoConfigEntry) -> bool:
-    LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
+    LOGGER.debug("async_setup_entry")
 
     coordinator = DucoDeviceUpdateCoordinator(hass)
 
@@ -20,7 +20,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: DucoConfigEntry) -> bool
         await coordinator.async_config_entry_first_refresh()
 
     except ConfigEntryNotReady:
-        await coordinator.api.rest_handler.close()
+        # Also drops the timers and listeners, a retry creates a new coordinator
+        await coordinator.async_close()
 
         if coordinator.api_disabled:
             entry.async_start_reauth(hass)
@@ -38,7 +39,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: DucoConfigEntry) -> bool
             hass.config_entries.flow.async_abort(progress_flow["flow_id"])
 
     # Finalize
-    entry.async_on_unload(coordinator.api.rest_handler.close)
+    async_setup_services(hass)
+    entry.async_on_unload(coordinator.async_close)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
@@ -47,3 +49,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: DucoConfigEntry) -> bool
 async def async_unload_entry(hass: HomeAssistant, entry: DucoConfigEntry) -> bool:
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: DucoConfigEntry) -> None:
+    """Remove the data stored for a config entry."""
+    await async_remove_write_budget(hass, entry.entry_id)
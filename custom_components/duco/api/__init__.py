@@ -0,0 +1,56 @@
+"""Client of the local API of the Duco box, independent of Home Assistant.
+
+The names below are imported on first use, so importing the package (for a
+DTO, or the constants) does not load the client and its dependencies.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .private.duco_client import ApiError, DucoClient
+    from .private.faults import FaultConfig, FaultInjector
+    from .private.metrics import RequestMetrics
+    from .private.middleware import Middleware, Request, Response
+    from .private.recorder import TrafficRecorder, read_recording
+
+_EXPORTS = {
+    "ApiError": ".private.duco_client",
+    "DucoClient": ".private.duco_client",
+    "FaultConfig": ".private.faults",
+    "FaultInjector": ".private.faults",
+    "Middleware": ".private.middleware",
+    "Request": ".private.middleware",
+    "RequestMetrics": ".private.metrics",
+    "Response": ".private.middleware",
+    "TrafficRecorder": ".private.recorder",
+    "read_recording": ".private.recorder",
+}
+
+__all__ = [
+    "ApiError",
+    "DucoClient",
+    "FaultConfig",
+    "FaultInjector",
+    "Middleware",
+    "Request",
+    "RequestMetrics",
+    "Response",
+    "TrafficRecorder",
+    "read_recording",
+]
+
+
+def __getattr__(name: str) -> Any:
+    if (module := _EXPORTS.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_EXPORTS})
@@ -0,0 +1,21 @@
+"""Constants of the Duco API client.
+
+The client does not depend on Home Assistant, so nothing here may import the
+integration; the integration imports from here instead.
+"""
+
+import logging
+from datetime import timedelta
+
+from .tracing import Tracer
+
+# A child of the logger of the integration, so its log level applies here too
+LOGGER = logging.getLogger("custom_components.duco.api")
+TRACER = Tracer(LOGGER)
+
+API_LOCAL_IP = "192.168.5.4"
+API_PRIVATE_URL = f"https://{API_LOCAL_IP}"
+API_PUBLIC_URL = "https://vd-dev-weu-apim.azure-api.net/publicapi"
+
+# How long a resolved box address is used before it is checked again
+ENDPOINT_RESOLVE_TTL = timedelta(hours=1)
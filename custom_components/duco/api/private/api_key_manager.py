@@ -0,0 +1,110 @@
+from ..const import LOGGER
+from .api_key_generator import ApiKeyGenerator
+from .box_clock import BoxClock
+
+SECONDS_PER_DAY = 86400
+
+
+class ApiKeyManager:
+    """Derives the API keys of a box from its identity and the box day.
+
+    The key only changes when the box day (``Board.Time // 86400``) rolls
+    over, so the keys for the previous, current and next day are computed
+    up front and the current one is picked from the locally tracked box time.
+    """
+
+    _generator: ApiKeyGenerator
+    _board_serial: str
+    _mac_address: str
+
+    _clock: BoxClock
+    _day_shift: int
+    _keys: dict[int, str]
+
+    def __init__(self, board_serial: str, mac_address: str, clock: BoxClock) -> None:
+        self._generator = ApiKeyGenerator()
+        self._board_serial = board_serial
+        self._mac_address = mac_address
+
+        self._clock = clock
+        self._day_shift = 0
+        self._keys = {}
+
+    @property
+    def board_serial(self) -> str:
+        return self._board_serial
+
+    @property
+    def mac_address(self) -> str:
+        return self._mac_address
+
+    @property
+    def box_day(self) -> int:
+        return int(self.box_time() // SECONDS_PER_DAY) + self._day_shift
+
+    @property
+    def api_key(self) -> str:
+        return self.key_for_day(self.box_day)
+
+    @property
+    def expires_at(self) -> float:
+        """Local timestamp at which the current key is replaced by the next one."""
+        return self._clock.to_local(
+            (self.box_day - self._day_shift + 1) * SECONDS_PER_DAY
+        )
+
+    def box_time(self) -> float:
+        return self._clock.box_time()
+
+    def sync(self) -> None:
+        """Drop any fallback shift after the box clock was sampled again."""
+        LOGGER.debug("sync")
+
+        self._day_shift = 0
+        self.precompute()
+
+    def precompute(self) -> None:
+        """Compute the keys around the current box day and drop older ones."""
+        box_day = int(self.box_time() // SECONDS_PER_DAY)
+        days = {box_day - 1, box_day, box_day + 1}
+
+        for day in days - self._keys.keys():
+            self._keys[day] = self._generator.generate_api_key(
+                self._board_serial, self._mac_address, day * SECONDS_PER_DAY
+            )
+
+        for day in self._keys.keys() - days:
+            del self._keys[day]
+
+    def key_for_day(self, day: int) -> str:
+        if day not in self._keys:
+            self.precompute()
+
+        if (key := self._keys.get(day)) is None:
+            key = self._generator.generate_api_key(
+                self._board_serial, self._mac_address, day * SECONDS_PER_DAY
+            )
+
+        return key
+
+    def fallback_key(self, rejected_key: str) -> str:
+        """Switch to the key most likely accepted after a 401 and return it.
+
+        Without a shift the neighbouring day closest to the current box time
+        is tried, a rollover or clock skew being the likely cause. When already
+        shifted, the key of the tracked box day is restored instead. Only a
+        rejection of the current key shifts, so concurrent 401s for the same
+        key switch once instead of undoing each other.
+        """
+        if rejected_key != self.api_key:
+            return self.api_key
+
+        if self._day_shift:
+            self._day_shift = 0
+
+        else:
+            seconds_into_day = self.box_time() % SECONDS_PER_DAY
+            self._day_shift = 1 if seconds_into_day > SECONDS_PER_DAY / 2 else -1
+
+        LOGGER.warning(f"Retrying with the API key of box day {self.box_day}")
+        return self.api_key
@@ -0,0 +1,129 @@
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from ..const import LOGGER
+
+
+@dataclass
+class ClockSample:
+    local_time: float
+    offset: float
+    uncertainty: float
+
+
+class BoxClock:
+    """Estimates the offset and drift of the box clock against the local clock.
+
+    Every sample pairs a ``Board.Time`` reading with the midpoint of the
+    request that returned it (NTP style), so half the round trip bounds the
+    error. Drift is the least-squares slope of the offsets over local time.
+    """
+
+    _max_samples = 16
+    _min_drift_span = 600.0  # seconds between samples before drift is trusted
+    _resync_threshold = 2.0  # seconds of estimated error
+    _step_threshold = 30.0  # seconds, larger jumps are clock steps (NTP, reboot)
+
+    _samples: deque[ClockSample]
+    _offset: float
+    _drift: float
+    _reference: float
+
+    def __init__(self) -> None:
+        self._samples = deque(maxlen=self._max_samples)
+        self._offset = 0.0
+        self._drift = 0.0
+        self._reference = 0.0
+
+    @property
+    def synced(self) -> bool:
+        return bool(self._samples)
+
+    @property
+    def offset(self) -> float:
+        """Box time minus local time, at the moment of calling."""
+        return self._offset + self._drift * (time.time() - self._reference)
+
+    @property
+    def drift(self) -> float:
+        """Box clock drift in seconds per second."""
+        return self._drift
+
+    @property
+    def error(self) -> float:
+        """Estimated error of ``box_time()``, grows with the time since a sample."""
+        if not self._samples:
+            return float("inf")
+
+        last = self._samples[-1]
+        return last.uncertainty + abs(self._drift) * (time.time() - last.local_time)
+
+    @property
+    def needs_resync(self) -> bool:
+        return self.error > self._resync_threshold
+
+    def add_sample(self, box_time: float, sent: float, received: float) -> None:
+        """Add a ``Board.Time`` reading taken by a request sent and received locally."""
+        LOGGER.debug("add_sample")
+
+        midpoint = (sent + received) / 2
+        # Board.Time is truncated to whole seconds
+        sample = ClockSample(
+            local_time=midpoint,
+            offset=box_time + 0.5 - midpoint,
+            uncertainty=(received - sent) / 2 + 0.5,
+        )
+
+        if self._samples and abs(sample.offset - self.offset_at(midpoint)) > (
+            self._step_threshold
+        ):
+            LOGGER.warning(
+                f"Box clock stepped by {sample.offset - self.offset_at(midpoint):.0f}s, resetting estimate"
+            )
+            self._samples.clear()
+
+        self._samples.append(sample)
+        self._estimate()
+
+    def offset_at(self, local_time: float) -> float:
+        return self._offset + self._drift * (local_time - self._reference)
+
+    def box_time(self, local_time: float | None = None) -> float:
+        local_time = local_time if local_time is not None else time.time()
+        return local_time + self.offset_at(local_time)
+
+    def to_local(self, box_time: float) -> float:
+        """Local timestamp at which the box clock reads ``box_time``."""
+        return (box_time - self._offset + self._drift * self._reference) / (
+            1 + self._drift
+        )
+
+    def reset(self) -> None:
+        self._samples.clear()
+        self._offset = 0.0
+        self._drift = 0.0
+        self._reference = 0.0
+
+    def _estimate(self) -> None:
+        samples = list(self._samples)
+        last = samples[-1]
+
+        span = last.local_time - samples[0].local_time
+        if len(samples) < 2 or span < self._min_drift_span:
+            # Not enough history for a slope, use the most precise sample
+            best = min(samples, key=lambda sample: sample.uncertainty)
+            self._offset, self._drift, self._reference = best.offset, 0.0, 0.0
+            return
+
+        mean_t = sum(sample.local_time for sample in samples) / len(samples)
+        mean_o = sum(sample.offset for sample in samples) / len(samples)
+        var_t = sum((sample.local_time - mean_t) ** 2 for sample in samples)
+        cov = sum(
+            (sample.local_time - mean_t) * (sample.offset - mean_o)
+            for sample in samples
+        )
+
+        self._drift = cov / var_t
+        self._offset = mean_o
+        self._reference = mean_t
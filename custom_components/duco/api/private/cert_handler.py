@@ -1,14 +1,43 @@
-import inspect
 import ssl
+from functools import lru_cache
+from pathlib import Path
 
-from ...const import LOGGER
+from ..const import LOGGER
+
+PEM_FILEPATH = Path(__file__).resolve().parents[2] / "certs/api_cert.pem"
+
+
+@lru_cache(maxsize=2)
+def get_ssl_context(pinned: bool = False) -> ssl.SSLContext:
+    """Return the SSL context shared by all connections to the box.
+
+    Building a context (and loading the certificate) is blocking, so it is
+    done once per mode, preferably from an executor. The box presents a
+    self-signed certificate that does not match its address: without pinning
+    it is not verified at all (like ``ssl=False``), with pinning it must be
+    the certificate shipped in ``certs/api_cert.pem``.
+    """
+    LOGGER.debug("get_ssl_context pinned=%s", pinned)
+
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    context.check_hostname = False
+
+    if pinned:
+        context.load_verify_locations(cafile=PEM_FILEPATH)
+        context.verify_mode = ssl.CERT_REQUIRED
+
+    else:
+        context.verify_mode = ssl.CERT_NONE
+
+    return context
 
 
 class CustomSSLContext(ssl.SSLContext):
     _hostname: str
 
     def __new__(cls, hostname: str | None = None, protocol=ssl.PROTOCOL_TLSv1_2):
-        LOGGER.debug(f"CustomSSLContext.{inspect.currentframe().f_code.co_name}")
+        LOGGER.debug("CustomSSLContext.__new__")
 
         cls._hostname = hostname or "192.168.4.1"
         return super().__new__(cls, protocol=protocol)
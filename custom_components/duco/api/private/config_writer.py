@@ -0,0 +1,127 @@
+import asyncio
+from typing import Any
+from collections.abc import Awaitable, Callable
+
+from ..const import LOGGER
+
+
+class NodeConfigWriter:
+    """Debounces config writes per node and merges them into a single PATCH."""
+
+    _delay: float
+    _write_fn: Callable[[int, dict[str, Any]], Awaitable[bool]]
+
+    _pending: dict[int, dict[str, Any]]
+    _waiters: dict[int, list[asyncio.Future[bool]]]
+    _timers: dict[int, asyncio.TimerHandle]
+    _tasks: set[asyncio.Task[bool]]
+    _locks: dict[int, asyncio.Lock]
+
+    def __init__(
+        self,
+        write_fn: Callable[[int, dict[str, Any]], Awaitable[bool]],
+        delay: float = 1.0,
+    ) -> None:
+        self._write_fn = write_fn
+        self._delay = delay
+
+        self._pending = {}
+        self._waiters = {}
+        self._timers = {}
+        self._tasks = set()
+        self._locks = {}
+
+    @property
+    def delay(self) -> float:
+        return self._delay
+
+    @delay.setter
+    def delay(self, value: float):
+        self._delay = value
+
+    def pending(self, node_id: int) -> dict[str, Any]:
+        return self._pending.get(node_id, {})
+
+    def queue(self, node_id: int, node_config: str, value: Any) -> asyncio.Future[bool]:
+        """Queue a value; the future resolves once the merged write completed."""
+        LOGGER.debug("queue node_id=%s", node_id)
+
+        loop = asyncio.get_running_loop()
+
+        self._pending.setdefault(node_id, {})[node_config] = value
+        future: asyncio.Future[bool] = loop.create_future()
+        self._waiters.setdefault(node_id, []).append(future)
+
+        if (timer := self._timers.pop(node_id, None)) is not None:
+            timer.cancel()
+
+        self._timers[node_id] = loop.call_later(
+            self._delay, self._schedule_flush, node_id
+        )
+
+        return future
+
+    def discard(self, node_id: int, node_config: str) -> asyncio.Future[bool]:
+        """Drop a pending value, e.g. when it was set back to the stored value."""
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        future.set_result(True)
+
+        pending = self._pending.get(node_id)
+        if pending is None or pending.pop(node_config, None) is None or pending:
+            return future
+
+        # Nothing left to write for this node, release the waiters right away
+        if (timer := self._timers.pop(node_id, None)) is not None:
+            timer.cancel()
+
+        del self._pending[node_id]
+        for waiter in self._waiters.pop(node_id, []):
+            if not waiter.done():
+                waiter.set_result(True)
+
+        return future
+
+    def _schedule_flush(self, node_id: int) -> None:
+        self._timers.pop(node_id, None)
+
+        task = asyncio.get_running_loop().create_task(self.flush(node_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self, node_id: int) -> bool:
+        """Write all pending values of a node in one request."""
+        LOGGER.debug("flush node_id=%s", node_id)
+
+        if (timer := self._timers.pop(node_id, None)) is not None:
+            timer.cancel()
+
+        async with self._locks.setdefault(node_id, asyncio.Lock()):
+            values = self._pending.pop(node_id, {})
+            waiters = self._waiters.pop(node_id, [])
+            if not values:
+                return True
+
+            LOGGER.debug(
+                "Writing %d merged config value(s) to node %s", len(values), node_id
+            )
+
+            try:
+                result = await self._write_fn(node_id, values)
+
+            except Exception as e:
+                LOGGER.error(f"Error while writing config for node {node_id}: {e}")
+                result = False
+
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(result)
+
+            return result
+
+    async def flush_all(self) -> None:
+        """Write everything that is still pending, e.g. on unload."""
+        LOGGER.debug("flush_all")
+
+        await asyncio.gather(*[self.flush(node_id) for node_id in list(self._pending)])
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,39 @@
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections.abc import Iterator
+
+_request_deadline: ContextVar[float | None] = ContextVar(
+    "duco_request_deadline", default=None
+)
+
+
+@contextmanager
+def request_deadline(timeout: float) -> Iterator[float]:
+    """Give the requests issued within this block (and its tasks) a deadline.
+
+    The deadline is absolute in event loop time; a nested block can only
+    shorten the deadline of the enclosing one.
+    """
+    deadline = asyncio.get_running_loop().time() + timeout
+    if (outer := _request_deadline.get()) is not None:
+        deadline = min(deadline, outer)
+
+    token = _request_deadline.set(deadline)
+    try:
+        yield deadline
+
+    finally:
+        _request_deadline.reset(token)
+
+
+def current_deadline() -> float | None:
+    return _request_deadline.get()
+
+
+def remaining_budget() -> float | None:
+    """Seconds left until the current deadline, None when there is none."""
+    if (deadline := _request_deadline.get()) is None:
+        return None
+
+    return deadline - asyncio.get_running_loop().time()
@@ -0,0 +1,70 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+DEFAULT_THRESHOLD = 16 * 1024  # bytes, below this a thread hop costs more
+
+
+class DecodeRouter:
+    """Decides where a response body is decoded, based on its size.
+
+    Decoding (JSON, stripping the value wrappers, building the DTOs) does not
+    yield, so a large /info or node list holds up the event loop for as long
+    as it takes. Payloads above the threshold are decoded in the executor,
+    smaller ones inline where the thread hop would cost more than the decode.
+    """
+
+    _threshold: int
+    _executor: Callable[..., Awaitable[Any]] | None
+    _inline: int
+    _offloaded: int
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_THRESHOLD,
+        executor: Callable[..., Awaitable[Any]] | None = None,
+    ) -> None:
+        self._threshold = threshold
+        self._executor = executor
+        self._inline = 0
+        self._offloaded = 0
+
+    @property
+    def threshold(self) -> int:
+        return self._threshold
+
+    @threshold.setter
+    def threshold(self, value: int):
+        self._threshold = value
+
+    @property
+    def executor(self) -> Callable[..., Awaitable[Any]] | None:
+        """Runs a job off the loop, e.g. ``hass.async_add_executor_job``."""
+        return self._executor
+
+    @executor.setter
+    def executor(self, value: Callable[..., Awaitable[Any]] | None):
+        self._executor = value
+
+    def offload(self, size: int) -> bool:
+        if size > self._threshold:
+            self._offloaded += 1
+            return True
+
+        self._inline += 1
+        return False
+
+    async def run(self, func: Callable[..., _T], *args: Any) -> _T:
+        if self._executor is not None:
+            return await self._executor(func, *args)
+
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "threshold": self._threshold,
+            "inline": self._inline,
+            "offloaded": self._offloaded,
+        }
@@ -1,28 +1,71 @@
 from __future__ import annotations
 
-import inspect
+import asyncio
+import ssl
 import time
-from typing import Any
+from collections.abc import Callable
+from typing import Any, TypeVar
 from pathlib import Path
 from urllib.parse import urlparse
 
+import orjson
 from dacite import from_dict
 from dataclasses import asdict
 
-from ...api.DTO.ApiDTO import ApiDetailsDTO
-from ...api.DTO.InfoDTO import GeneralDTO, InfoDTO
-from ...api.DTO.NodeInfoDTO import NodeDataDTO, NodesDataDTO
-from ...api.DTO.ActionDTO import NodeActionTriggerDTO, NodeActionSetDTO
-from ...api.DTO.NodeActionDTO import NodeActionsDTO
-from ...api.DTO.NodeConfigDTO import NodeConfigDTO
-from ...const import LOGGER
+from ..DTO.ApiDTO import ApiDetailsDTO
+from ..DTO.ConfigDTO import ConfigDTO
+from ..DTO.InfoDTO import GeneralDTO, InfoDTO
+from ..DTO.NodeInfoDTO import NodeDataDTO, NodesDataDTO
+from ..DTO.ActionDTO import NodeActionTriggerDTO, NodeActionSetDTO
+from ..DTO.NodeActionDTO import NodeActionsDTO
+from ..DTO.NodeConfigDTO import NodeConfigDTO
+from ..const import LOGGER, TRACER
 from ..utils import remove_fields
-from .api_key_generator import ApiKeyGenerator
-from .cert_handler import CustomSSLContext
+from .api_key_manager import ApiKeyManager
+from .box_clock import BoxClock
+from .cert_handler import get_ssl_context
+from .decode_router import DecodeRouter
+from .endpoint_resolver import EndpointResolver
+from .faults import FaultInjector
+from ..watchdog import LoopWatchdog
+from .metrics import RequestMetrics
+from .middleware import Middleware
+from .recorder import TrafficRecorder
 from .rest_handler import RestHandler
 
 _FILE_PATH = Path(__file__).resolve()
 
+_T = TypeVar("_T")
+
+
+# Pure decoders, safe to run in the executor
+def _decode_body(body: bytes, decode: Callable[[Any], _T]) -> _T:
+    return decode(orjson.loads(body) if body else {})
+
+
+def _decode_info(data: dict[str, Any]) -> InfoDTO:
+    return from_dict(InfoDTO, remove_fields(data))  # type: ignore
+
+
+def _decode_nodes(data: dict[str, Any]) -> NodesDataDTO:
+    nodes = [
+        from_dict(NodeDataDTO, remove_fields(node_dict))  # type: ignore
+        for node_dict in data["Nodes"]
+    ]
+    return NodesDataDTO(**{"Nodes": nodes})  # type: ignore
+
+
+def _decode_node_info(data: dict[str, Any]) -> NodeDataDTO:
+    return from_dict(NodeDataDTO, remove_fields(data))  # type: ignore
+
+
+def _decode_node_actions(data: dict[str, Any]) -> NodeActionsDTO:
+    return from_dict(NodeActionsDTO, data)  # type: ignore
+
+
+def _decode_node_config(data: dict[str, Any]) -> NodeConfigDTO:
+    return from_dict(NodeConfigDTO, remove_fields(data))  # type: ignore
+
 
 class ApiError(Exception):
     pass
@@ -33,18 +76,49 @@ class DucoClient:
     _scheme: str
     _netloc: str
     _headers: dict[str, str]
-    _ssl_context: CustomSSLContext
+    _ssl_context: ssl.SSLContext | None
+    _pin_certificate: bool
 
     _rest_handler: RestHandler | None
+    _endpoint_resolver: EndpointResolver
+    _metrics: RequestMetrics
+    _watchdog: LoopWatchdog
+    _decode_router: DecodeRouter
+    _recorder: TrafficRecorder | None
+    _faults: FaultInjector | None
+    _request_metrics: bool
+    _middleware: tuple[Middleware, ...]
+    _max_concurrent_requests: int | None
     _info_general: GeneralDTO | None
+    _api_key_manager: ApiKeyManager | None
+    _clock: BoxClock
     _api_key: str
     _api_timestamp: float
 
-    def __init__(self, host: str) -> None:
+    def __init__(
+        self,
+        host: str,
+        resolved_host: str | None = None,
+        pin_certificate: bool = False,
+        request_metrics: bool = True,
+        middleware: tuple[Middleware, ...] = (),
+        max_concurrent_requests: int | None = None,
+    ) -> None:
         self._host = host
         parsed_url = urlparse(host)
         self._scheme = parsed_url.scheme
         self._netloc = parsed_url.netloc
+        self._endpoint_resolver = EndpointResolver(host, resolved_host)
+        self._ssl_context = None
+        self._pin_certificate = pin_certificate
+        self._metrics = RequestMetrics()
+        self._watchdog = LoopWatchdog(LOGGER)
+        self._decode_router = DecodeRouter()
+        self._recorder = None
+        self._faults = None
+        self._request_metrics = request_metrics
+        self._middleware = middleware
+        self._max_concurrent_requests = max_concurrent_requests
 
         # self._headers = {
         #     "Accept-Encoding": "gzip, deflate",
@@ -54,6 +128,8 @@ class DucoClient:
         self._headers = {}
         self._info_general = None
         self._rest_handler = None
+        self._api_key_manager = None
+        self._clock = BoxClock()
 
     @property
     def host(self) -> str:
@@ -84,9 +160,58 @@ class DucoClient:
         self._netloc = value
 
     @property
-    def ssl_context(self) -> CustomSSLContext:
+    def ssl_context(self) -> ssl.SSLContext | None:
         return self._ssl_context
 
+    @property
+    def endpoint_resolver(self) -> EndpointResolver:
+        return self._endpoint_resolver
+
+    @property
+    def metrics(self) -> RequestMetrics:
+        return self._metrics
+
+    @property
+    def watchdog(self) -> LoopWatchdog:
+        return self._watchdog
+
+    @property
+    def decode_router(self) -> DecodeRouter:
+        return self._decode_router
+
+    @property
+    def recorder(self) -> TrafficRecorder | None:
+        return self._recorder
+
+    @recorder.setter
+    def recorder(self, value: TrafficRecorder | None):
+        """Record the traffic with the box, until set to None again."""
+        self._recorder = value
+        if self._rest_handler is not None:
+            self._rest_handler.recorder = value
+
+    @property
+    def faults(self) -> FaultInjector | None:
+        return self._faults
+
+    @faults.setter
+    def faults(self, value: FaultInjector | None):
+        """Inject faults into the requests, for resilience testing only."""
+        self._faults = value
+        if self._rest_handler is not None:
+            self._rest_handler.faults = value
+
+    @property
+    def middleware(self) -> tuple[Middleware, ...]:
+        return self._middleware
+
+    @middleware.setter
+    def middleware(self, value: tuple[Middleware, ...]):
+        """Extra stages around every request attempt, outside the built-in ones."""
+        self._middleware = value
+        if self._rest_handler is not None:
+            self._rest_handler.middleware = value
+
     @property
     def api_key(self) -> str:
         return self._api_key
@@ -95,6 +220,14 @@ class DucoClient:
     def api_timestamp(self) -> float:
         return self._api_timestamp
 
+    @property
+    def api_key_manager(self) -> ApiKeyManager | None:
+        return self._api_key_manager
+
+    @property
+    def clock(self) -> BoxClock:
+        return self._clock
+
     @property
     def info_general(self) -> GeneralDTO | None:
         return self._info_general
@@ -108,27 +241,61 @@ class DucoClient:
             raise ApiError("RestHandler not initialized")
 
     async def connect(self, api_key: str | None = None) -> None:
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
+        LOGGER.debug("connect")
+
+        if self._scheme == "https" and self._ssl_context is None:
+            # One context for all connections, built off the event loop
+            self._ssl_context = await asyncio.get_running_loop().run_in_executor(
+                None, get_ssl_context, self._pin_certificate
+            )
+
+        # Reconnecting replaces the handler, its session would leak otherwise
+        await self.disconnect()
 
         if api_key:
             self._headers.update({"Api-Key": api_key})
             self._api_key = api_key
             self._api_timestamp = time.time() + 3600
-            self._rest_handler = RestHandler(self.host, self._headers)
+            self._rest_handler = self._create_rest_handler()
 
         else:
             LOGGER.debug(f"Connecting to {self.host}")
-            self._rest_handler = RestHandler(self.host, self._headers)
+            self._rest_handler = self._create_rest_handler()
             await self.update_key()
 
+    def _create_rest_handler(self) -> RestHandler:
+        return RestHandler(
+            self.host,
+            self._headers,
+            ssl_context=self._ssl_context,
+            resolver=self._endpoint_resolver,
+            metrics=self._metrics,
+            recorder=self._recorder,
+            faults=self._faults,
+            request_metrics=self._request_metrics,
+            middleware=self._middleware,
+            max_concurrent_requests=self._max_concurrent_requests,
+        )
+
     async def disconnect(self) -> None:
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
+        LOGGER.debug("disconnect")
 
         if self._rest_handler:
-            self._rest_handler = None
+            rest_handler, self._rest_handler = self._rest_handler, None
+            await rest_handler.close()
+
+    async def reset(self) -> None:
+        """Drop connection and key state that does not survive a box reboot."""
+        LOGGER.debug("reset")
+
+        if self._api_key_manager is not None:
+            self._api_key_manager.sync()
+
+        if self._rest_handler is not None:
+            await self._rest_handler.reset_session()
 
     def get_pem_filepath(self):
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
+        LOGGER.debug("get_pem_filepath")
 
         pem_filepath = _FILE_PATH.parents[2] / "certs/api_cert.pem"
         assert pem_filepath.exists(), f"File not found: {pem_filepath}"
@@ -136,7 +303,7 @@ class DucoClient:
         return pem_filepath
 
     async def _create_api_key(self, info_general: GeneralDTO):
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
+        LOGGER.debug("_create_api_key")
 
         duco_mac = info_general.Lan.Mac
         duco_serial = info_general.Board.SerialBoardBox
@@ -144,35 +311,79 @@ class DucoClient:
 
         assert duco_mac and duco_serial and duco_time, "Invalid data"
 
-        api_key_generator = ApiKeyGenerator()
-        self._api_key = api_key_generator.generate_api_key(
-            duco_serial, duco_mac, duco_time
-        )
+        if (
+            self._api_key_manager is None
+            or self._api_key_manager.board_serial != duco_serial
+            or self._api_key_manager.mac_address != duco_mac
+        ):
+            self._api_key_manager = ApiKeyManager(duco_serial, duco_mac, self._clock)
 
-        self._api_timestamp = float(duco_time)
-        self._headers.update({"Api-Key": self._api_key})
+        if not self._clock.synced:
+            now = time.time()
+            self._clock.add_sample(duco_time, now, now)
+
+        self._api_key_manager.sync()
+        self._apply_api_key()
 
         if info_general.Board.UpTime:
             up_since = time.time() - info_general.Board.UpTime * 60
             LOGGER.debug(f"DucoBox up since: {time.ctime(up_since)}")
 
+    def _apply_api_key(self) -> None:
+        assert self._api_key_manager, "API key manager not initialized"
+
+        self._api_key = self._api_key_manager.api_key
+        self._api_timestamp = self._api_key_manager.expires_at
+        self._headers.update({"Api-Key": self._api_key})
+
+        if self._rest_handler is not None:
+            self._rest_handler.api_key_manager = self._api_key_manager
+            self._rest_handler.headers.update({"Api-Key": self._api_key})
+
         LOGGER.debug(
             f"API key ({self._api_key}) valid until: {time.ctime(self._api_timestamp)}"
         )
 
     async def update_key(self) -> None:
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
+        LOGGER.debug("update_key")
+
+        # The key schedule follows the box day, no /info round-trip needed
+        if self._api_key_manager is not None:
+            if self._clock.needs_resync:
+                await self.sync_clock()
+
+            self._apply_api_key()
+            return
 
         if not self._info_general:
             await self.get_info()
 
         if self._info_general:
             await self._create_api_key(self._info_general)
-            if self._rest_handler is not None:
-                self._rest_handler.headers.update({"Api-Key": self._api_key})
+
+    async def _get_decoded(
+        self, endpoint: str, decode: Callable[[Any], _T], *span_args: Any
+    ) -> _T:
+        """Get an endpoint and decode it inline or in the executor, by size."""
+        body = await self.rest_handler.get_raw(endpoint)
+
+        started = time.perf_counter()
+        with TRACER.span("decode", *span_args, len(body)):
+            if self._decode_router.offload(len(body)):
+                result = await self._decode_router.run(_decode_body, body, decode)
+
+            else:
+                with self._watchdog.section("decode"):
+                    result = _decode_body(body, decode)
+
+        if self.rest_handler.request_metrics:
+            self._metrics.endpoint("GET", endpoint).decode.observe(
+                time.perf_counter() - started
+            )
+        return result
 
     async def get_api_info(self) -> ApiDetailsDTO | None:
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
+        LOGGER.debug("get_api_info")
 
         try:
             api_info_val_dict = await self.rest_handler.get("/api")
@@ -184,94 +395,151 @@ class DucoClient:
             return None
 
     async def get_info(self) -> InfoDTO | None:
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
+        LOGGER.debug("get_info")
         try:
-            info_val_dict = await self.rest_handler.get("/info")
-            info_dict = remove_fields(info_val_dict)
-            info = from_dict(InfoDTO, info_dict)  # type: ignore
+            sent = time.time()
+            info = await self._get_decoded("/info", _decode_info, "InfoDTO")
+            received = time.time()
 
             if info:
                 self._info_general = info.General
 
             else:
                 info_val_dict = await self.rest_handler.get_plain("/info")
-                info_dict = remove_fields(info_val_dict)
-                info = from_dict(InfoDTO, info_dict)  # type: ignore
+                info = _decode_info(info_val_dict)
                 self._info_general = info.General
 
             assert self._info_general, "Info not found"
 
+            if self._info_general.Board.Time:
+                self._clock.add_sample(self._info_general.Board.Time, sent, received)
+                if self._api_key_manager is not None:
+                    self._api_key_manager.sync()
+
             return info
 
         except Exception as e:
             LOGGER.error(f"Error while getting info: {e}")
             return None
 
+    async def get_config(self) -> ConfigDTO | None:
+        LOGGER.debug("get_config")
+
+        try:
+            config_dict = await self.rest_handler.get("/config")
+            return from_dict(ConfigDTO, config_dict)  # type: ignore
+
+        except Exception as e:
+            LOGGER.error(f"Error while getting config: {e}")
+            return None
+
+    async def sync_clock(self) -> bool:
+        """Sample the box clock with a small request instead of a full /info."""
+        LOGGER.debug("sync_clock")
+
+        try:
+            sent = time.time()
+            board_val_dict = await self.rest_handler.get(
+                "/info?module=General&submodule=Board"
+            )
+            received = time.time()
+            board = remove_fields(board_val_dict)["General"]["Board"]
+
+            if box_time := board.get("Time"):
+                self._clock.add_sample(box_time, sent, received)
+                if self._api_key_manager is not None:
+                    self._api_key_manager.sync()
+                return True
+
+        except Exception as e:
+            LOGGER.error(f"Error while syncing box clock: {e}")
+
+        return False
+
+    async def prewarm(self) -> bool:
+        """Open a connection to the box ahead of a poll.
+
+        The TLS handshake is the expensive part for the box, doing it with a
+        small request just before a poll keeps it off the poll itself (and
+        samples the box clock while at it).
+        """
+        LOGGER.debug("prewarm")
+
+        return await self.sync_clock()
+
     async def get_nodes(self) -> NodesDataDTO | None:
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
+        LOGGER.debug("get_nodes")
         try:
-            nodes_val_dict = await self.rest_handler.get("/info/nodes")
-            nodes = [
-                from_dict(NodeDataDTO, remove_fields(node_dict))  # type: ignore
-                for node_dict in nodes_val_dict["Nodes"]
-            ]
-            return NodesDataDTO(**{"Nodes": nodes})  # type: ignore
+            return await self._get_decoded("/info/nodes", _decode_nodes, "NodesDataDTO")
 
         except Exception as e:
             LOGGER.error(f"Error while getting nodes: {e}")
             return None
 
     async def get_node_info(self, node_id: int) -> NodeDataDTO | None:
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
+        LOGGER.debug("get_node_info %s", node_id)
 
         try:
-            node_info_val_dict = await self.rest_handler.get(f"/info/nodes/{node_id}")
-            node_info_dict = remove_fields(node_info_val_dict)
-            return from_dict(NodeDataDTO, node_info_dict)  # type: ignore
+            return await self._get_decoded(
+                f"/info/nodes/{node_id}", _decode_node_info, "NodeDataDTO", node_id
+            )
 
         except Exception as e:
             LOGGER.error(f"Error while getting nodes: {e}")
             return None
 
     async def get_node_supported_actions(self, node_id: int) -> NodeActionsDTO | None:
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
+        LOGGER.debug("get_node_supported_actions %s", node_id)
 
         try:
-            supported_actions = await self.rest_handler.get(f"/action/nodes/{node_id}")
-            return from_dict(NodeActionsDTO, supported_actions)  # type: ignore
+            return await self._get_decoded(
+                f"/action/nodes/{node_id}",
+                _decode_node_actions,
+                "NodeActionsDTO",
+                node_id,
+            )
 
         except Exception as e:
             LOGGER.error(f"Error while getting supported actions: {e}")
             return None
 
-    async def set_node_action_trigger(self, node_id: int, action: str):
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
+    async def set_node_action_trigger(self, node_id: int, action: str) -> bool:
+        LOGGER.debug("set_node_action_trigger %s", node_id)
 
         try:
             actions = asdict(NodeActionTriggerDTO(Action=action))
             await self.rest_handler.post(f"/action/nodes/{node_id}", actions)
-            LOGGER.debug(f"Triggered action {action} for node {node_id}")
+            LOGGER.debug("Triggered action %s for node %s", action, node_id)
+            return True
 
         except Exception as e:
             LOGGER.error(f"Error while getting action state: {e}")
+            return False
 
-    async def set_node_action_state(self, node_id: int, action: str, state: Any):
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
+    async def set_node_action_state(
+        self, node_id: int, action: str, state: Any
+    ) -> bool:
+        LOGGER.debug("set_node_action_state %s", node_id)
         try:
             actions = asdict(NodeActionSetDTO(Action=action, Val=state))
-            LOGGER.debug(f"Set action {action} to {state} for node {node_id}")
+            LOGGER.debug("Set action %s to %s for node %s", action, state, node_id)
             await self.rest_handler.post(f"/action/nodes/{node_id}", actions)
+            return True
 
         except Exception as e:
             LOGGER.error(f"Error while setting action: {e}")
+            return False
 
-    async def get_node_config(self, node_id: int):
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
+    async def get_node_config(self, node_id: int) -> NodeConfigDTO | None:
+        LOGGER.debug("get_node_config %s", node_id)
 
         try:
-            node_config_dict = await self.rest_handler.get(f"/config/nodes/{node_id}")
-            node_config_dict = remove_fields(node_config_dict)
-            return from_dict(NodeConfigDTO, node_config_dict)  # type: ignore
+            return await self._get_decoded(
+                f"/config/nodes/{node_id}",
+                _decode_node_config,
+                "NodeConfigDTO",
+                node_id,
+            )
 
         except Exception as e:
             LOGGER.error(f"Error while getting node config: {e}")
@@ -279,13 +547,24 @@ class DucoClient:
 
     async def set_node_config_value(
         self, node_id: int, node_config: str, value: int | float | str
-    ):
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
+    ) -> bool:
+        LOGGER.debug("set_node_config_value %s", node_id)
+
+        return await self.set_node_config_values(node_id, {node_config: value})
+
+    async def set_node_config_values(
+        self, node_id: int, values: dict[str, int | float | str]
+    ) -> bool:
+        LOGGER.debug("set_node_config_values %s", node_id)
 
         try:
-            node_config_dict = {node_config: {"Val": value}}
-            LOGGER.debug(f"Set config {node_config} to {value} for node {node_id}")
+            node_config_dict = {
+                node_config: {"Val": value} for node_config, value in values.items()
+            }
+            LOGGER.debug("Set config %s for node %s", values, node_id)
             await self.rest_handler.patch(f"/config/nodes/{node_id}", node_config_dict)
+            return True
 
         except Exception as e:
             LOGGER.error(f"Error while setting action: {e}")
+            return False
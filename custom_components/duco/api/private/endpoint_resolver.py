@@ -0,0 +1,189 @@
+import asyncio
+import ipaddress
+import socket
+import time
+from collections.abc import Callable
+from urllib.parse import urlparse
+
+from ..const import ENDPOINT_RESOLVE_TTL, LOGGER
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+
+    except ValueError:
+        return False
+
+    return True
+
+
+class EndpointResolver:
+    """Settles once on a working address for the box and keeps it.
+
+    The candidates are the last known address, the configured hostname and
+    ``<hostname>.local``. Each candidate is resolved and probed with a plain
+    TCP connect; the first one that answers wins and its IP address is used
+    for all requests until the TTL expires (re-resolved in the background)
+    or a connection fails (re-resolved before the request is retried).
+    """
+
+    _probe_timeout = 5  # seconds
+
+    _hostname: str
+    _port: int
+    _ttl: float
+    _address: str | None
+    _resolved_at: float
+    _resolve_task: asyncio.Task[str | None] | None
+    _on_resolved: Callable[[str], None] | None
+
+    def __init__(
+        self,
+        url: str,
+        address: str | None = None,
+        ttl: float = ENDPOINT_RESOLVE_TTL.total_seconds(),
+    ) -> None:
+        parsed_url = urlparse(url)
+        self._hostname = parsed_url.hostname or ""
+        self._port = parsed_url.port or (443 if parsed_url.scheme == "https" else 80)
+        self._ttl = ttl
+        self._resolve_task = None
+        self._on_resolved = None
+
+        if _is_ip_address(self._hostname):
+            # Nothing to resolve, the configured address is the only candidate
+            address = self._hostname
+
+        self._address = address
+        self._resolved_at = time.monotonic() if address else 0.0
+
+    @property
+    def hostname(self) -> str:
+        return self._hostname
+
+    @property
+    def address(self) -> str | None:
+        return self._address
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    @ttl.setter
+    def ttl(self, value: float):
+        self._ttl = value
+
+    @property
+    def on_resolved(self) -> Callable[[str], None] | None:
+        return self._on_resolved
+
+    @on_resolved.setter
+    def on_resolved(self, value: Callable[[str], None] | None):
+        self._on_resolved = value
+
+    @property
+    def static(self) -> bool:
+        return _is_ip_address(self._hostname)
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() - self._resolved_at > self._ttl
+
+    def candidates(self) -> list[str]:
+        if self.static:
+            return [self._hostname]
+
+        candidates = [self._hostname]
+        if not self._hostname.endswith(".local"):
+            candidates.append(f"{self._hostname}.local")
+
+        if self._address and self._address not in candidates:
+            candidates.insert(0, self._address)
+
+        return candidates
+
+    def rewrite(self, url: str) -> str:
+        """Point the URL at the resolved address, keeping scheme, port and path."""
+        if not self._address or self.static:
+            return url
+
+        parsed_url = urlparse(url)
+        if parsed_url.hostname != self._hostname:
+            return url
+
+        host = f"[{self._address}]" if ":" in self._address else self._address
+        netloc = f"{host}:{parsed_url.port}" if parsed_url.port else host
+        return parsed_url._replace(netloc=netloc).geturl()
+
+    async def async_url(self, url: str) -> str:
+        """Return the URL to use for a request, resolving first if needed."""
+        if self.static:
+            return url
+
+        if self._address is None:
+            await self.async_resolve()
+
+        elif self.expired:
+            self._async_start_resolve()
+
+        return self.rewrite(url)
+
+    async def async_resolve(self) -> str | None:
+        """Re-resolve the box, concurrent callers share one resolution."""
+        return await asyncio.shield(self._async_start_resolve())
+
+    def _async_start_resolve(self) -> asyncio.Task[str | None]:
+        if self._resolve_task is None or self._resolve_task.done():
+            self._resolve_task = asyncio.create_task(self._async_resolve())
+
+        return self._resolve_task
+
+    async def _async_resolve(self) -> str | None:
+        LOGGER.debug("_async_resolve %s", self._hostname)
+
+        for candidate in self.candidates():
+            if (address := await self._async_probe(candidate)) is None:
+                continue
+
+            self._resolved_at = time.monotonic()
+            if address != self._address:
+                LOGGER.info(f"Resolved {self._hostname} to {address} via {candidate}")
+                self._address = address
+                if self._on_resolved is not None:
+                    self._on_resolved(address)
+
+            return address
+
+        LOGGER.warning(f"Could not resolve {self._hostname} via {self.candidates()}")
+        return None
+
+    async def _async_probe(self, candidate: str) -> str | None:
+        """Return the IP address the candidate resolves to, if it accepts connections."""
+        loop = asyncio.get_running_loop()
+
+        try:
+            async with asyncio.timeout(self._probe_timeout):
+                infos = await loop.getaddrinfo(
+                    candidate, self._port, type=socket.SOCK_STREAM
+                )
+
+        except (OSError, TimeoutError) as e:
+            LOGGER.debug(f"Resolving {candidate} failed: {e}")
+            return None
+
+        for family, _, _, _, sockaddr in infos:
+            try:
+                async with asyncio.timeout(self._probe_timeout):
+                    _, writer = await asyncio.open_connection(
+                        sockaddr[0], self._port, family=family
+                    )
+
+            except (OSError, TimeoutError) as e:
+                LOGGER.debug(f"Connecting to {candidate} ({sockaddr[0]}) failed: {e}")
+                continue
+
+            writer.close()
+            return str(sockaddr[0])
+
+        return None
@@ -0,0 +1,100 @@
+import asyncio
+import random
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+from aiohttp import (
+    ClientResponseError,
+    ConnectionTimeoutError,
+    RequestInfo,
+    ServerDisconnectedError,
+)
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+
+@dataclass
+class FaultConfig:
+    """Probabilities (0-1) per attempt of each fault, and its durations."""
+
+    latency: float = 0.0
+    latency_delay: float = 1.0  # seconds
+    error_503: float = 0.0
+    disconnect: float = 0.0
+    connect_error: float = 0.0
+    truncate: float = 0.0
+    slow_read: float = 0.0
+    slow_read_delay: float = 5.0  # seconds
+    seed: int | None = None
+
+
+class FaultInjector:
+    """Makes request attempts fail like a struggling box or network would.
+
+    Opt-in for resilience benchmarks and development only. Faults are
+    injected on the client side, so they exercise the retry paths of the
+    request pipeline without a box that misbehaves: extra latency before the
+    request, a 503, a dropped connection or a failed connect instead of it,
+    and a slow or truncated body after it.
+    """
+
+    _config: FaultConfig
+    _rng: random.Random
+    injected: Counter[str]
+
+    def __init__(self, config: FaultConfig) -> None:
+        self._config = config
+        self._rng = random.Random(config.seed)
+        self.injected = Counter()
+
+    @property
+    def config(self) -> FaultConfig:
+        return self._config
+
+    @config.setter
+    def config(self, value: FaultConfig):
+        self._config = value
+
+    def _hit(self, probability: float, fault: str) -> bool:
+        if probability and self._rng.random() < probability:
+            self.injected[fault] += 1
+            return True
+
+        return False
+
+    async def before_send(self, method: str, url: str) -> None:
+        """Delay or fail the attempt before anything is sent."""
+        config = self._config
+        if self._hit(config.latency, "latency"):
+            await asyncio.sleep(config.latency_delay)
+
+        if self._hit(config.connect_error, "connect_error"):
+            raise ConnectionTimeoutError(f"Injected connect error for {url}")
+
+        if self._hit(config.disconnect, "disconnect"):
+            raise ServerDisconnectedError("Injected disconnect")
+
+        if self._hit(config.error_503, "503"):
+            raise ClientResponseError(
+                request_info=RequestInfo(
+                    URL(url), method, CIMultiDictProxy(CIMultiDict()), URL(url)
+                ),
+                history=(),
+                status=503,
+                message="Service Unavailable (injected)",
+            )
+
+    async def after_read(self, body: bytes) -> bytes:
+        """Slow down or cut off the body that was read."""
+        config = self._config
+        if self._hit(config.slow_read, "slow_read"):
+            await asyncio.sleep(config.slow_read_delay)
+
+        if body and self._hit(config.truncate, "truncate"):
+            return body[: self._rng.randrange(len(body))]
+
+        return body
+
+    def as_dict(self) -> dict[str, Any]:
+        return dict(self.injected)
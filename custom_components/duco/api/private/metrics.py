@@ -0,0 +1,172 @@
+import re
+from bisect import bisect_left
+from collections import Counter
+from typing import Any
+from urllib.parse import urlparse
+
+# Upper bounds in seconds, the last bucket counts everything above
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DECODE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def normalize_endpoint(method: str, url: str) -> str:
+    """Group requests per endpoint, e.g. ``GET /info/nodes/{id}``."""
+    parsed_url = urlparse(url)
+    endpoint = _NUMERIC_SEGMENT.sub("/{id}", parsed_url.path) or "/"
+    if parsed_url.query:
+        endpoint += f"?{parsed_url.query}"
+
+    return f"{method} {endpoint}"
+
+
+class Histogram:
+    _bounds: tuple[float, ...]
+    _counts: list[int]
+    _count: int
+    _total: float
+    _max: float
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def total(self) -> float:
+        return self._total
+
+    @property
+    def mean(self) -> float | None:
+        return self._total / self._count if self._count else None
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self._bounds, value)] += 1
+        self._count += 1
+        self._total += value
+        self._max = max(self._max, value)
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-quantile (max for the last)."""
+        if not self._count:
+            return None
+
+        rank = q * self._count
+        seen = 0
+        for bound, count in zip(self._bounds, self._counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self._max)
+
+        return self._max
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self._count,
+            "mean": self.mean,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self._max if self._count else None,
+            "buckets": {
+                **{
+                    f"le_{bound}": count
+                    for bound, count in zip(self._bounds, self._counts)
+                },
+                "inf": self._counts[-1],
+            },
+        }
+
+
+class EndpointMetrics:
+    """Counters of one endpoint of the box."""
+
+    requests: int
+    errors: int
+    status_503: int
+    disconnects: int
+    bytes_in: int
+    bytes_out: int
+    retries: Counter[str]
+    latency: Histogram
+    decode: Histogram
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.status_503 = 0
+        self.disconnects = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.retries = Counter()
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.decode = Histogram(DECODE_BUCKETS)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "status_503": self.status_503,
+            "disconnects": self.disconnects,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "retries": dict(self.retries),
+            "latency": self.latency.as_dict(),
+            "decode": self.decode.as_dict(),
+        }
+
+
+class RequestMetrics:
+    """Per-endpoint latency, retries, failures and traffic of the box requests.
+
+    Every attempt is counted as a request. Latency is measured for successful
+    attempts, from the moment they got a scheduler slot until the body was
+    read, so time spent queueing behind other requests is not included.
+    Decode is the time spent parsing the JSON body, for the reads of the
+    client including building the DTOs (in the executor for large bodies).
+    """
+
+    _endpoints: dict[str, EndpointMetrics]
+
+    def __init__(self) -> None:
+        self._endpoints = {}
+
+    def endpoint(self, method: str, url: str) -> EndpointMetrics:
+        key = normalize_endpoint(method, url)
+        if (metrics := self._endpoints.get(key)) is None:
+            metrics = self._endpoints[key] = EndpointMetrics()
+
+        return metrics
+
+    def totals(self) -> dict[str, Any]:
+        endpoints = self._endpoints.values()
+        responses = sum(metrics.latency.count for metrics in endpoints)
+        latency = sum(metrics.latency.total for metrics in endpoints)
+        return {
+            "requests": sum(metrics.requests for metrics in endpoints),
+            "errors": sum(metrics.errors for metrics in endpoints),
+            "retries": sum(sum(metrics.retries.values()) for metrics in endpoints),
+            "status_503": sum(metrics.status_503 for metrics in endpoints),
+            "disconnects": sum(metrics.disconnects for metrics in endpoints),
+            "bytes_in": sum(metrics.bytes_in for metrics in endpoints),
+            "bytes_out": sum(metrics.bytes_out for metrics in endpoints),
+            "latency_mean": latency / responses if responses else None,
+        }
+
+    def reset(self) -> None:
+        self._endpoints.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "totals": self.totals(),
+            "endpoints": {
+                key: metrics.as_dict()
+                for key, metrics in sorted(self._endpoints.items())
+            },
+        }
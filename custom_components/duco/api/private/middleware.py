@@ -0,0 +1,136 @@
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Protocol
+
+from aiohttp import ClientResponseError, RequestInfo
+
+from .api_key_manager import ApiKeyManager
+from .faults import FaultInjector
+from .metrics import RequestMetrics
+from .recorder import TrafficRecorder
+
+
+@dataclass(slots=True)
+class Request:
+    """One attempt of a request, as it passes through the middleware."""
+
+    method: str
+    url: str  # as requested, the host is not resolved
+    request_url: str  # what is sent
+    headers: dict[str, str]
+    data: str | None
+
+
+@dataclass(slots=True)
+class Response:
+    status: int
+    body: bytes
+    request_info: RequestInfo | None = None
+    history: tuple[Any, ...] = ()
+    reason: str | None = None
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise ClientResponseError(
+                request_info=self.request_info,  # type: ignore[arg-type]
+                history=self.history,
+                status=self.status,
+                message=self.reason or "",
+            )
+
+
+type Handler = Callable[[Request], Awaitable[Response]]
+
+
+class Middleware(Protocol):
+    """A stage around the attempts of a request, calls ``call_next`` to send it.
+
+    Stages may change the request before passing it on, the response or body
+    that comes back, or fail the attempt by raising like the session would.
+    """
+
+    async def __call__(self, request: Request, call_next: Handler) -> Response: ...
+
+
+def build_chain(stages: Iterable[Middleware], send: Handler) -> Handler:
+    """Wrap ``send`` in the stages, the first one is the outermost."""
+    handler = send
+    for stage in reversed(list(stages)):
+        handler = partial(stage, call_next=handler)
+
+    return handler
+
+
+class ApiKeyMiddleware:
+    """Sends the key that is valid now, picked up again on every attempt."""
+
+    _api_key_manager: ApiKeyManager
+
+    def __init__(self, api_key_manager: ApiKeyManager) -> None:
+        self._api_key_manager = api_key_manager
+
+    async def __call__(self, request: Request, call_next: Handler) -> Response:
+        request.headers["Api-Key"] = self._api_key_manager.api_key
+        return await call_next(request)
+
+
+class MetricsMiddleware:
+    """Counts the attempts and their traffic, times the successful ones."""
+
+    _metrics: RequestMetrics
+
+    def __init__(self, metrics: RequestMetrics) -> None:
+        self._metrics = metrics
+
+    async def __call__(self, request: Request, call_next: Handler) -> Response:
+        metrics = self._metrics.endpoint(request.method, request.url)
+        metrics.requests += 1
+        if request.data is not None:
+            metrics.bytes_out += len(request.data)
+
+        started = time.perf_counter()
+        response = await call_next(request)
+        if response.status < 400:
+            metrics.latency.observe(time.perf_counter() - started)
+            metrics.bytes_in += len(response.body)
+
+        return response
+
+
+class RecordingMiddleware:
+    """Records every attempt that got a response, see ``TrafficRecorder``."""
+
+    _recorder: TrafficRecorder
+
+    def __init__(self, recorder: TrafficRecorder) -> None:
+        self._recorder = recorder
+
+    async def __call__(self, request: Request, call_next: Handler) -> Response:
+        started = time.perf_counter()
+        response = await call_next(request)
+        self._recorder.record(
+            request.method,
+            request.url,
+            response.status,
+            time.perf_counter() - started,
+            request.data,
+            response.body if response.status < 400 else None,
+        )
+        return response
+
+
+class FaultMiddleware:
+    """Injects faults around the exchange with the box, see ``FaultInjector``."""
+
+    _faults: FaultInjector
+
+    def __init__(self, faults: FaultInjector) -> None:
+        self._faults = faults
+
+    async def __call__(self, request: Request, call_next: Handler) -> Response:
+        await self._faults.before_send(request.method, request.url)
+        response = await call_next(request)
+        response.body = await self._faults.after_read(response.body)
+        return response
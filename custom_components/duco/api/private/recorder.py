@@ -0,0 +1,168 @@
+import gzip
+import re
+import time
+from typing import Any
+from urllib.parse import urlparse
+
+import orjson
+
+RECORDING_VERSION = 1
+MAX_ENTRIES = 100_000
+REDACTED = "**REDACTED**"
+
+# Identifiers are replaced consistently, so a recording still tells nodes apart
+_IDENTIFIER_KEYS = {
+    "SerialBoard",
+    "SerialBoardBox",
+    "SerialBoardComm",
+    "SerialDuco",
+    "SerialDucoBox",
+    "SerialDucoComm",
+    "DeviceId",
+    "Mac",
+}
+_PRIVATE_KEYS = {
+    "HomeId",
+    "HostName",
+    "Ssid",
+    "WifiClientSsid",
+    "WifiClientKey",
+}
+_MAC_ADDRESS = re.compile(r"\b(?:[0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2}\b")
+_UNSET = {"", "n/a", None}
+
+
+class Redactor:
+    """Replaces serials, MAC addresses and network names in box payloads."""
+
+    _identifiers: dict[str, str]
+
+    def __init__(self) -> None:
+        self._identifiers = {}
+
+    def _identifier(self, value: str) -> str:
+        if (placeholder := self._identifiers.get(value)) is None:
+            count = len(self._identifiers) + 1
+            placeholder = self._identifiers[value] = (
+                f"02:00:00:00:{count >> 8 & 255:02x}:{count & 255:02x}"
+                if _MAC_ADDRESS.fullmatch(value)
+                else f"SERIAL{count:06d}"
+            )
+
+        return placeholder
+
+    def _value(self, key: str, value: Any) -> Any:
+        if isinstance(value, dict) and "Val" in value:
+            return {**value, "Val": self._value(key, value["Val"])}
+
+        if not isinstance(value, str) or value in _UNSET:
+            return value
+
+        if key in _IDENTIFIER_KEYS:
+            return self._identifier(value)
+
+        return REDACTED
+
+    def redact(self, data: Any) -> Any:
+        if isinstance(data, dict):
+            return {
+                key: (
+                    self._value(key, value)
+                    if key in _IDENTIFIER_KEYS or key in _PRIVATE_KEYS
+                    else self.redact(value)
+                )
+                for key, value in data.items()
+            }
+
+        if isinstance(data, list):
+            return [self.redact(item) for item in data]
+
+        if isinstance(data, str) and _MAC_ADDRESS.search(data):
+            return _MAC_ADDRESS.sub(lambda match: self._identifier(match[0]), data)
+
+        return data
+
+
+class TrafficRecorder:
+    """Records the requests to the box with their responses and timing.
+
+    Entries are kept in memory (up to a limit) and written in one go with
+    ``write``, which blocks, as gzipped JSON lines: a header, then per
+    request the offset from the start of the recording, method, path,
+    status, latency, and the request and response bodies, redacted.
+    """
+
+    _started: float
+    _redactor: Redactor
+    _entries: list[dict[str, Any]]
+    _dropped: int
+
+    def __init__(self) -> None:
+        self._started = time.monotonic()
+        self._redactor = Redactor()
+        self._entries = []
+        self._dropped = 0
+
+    @property
+    def entries(self) -> list[dict[str, Any]]:
+        return self._entries
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        latency: float,
+        request_body: str | None,
+        response_body: bytes | None,
+    ) -> None:
+        if len(self._entries) >= MAX_ENTRIES:
+            self._dropped += 1
+            return
+
+        parsed_url = urlparse(url)
+        entry: dict[str, Any] = {
+            "t": round(time.monotonic() - self._started - latency, 6),
+            "m": method,
+            "p": parsed_url.path + (f"?{parsed_url.query}" if parsed_url.query else ""),
+            "s": status,
+            "l": round(latency, 6),
+        }
+        if request_body is not None:
+            entry["q"] = self._redactor.redact(orjson.loads(request_body))
+
+        if response_body:
+            try:
+                entry["b"] = self._redactor.redact(orjson.loads(response_body))
+
+            except orjson.JSONDecodeError:
+                entry["r"] = self._redactor.redact(
+                    response_body.decode(errors="replace")
+                )
+
+        self._entries.append(entry)
+
+    def write(self, path: str) -> int:
+        """Write the recording, returns the number of requests in it."""
+        header = {
+            "version": RECORDING_VERSION,
+            "recorded": time.time(),
+            "requests": len(self._entries),
+            "dropped": self._dropped,
+        }
+        with gzip.open(path, "wb") as file:
+            file.write(orjson.dumps(header) + b"\n")
+            for entry in self._entries:
+                file.write(orjson.dumps(entry) + b"\n")
+
+        return len(self._entries)
+
+
+def read_recording(path: str) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Read a recording, returns its header and entries."""
+    with gzip.open(path, "rb") as file:
+        header = orjson.loads(file.readline())
+        if header.get("version") != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version: {header.get('version')}")
+
+        return header, [orjson.loads(line) for line in file if line.strip()]
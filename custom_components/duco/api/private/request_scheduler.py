@@ -0,0 +1,138 @@
+import asyncio
+import heapq
+import itertools
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from collections.abc import AsyncIterator, Iterator
+
+
+class RequestPriority(IntEnum):
+    INTERACTIVE_WRITE = 0
+    INTERACTIVE_READ = 1
+    BACKGROUND = 2
+
+
+_request_priority: ContextVar[RequestPriority] = ContextVar(
+    "duco_request_priority", default=RequestPriority.INTERACTIVE_READ
+)
+
+
+@contextmanager
+def request_priority(priority: RequestPriority) -> Iterator[None]:
+    """Run the requests issued within this block (and its tasks) at a priority."""
+    token = _request_priority.set(priority)
+    try:
+        yield
+
+    finally:
+        _request_priority.reset(token)
+
+
+def current_priority() -> RequestPriority:
+    return _request_priority.get()
+
+
+class RequestScheduler:
+    """Limits concurrent box requests and hands out free slots by priority.
+
+    Background requests never occupy the last slot, so an interactive request
+    can always start right away instead of queueing behind a polling burst.
+    """
+
+    _max_concurrent: int
+    _max_background: int
+    _active: int
+    _active_background: int
+    _waiters: list[tuple[RequestPriority, int, asyncio.Future[None]]]
+
+    def __init__(self, max_concurrent: int = 3) -> None:
+        self._max_concurrent = max(max_concurrent, 1)
+        self._max_background = max(self._max_concurrent - 1, 1)
+        self._active = 0
+        self._active_background = 0
+        self._waiters = []
+        self._counter = itertools.count()
+
+    @property
+    def max_concurrent(self) -> int:
+        return self._max_concurrent
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    @asynccontextmanager
+    async def slot(self, priority: RequestPriority) -> AsyncIterator[None]:
+        await self._acquire(priority)
+        try:
+            yield
+
+        finally:
+            self._release(priority)
+
+    def _can_start(self, priority: RequestPriority) -> bool:
+        if self._active >= self._max_concurrent:
+            return False
+
+        return (
+            priority != RequestPriority.BACKGROUND
+            or self._active_background < self._max_background
+        )
+
+    def _start(self, priority: RequestPriority) -> None:
+        self._active += 1
+        if priority == RequestPriority.BACKGROUND:
+            self._active_background += 1
+
+    async def _acquire(self, priority: RequestPriority) -> None:
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+
+        if self._can_start(priority) and (
+            not self._waiters or self._waiters[0][0] > priority
+        ):
+            self._start(priority)
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+
+        try:
+            await future
+
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before the cancellation
+                self._release(priority)
+
+            else:
+                future.cancel()
+                self._wake()
+
+            raise
+
+    def _release(self, priority: RequestPriority) -> None:
+        self._active -= 1
+        if priority == RequestPriority.BACKGROUND:
+            self._active_background -= 1
+
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+
+            if not self._can_start(priority):
+                return
+
+            heapq.heappop(self._waiters)
+            self._start(priority)
+            future.set_result(None)
@@ -1,31 +1,71 @@
 import asyncio
-import inspect
 import ssl
+import time
 import orjson
 from typing import Any
 from urllib.parse import urlparse
 
 from aiohttp import (
     ClientResponseError,
-    ClientConnectorDNSError,
+    ClientConnectorError,
+    ConnectionTimeoutError,
     ServerDisconnectedError,
     ClientSession,
     ClientTimeout,
     TCPConnector,
 )
 
-from ...const import LOGGER
+from ..const import LOGGER, TRACER
+from .api_key_manager import ApiKeyManager
+from .deadline import current_deadline
+from .endpoint_resolver import EndpointResolver
+from .faults import FaultInjector
+from .metrics import RequestMetrics
+from .middleware import (
+    ApiKeyMiddleware,
+    FaultMiddleware,
+    Handler,
+    MetricsMiddleware,
+    Middleware,
+    RecordingMiddleware,
+    Request,
+    Response,
+    build_chain,
+)
+from .recorder import TrafficRecorder
+from .request_scheduler import RequestPriority, RequestScheduler, current_priority
 
 
 class RestHandler:
+    """Sends the requests to the box, retrying them where that makes sense.
+
+    Every attempt passes through a chain of middleware around one send: the
+    extra stages of the owner first, then the current API key, metrics,
+    recording and fault injection. Stages that are not enabled are not part
+    of the chain at all; it is rebuilt when one is switched on or off.
+    """
+
     _max_retries = 5
     _base_delay = 1  # seconds
+    _max_concurrent_requests = 3
+    _keepalive_timeout = 30  # seconds, outlives the pre-warm before a poll
+    _timeout = ClientTimeout(total=30, sock_connect=10)
 
     _retriable_status_codes = {503}
+    _unauthorized_status_code = 401
 
     _ssl_context: ssl.SSLContext | None
     _connector: TCPConnector | None
     _client_session: ClientSession
+    _scheduler: RequestScheduler
+    _resolver: EndpointResolver
+    _metrics: RequestMetrics
+    _recorder: TrafficRecorder | None
+    _faults: FaultInjector | None
+    _api_key_manager: ApiKeyManager | None
+    _request_metrics: bool
+    _middleware: tuple[Middleware, ...]
+    _chain: Handler
 
     _headers: dict[str, str]
 
@@ -35,12 +75,31 @@ class RestHandler:
         headers: dict[str, str],
         ssl_context: ssl.SSLContext | None = None,
         connector: TCPConnector | None = None,
+        resolver: EndpointResolver | None = None,
+        metrics: RequestMetrics | None = None,
+        recorder: TrafficRecorder | None = None,
+        faults: FaultInjector | None = None,
+        request_metrics: bool = True,
+        middleware: tuple[Middleware, ...] = (),
+        max_concurrent_requests: int | None = None,
     ):
         self._base_url = base_url  # https://192.168.5.4
+        if max_concurrent_requests is not None:
+            self._max_concurrent_requests = max_concurrent_requests
+
         self._headers = headers
         self._ssl_context = ssl_context
         self._connector = connector
-        self._client_session = ClientSession()
+        self._client_session = self._create_session()
+        self._scheduler = RequestScheduler(self._max_concurrent_requests)
+        self._resolver = resolver or EndpointResolver(base_url)
+        self._metrics = metrics or RequestMetrics()
+        self._recorder = recorder
+        self._faults = faults
+        self._api_key_manager = None
+        self._request_metrics = request_metrics
+        self._middleware = middleware
+        self._build_chain()
 
         scheme, host, port, path, query, fragment = urlparse(
             base_url
@@ -58,13 +117,38 @@ class RestHandler:
 
         self.headers.update({"Content-Type": "application/json"})
 
-    def __del__(self):
-        try:
-            asyncio.create_task(self.close())
+    def _create_session(self) -> ClientSession:
+        """Create a session that keeps connections (and their TLS) alive."""
+        if self._connector is not None:
+            return ClientSession(connector=self._connector, connector_owner=False)
+
+        return ClientSession(
+            connector=TCPConnector(
+                ssl=self._ssl_context or False,
+                limit_per_host=self._max_concurrent_requests,
+                keepalive_timeout=self._keepalive_timeout,
+            )
+        )
 
-        except Exception as e:
-            LOGGER.warning(f"Error while closing session: {e}")
-            asyncio.new_event_loop().run_until_complete(self.close())
+    def _build_chain(self) -> None:
+        stages: list[Middleware] = list(self._middleware)
+        if self._api_key_manager is not None:
+            stages.append(ApiKeyMiddleware(self._api_key_manager))
+
+        if self._request_metrics:
+            stages.append(MetricsMiddleware(self._metrics))
+
+        if self._recorder is not None:
+            stages.append(RecordingMiddleware(self._recorder))
+
+        if self._faults is not None:
+            stages.append(FaultMiddleware(self._faults))
+
+        self._chain = build_chain(stages, self._send)
+
+    @property
+    def ssl_context(self) -> ssl.SSLContext | None:
+        return self._ssl_context
 
     @property
     def max_retries(self) -> int:
@@ -82,6 +166,63 @@ class RestHandler:
     def base_delay(self, value: float):
         self._base_delay = value
 
+    @property
+    def scheduler(self) -> RequestScheduler:
+        return self._scheduler
+
+    @property
+    def resolver(self) -> EndpointResolver:
+        return self._resolver
+
+    @property
+    def metrics(self) -> RequestMetrics:
+        return self._metrics
+
+    @property
+    def recorder(self) -> TrafficRecorder | None:
+        return self._recorder
+
+    @recorder.setter
+    def recorder(self, value: TrafficRecorder | None):
+        self._recorder = value
+        self._build_chain()
+
+    @property
+    def faults(self) -> FaultInjector | None:
+        return self._faults
+
+    @faults.setter
+    def faults(self, value: FaultInjector | None):
+        self._faults = value
+        self._build_chain()
+
+    @property
+    def request_metrics(self) -> bool:
+        return self._request_metrics
+
+    @request_metrics.setter
+    def request_metrics(self, value: bool):
+        self._request_metrics = value
+        self._build_chain()
+
+    @property
+    def middleware(self) -> tuple[Middleware, ...]:
+        return self._middleware
+
+    @middleware.setter
+    def middleware(self, value: tuple[Middleware, ...]):
+        self._middleware = value
+        self._build_chain()
+
+    @property
+    def api_key_manager(self) -> ApiKeyManager | None:
+        return self._api_key_manager
+
+    @api_key_manager.setter
+    def api_key_manager(self, value: ApiKeyManager | None):
+        self._api_key_manager = value
+        self._build_chain()
+
     @property
     def headers(self) -> dict[str, str]:
         return self._headers
@@ -90,7 +231,20 @@ class RestHandler:
     def headers(self, value: dict[str, str]):
         self._headers = value
 
+    async def reset_session(self):
+        """Replace the session, dropping pooled connections to a rebooted box."""
+        session, self._client_session = self._client_session, self._create_session()
+        await session.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._client_session.closed
+
     async def close(self):
+        """Close the session, the owner of the handler has to call this."""
+        if self._client_session.closed:
+            return
+
         try:
             await self._client_session.close()
 
@@ -98,9 +252,7 @@ class RestHandler:
             LOGGER.error(f"Error while closing session: {e}")
 
     async def get(self, endpoint: str) -> dict[str, Any]:
-        LOGGER.debug(
-            f"{inspect.currentframe().f_code.co_name}  {self._base_url}{endpoint}"
-        )
+        LOGGER.debug("get %s%s", self._base_url, endpoint)
 
         response_data = await self.get_with_retries(f"{self._base_url}{endpoint}")
         if response_data:
@@ -109,9 +261,7 @@ class RestHandler:
         return {}
 
     async def get_plain(self, endpoint: str) -> dict[str, Any]:
-        LOGGER.debug(
-            f"{inspect.currentframe().f_code.co_name}  {self._plain_url}{endpoint}"
-        )
+        LOGGER.debug("get_plain %s%s", self._plain_url, endpoint)
 
         response_data = await self.get_with_retries(f"{self._plain_url}{endpoint}")
         if response_data:
@@ -119,10 +269,17 @@ class RestHandler:
 
         return {}
 
-    async def post(self, endpoint: str, data: dict[str, Any]) -> dict[str, Any]:
-        LOGGER.debug(
-            f"{inspect.currentframe().f_code.co_name}  {self._base_url}{endpoint}"
+    async def get_raw(self, endpoint: str) -> bytes:
+        """Get the body as is, for the caller to decode where it sees fit."""
+        LOGGER.debug("get_raw %s%s", self._base_url, endpoint)
+
+        response_data = await self.request_with_retries(
+            "GET", f"{self._base_url}{endpoint}", raw=True
         )
+        return response_data or b""
+
+    async def post(self, endpoint: str, data: dict[str, Any]) -> dict[str, Any]:
+        LOGGER.debug("post %s%s", self._base_url, endpoint)
 
         response_data = await self.post_with_retries(
             f"{self._base_url}{endpoint}", data
@@ -133,9 +290,7 @@ class RestHandler:
         return {}
 
     async def patch(self, endpoint: str, data: dict[str, Any]):
-        LOGGER.debug(
-            f"{inspect.currentframe().f_code.co_name}  {self._base_url}{endpoint}"
-        )
+        LOGGER.debug("patch %s%s", self._base_url, endpoint)
 
         response_data = await self.patch_with_retries(
             f"{self._base_url}{endpoint}", data
@@ -149,7 +304,7 @@ class RestHandler:
         async with self._client_session.delete(
             f"{self._base_url}{endpoint}",
             headers=self._headers,
-            ssl=False,
+            ssl=self._ssl_context or False,
         ) as response:
             response.raise_for_status()
             data = await response.json()
@@ -159,7 +314,7 @@ class RestHandler:
         async with self._client_session.head(
             f"{self._base_url}{endpoint}",
             headers=self._headers,
-            ssl=False,
+            ssl=self._ssl_context or False,
         ) as response:
             response.raise_for_status()
             data = await response.json()
@@ -170,229 +325,211 @@ class RestHandler:
         url: str,
         data: dict[str, Any],
     ) -> dict[str, Any] | None:
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
-
-        data_str = orjson.dumps(data).decode("utf-8")
-
-        retries = 0
-        while retries < self.max_retries:
-            try:
-                async with self._client_session.patch(
-                    url,
-                    headers=self.headers,
-                    ssl=False,
-                    timeout=ClientTimeout(total=20000, sock_connect=300),
-                    data=data_str,
-                ) as response:
-                    LOGGER.debug(f"Response status: {response.status}")
-
-                    if response.status in self._retriable_status_codes:
-                        raise ClientResponseError(
-                            request_info=response.request_info,
-                            history=response.history,
-                            status=response.status,
-                            message="Service Unavailable",
-                        )
-
-                    else:
-                        response.raise_for_status()
-
-                    return await response.json()
-
-            except ClientResponseError as e:
-                if e.status in self._retriable_status_codes:
-                    retries += 1
-                    delay = self.base_delay * (2 ** (retries - 1))
-                    LOGGER.warning(
-                        f"Retry {retries}/{self.max_retries}: Waiting {delay:.2f} seconds ({e.status} received)"
-                    )
-                    await asyncio.sleep(delay)
-
-                else:
-                    raise  # Reraise for other HTTP errors
-
-            except ClientConnectorDNSError as e:
-                LOGGER.error(f"DNS resolution error: {e}")
-
-                urlparsed = urlparse(url)
-                if urlparsed.netloc.endswith(".local"):
-                    LOGGER.warning(f"Already tried with {url}")
-                    raise
-
-                url = urlparsed._replace(netloc=urlparsed.netloc + ".local").geturl()
-                LOGGER.warning(f"Retrying with {url}")
-                await asyncio.sleep(self.base_delay)
+        LOGGER.debug("patch_with_retries")
 
-            except ServerDisconnectedError as e:
-                LOGGER.error(f"Server disconnected error: {e}")
-                retries += 1
-                delay = self.base_delay * (2 ** (retries - 1))
-                LOGGER.warning(
-                    f"Retry {retries}/{self.max_retries}: Waiting {delay:.2f} seconds ({e.message} received)"
-                )
-                await asyncio.sleep(delay)
-
-            except Exception as e:
-                LOGGER.error(f"{type(e)=}, Error fetching {url}: {e}")
-                raise
-
-        LOGGER.warning(f"Failed to post {url} after {self.max_retries} retries.")
-        return None
+        return await self.request_with_retries("PATCH", url, data)
 
     async def post_with_retries(
         self,
         url: str,
         data: dict[str, Any],
     ) -> dict[str, Any] | None:
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
-
-        data_str = orjson.dumps(data).decode("utf-8")
-
-        retries = 0
-        while retries < self.max_retries:
-            try:
-                async with self._client_session.post(
-                    url,
-                    headers=self.headers,
-                    ssl=False,
-                    timeout=ClientTimeout(total=20000, sock_connect=300),
-                    data=data_str,
-                ) as response:
-                    LOGGER.debug(f"Response status: {response.status}")
-
-                    if response.status in self._retriable_status_codes:
-                        raise ClientResponseError(
-                            request_info=response.request_info,
-                            history=response.history,
-                            status=response.status,
-                            message="Service Unavailable",
-                        )
-
-                    else:
-                        response.raise_for_status()
-
-                    return await response.json()
-
-            except ClientResponseError as e:
-                if e.status in self._retriable_status_codes:
-                    retries += 1
-                    delay = self.base_delay * (2 ** (retries - 1))
-                    LOGGER.warning(
-                        f"Retry {retries}/{self.max_retries}: Waiting {delay:.2f} seconds ({e.status} received)"
-                    )
-                    await asyncio.sleep(delay)
-
-                else:
-                    raise  # Reraise for other HTTP errors
-
-            except ClientConnectorDNSError as e:
-                LOGGER.error(f"DNS resolution error: {e}")
+        LOGGER.debug("post_with_retries")
 
-                urlparsed = urlparse(url)
-                if urlparsed.netloc.endswith(".local"):
-                    LOGGER.warning(f"Already tried with {url}")
-                    raise
-
-                url = urlparsed._replace(netloc=urlparsed.netloc + ".local").geturl()
-                LOGGER.warning(f"Retrying with {url}")
-                await asyncio.sleep(self.base_delay)
-
-            except ServerDisconnectedError as e:
-                LOGGER.error(f"Server disconnected error: {e}")
-                retries += 1
-                delay = self.base_delay * (2 ** (retries - 1))
-                LOGGER.warning(
-                    f"Retry {retries}/{self.max_retries}: Waiting {delay:.2f} seconds ({e.message} received)"
-                )
-                await asyncio.sleep(delay)
-
-            except Exception as e:
-                LOGGER.error(f"{type(e)=}, Error fetching {url}: {e}")
-                raise
-
-        LOGGER.warning(f"Failed to post {url} after {self.max_retries} retries.")
-        return None
+        return await self.request_with_retries("POST", url, data)
 
     async def get_with_retries(
         self,
         url: str,
     ) -> dict[str, Any] | None:
+        LOGGER.debug("get_with_retries")
+
+        return await self.request_with_retries("GET", url)
+
+    async def request_with_retries(
+        self,
+        method: str,
+        url: str,
+        data: dict[str, Any] | None = None,
+        raw: bool = False,
+    ) -> Any:
         """
-        Fetch a URL with retries if a retriable status code is returned.
+        Send a request with retries if a retriable status code is returned.
+
+        Every attempt waits for a slot of the request scheduler; writes always
+        run at the highest priority, reads at the priority of the caller. The
+        host is replaced by the address settled on by the endpoint resolver.
+        All attempts together stay within the deadline of the caller, if any;
+        pending work is cancelled and TimeoutError raised when it is reached.
 
         Args:
-            url (str): The URL to fetch.
-            max_retries (int): Maximum number of retries.
-            base_delay (float): Base delay in seconds for exponential backoff.
-            session (ClientSession): Optional shared aiohttp session.
+            method (str): The HTTP method.
+            url (str): The URL to request.
+            data (dict): Optional body, sent as JSON.
+            raw (bool): Return the body bytes instead of the parsed JSON.
 
         Returns:
-            Response content or None if all retries fail.
+            Response content or None if all retries of a read fail; a write
+            re-raises the last error then, so it never passes for accepted.
         """
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
-
-        retries = 0
-        while retries < self.max_retries:
-            try:
-                async with self._client_session.get(
-                    url,
-                    headers=self._headers,
-                    ssl=False,
-                    timeout=ClientTimeout(total=20000, sock_connect=300),
-                ) as response:  # `ssl=False` skips SSL verification, equivalent to `-k`
-                    LOGGER.debug(f"Response status: {response.status}")
-
-                    if response.status in self._retriable_status_codes:
-                        raise ClientResponseError(
-                            request_info=response.request_info,
-                            history=response.history,
-                            status=response.status,
-                            message="Service Unavailable",
+        with TRACER.span("request", method, url):
+            return await self._send_with_retries(method, url, data, raw)
+
+    async def _send_with_retries(
+        self,
+        method: str,
+        url: str,
+        data: dict[str, Any] | None,
+        raw: bool = False,
+    ) -> Any:
+        data_str = orjson.dumps(data).decode("utf-8") if data is not None else None
+        priority = (
+            current_priority() if method == "GET" else RequestPriority.INTERACTIVE_WRITE
+        )
+        # Nothing is looked up or counted with the request metrics disabled
+        metrics = self._metrics.endpoint(method, url) if self._request_metrics else None
+
+        # Only the per-request timeout applies without a deadline (writes, setup)
+        deadline = asyncio.timeout_at(current_deadline())
+        try:
+            async with deadline:
+                retries = 0
+                last_error: Exception | None = None
+                auth_retried = False
+                re_resolved = False
+                while retries < self.max_retries:
+                    try:
+                        request = Request(
+                            method,
+                            url,
+                            await self._resolver.async_url(url),
+                            dict(self._headers),
+                            data_str,
                         )
+                        async with self._scheduler.slot(priority):
+                            response = await self._chain(request)
 
-                    else:
                         response.raise_for_status()
+                        if raw:
+                            return response.body
+
+                        started = time.perf_counter()
+                        with TRACER.span("json", len(response.body)):
+                            result = (
+                                orjson.loads(response.body) if response.body else None
+                            )
+                        if metrics is not None:
+                            metrics.decode.observe(time.perf_counter() - started)
+                        return result
+
+                    except ClientResponseError as e:
+                        if e.status in self._retriable_status_codes:
+                            if metrics is not None:
+                                metrics.status_503 += 1
+                                metrics.retries[str(e.status)] += 1
+                            last_error = e
+                            retries += 1
+                            delay = self.base_delay * (
+                                2 ** (retries - 1)
+                            )  # Exponential backoff
+                            LOGGER.warning(
+                                f"Retry {retries}/{self.max_retries}: Waiting {delay:.2f} seconds ({e.status} received)"
+                            )
+                            await asyncio.sleep(delay)
+
+                        elif (
+                            e.status == self._unauthorized_status_code
+                            and self._api_key_manager is not None
+                            and not auth_retried
+                        ):
+                            # Most likely a box day rollover or clock skew, the
+                            # neighbouring-day key is picked up on the next attempt
+                            if metrics is not None:
+                                metrics.retries["unauthorized"] += 1
+                            auth_retried = True
+                            self._api_key_manager.fallback_key(
+                                request.headers.get("Api-Key", "")
+                            )
+
+                        else:
+                            if metrics is not None:
+                                metrics.errors += 1
+                            raise  # Reraise for other HTTP errors
+
+                    except (ClientConnectorError, ConnectionTimeoutError) as e:
+                        LOGGER.error(f"Connection error: {e}")
+
+                        if self._resolver.static or re_resolved:
+                            if metrics is not None:
+                                metrics.errors += 1
+                            raise
+
+                        # The box may have moved (DHCP) or the name stopped resolving,
+                        # settle on a new address once and retry with it
+                        if metrics is not None:
+                            metrics.retries["connect"] += 1
+                        re_resolved = True
+                        if await self._resolver.async_resolve() is None:
+                            if metrics is not None:
+                                metrics.errors += 1
+                            raise
+
+                    except ServerDisconnectedError as e:
+                        LOGGER.error(f"Server disconnected error: {e}")
+                        if metrics is not None:
+                            metrics.disconnects += 1
+                            metrics.retries["disconnect"] += 1
+                        last_error = e
+                        retries += 1
+                        delay = self.base_delay * (2 ** (retries - 1))
+                        LOGGER.warning(
+                            f"Retry {retries}/{self.max_retries}: Waiting {delay:.2f} seconds ({e.message} received)"
+                        )
+                        await asyncio.sleep(delay)
+
+                    except Exception as e:
+                        LOGGER.error(f"{type(e)=}, Error fetching {url}: {e}")
+                        if metrics is not None:
+                            metrics.errors += 1
+                        raise
 
-                    return await response.json()
-
-            except ClientResponseError as e:
-                if e.status in self._retriable_status_codes:
-                    retries += 1
-                    delay = self.base_delay * (
-                        2 ** (retries - 1)
-                    )  # Exponential backoff
-                    LOGGER.warning(
-                        f"Retry {retries}/{self.max_retries}: Waiting {delay:.2f} seconds ({e.status} received)"
-                    )
-                    await asyncio.sleep(delay)
-
-                else:
-                    raise  # Reraise for other HTTP errors
-
-            except ClientConnectorDNSError as e:
-                LOGGER.error(f"DNS resolution error: {e}")
-
-                urlparsed = urlparse(url)
-                if urlparsed.netloc.endswith(".local"):
-                    LOGGER.warning(f"Already tried with {url}")
-                    raise
-
-                url = urlparsed._replace(netloc=urlparsed.netloc + ".local").geturl()
-                LOGGER.warning(f"Retrying with {url}")
-                await asyncio.sleep(self.base_delay)
-
-            except ServerDisconnectedError as e:
-                LOGGER.error(f"Server disconnected error: {e}")
-                retries += 1
-                delay = self.base_delay * (2 ** (retries - 1))
                 LOGGER.warning(
-                    f"Retry {retries}/{self.max_retries}: Waiting {delay:.2f} seconds ({e.message} received)"
+                    f"Failed to {method.lower()} {url} after {self.max_retries} retries."
                 )
-                await asyncio.sleep(delay)
-
-            except Exception as e:
-                LOGGER.error(f"{type(e)=}, Error fetching {url}: {e}")
-                raise
-
-        LOGGER.warning(f"Failed to fetch {url} after {self.max_retries} retries.")
-        return None
+                if metrics is not None:
+                    metrics.errors += 1
+                if method != "GET" and last_error is not None:
+                    raise last_error
+
+                return None
+
+        except TimeoutError:
+            if deadline.expired():
+                LOGGER.warning(f"Deadline reached, cancelled {method.lower()} {url}")
+                if metrics is not None:
+                    metrics.errors += 1
+            raise
+
+    async def _send(self, request: Request) -> Response:
+        """Send one attempt, the end of the middleware chain."""
+        async with self._client_session.request(
+            request.method,
+            request.request_url,
+            headers=request.headers,
+            ssl=self._ssl_context or False,
+            timeout=self._timeout,
+            data=request.data,
+        ) as response:  # Without a pinned context SSL is not verified, like `-k`
+            LOGGER.debug("Response status: %s", response.status)
+
+            return Response(
+                response.status,
+                await response.read(),
+                response.request_info,
+                response.history,
+                (
+                    "Service Unavailable"
+                    if response.status in self._retriable_status_codes
+                    else response.reason
+                ),
+            )
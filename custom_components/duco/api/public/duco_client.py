@@ -5,9 +5,9 @@ import logging
 import aiohttp
 import orjson
 
-from ...const import API_PUBLIC_URL
+from ..const import API_PUBLIC_URL, LOGGER
 
-_LOGGER: logging.Logger = logging.getLogger(__package__)
+_LOGGER: logging.Logger = LOGGER.getChild("public")
 
 
 class DucoClient:
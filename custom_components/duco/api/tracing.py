@@ -0,0 +1,183 @@
+"""Lightweight tracing for the Duco integration.
+
+Spans only measure anything when debug logging is enabled for the logger of
+the tracer; otherwise ``span()`` and ``cycle()`` hand out a shared no-op
+context manager, so instrumented hot paths cost a level check.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class CycleTrace:
+    """Time spent per span name within one cycle."""
+
+    name: str
+    started: float
+    duration: float | None
+    spans: dict[str, list[float]]
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.started = time.perf_counter()
+        self.duration = None
+        self.spans = {}
+
+    def add(self, name: str, duration: float) -> None:
+        self.spans.setdefault(name, []).append(duration)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "duration_ms": (
+                round(self.duration * 1000, 3) if self.duration is not None else None
+            ),
+            "spans": {
+                name: {
+                    "count": len(durations),
+                    "total_ms": round(sum(durations) * 1000, 3),
+                    "max_ms": round(max(durations) * 1000, 3),
+                }
+                for name, durations in self.spans.items()
+            },
+        }
+
+
+_current_cycle: ContextVar[CycleTrace | None] = ContextVar(
+    "duco_current_cycle", default=None
+)
+
+
+class _Span:
+    __slots__ = ("_logger", "_name", "_args", "_started")
+
+    def __init__(self, logger: logging.Logger, name: str, args: tuple[Any, ...]):
+        self._logger = logger
+        self._name = name
+        self._args = args
+        self._started = 0.0
+
+    def __enter__(self) -> None:
+        self._started = time.perf_counter()
+
+    def __exit__(self, exc_type: type[BaseException] | None, *_: object) -> None:
+        duration = time.perf_counter() - self._started
+        if (cycle := _current_cycle.get()) is not None:
+            cycle.add(self._name, duration)
+
+        self._logger.debug(
+            "%s%s took %.1f ms%s",
+            self._name,
+            "".join(f" {arg}" for arg in self._args),
+            duration * 1000,
+            f" ({exc_type.__name__})" if exc_type is not None else "",
+        )
+
+
+class _Cycle:
+    __slots__ = ("_tracer", "_trace", "_token")
+
+    def __init__(self, tracer: Tracer, name: str) -> None:
+        self._tracer = tracer
+        self._trace = CycleTrace(name)
+
+    def __enter__(self) -> CycleTrace:
+        self._token = _current_cycle.set(self._trace)
+        return self._trace
+
+    def __exit__(self, *exc_info: object) -> None:
+        _current_cycle.reset(self._token)
+        self._trace.duration = time.perf_counter() - self._trace.started
+        self._tracer.finish_cycle(self._trace)
+
+
+class Tracer:
+    """Hands out spans and keeps the breakdown of the last traced cycle."""
+
+    _logger: logging.Logger
+    _last_cycle: CycleTrace | None
+
+    def __init__(self, logger: logging.Logger) -> None:
+        self._logger = logger
+        self._last_cycle = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._logger.isEnabledFor(logging.DEBUG)
+
+    @property
+    def last_cycle(self) -> dict[str, Any] | None:
+        return self._last_cycle.as_dict() if self._last_cycle else None
+
+    def span(self, name: str, *args: Any) -> _Span | _NoopSpan:
+        """Time a block, the arguments are only formatted when it is logged."""
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return _NOOP_SPAN
+
+        return _Span(self._logger, name, args)
+
+    def cycle(self, name: str) -> _Cycle | _NoopSpan:
+        """Collect the spans of this block (and its tasks) into one breakdown."""
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return _NOOP_SPAN
+
+        return _Cycle(self, name)
+
+    def finish_cycle(self, trace: CycleTrace) -> None:
+        self._last_cycle = trace
+        self._logger.debug("Cycle breakdown: %s", trace.as_dict())
+
+
+class ThrottledLogger:
+    """Logs a message per key at most once per interval.
+
+    Messages logged in between are counted and the count is reported with the
+    next message that gets through.
+    """
+
+    _logger: logging.Logger
+    _interval: float
+    _last: dict[str, float]
+    _suppressed: dict[str, int]
+
+    def __init__(self, logger: logging.Logger, interval: float) -> None:
+        self._logger = logger
+        self._interval = interval
+        self._last = {}
+        self._suppressed = {}
+
+    def log(self, level: int, key: str, msg: str, *args: Any) -> None:
+        if not self._logger.isEnabledFor(level):
+            return
+
+        now = time.monotonic()
+        if now - self._last.get(key, -self._interval) < self._interval:
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            return
+
+        self._last[key] = now
+        if suppressed := self._suppressed.pop(key, 0):
+            msg += " (%d similar messages suppressed)"
+            args = (*args, suppressed)
+
+        self._logger.log(level, msg, *args)
+
+    def warning(self, key: str, msg: str, *args: Any) -> None:
+        self.log(logging.WARNING, key, msg, *args)
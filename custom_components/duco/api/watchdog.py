@@ -0,0 +1,116 @@
+"""Timing of the synchronous sections of the Duco pipeline.
+
+Everything measured here runs on the event loop without yielding, so the
+duration of a section is the time other integrations had to wait for it.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from typing import Any
+
+from .tracing import ThrottledLogger
+
+SAMPLE_SIZE = 512  # durations kept per section for the percentiles
+OVERRUN_LOG_INTERVAL = 900  # seconds between overrun warnings per section
+
+
+class SectionStats:
+    count: int
+    overruns: int
+    max: float
+    samples: deque[float]
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.overruns = 0
+        self.max = 0.0
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+
+    def percentile(self, q: float) -> float | None:
+        if not self.samples:
+            return None
+
+        ordered = sorted(self.samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def as_dict(self) -> dict[str, Any]:
+        p50, p99 = self.percentile(0.5), self.percentile(0.99)
+        return {
+            "count": self.count,
+            "overruns": self.overruns,
+            "p50_ms": round(p50 * 1000, 3) if p50 is not None else None,
+            "p99_ms": round(p99 * 1000, 3) if p99 is not None else None,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class _Section:
+    __slots__ = ("_watchdog", "_stats", "_name", "_started")
+
+    def __init__(self, watchdog: LoopWatchdog, name: str, stats: SectionStats):
+        self._watchdog = watchdog
+        self._stats = stats
+        self._name = name
+        self._started = 0.0
+
+    def __enter__(self) -> None:
+        self._started = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._watchdog.record(
+            self._name, self._stats, time.perf_counter() - self._started
+        )
+
+
+class LoopWatchdog:
+    """Records p50/p99 per section and flags sections over the budget."""
+
+    _budget: float
+    _sections: dict[str, SectionStats]
+    _overrun_logger: ThrottledLogger
+
+    def __init__(self, logger: logging.Logger, budget: float = 0.02) -> None:
+        self._budget = budget
+        self._sections = {}
+        self._overrun_logger = ThrottledLogger(logger, OVERRUN_LOG_INTERVAL)
+
+    @property
+    def budget(self) -> float:
+        return self._budget
+
+    @budget.setter
+    def budget(self, value: float):
+        self._budget = value
+
+    def section(self, name: str) -> _Section:
+        if (stats := self._sections.get(name)) is None:
+            stats = self._sections[name] = SectionStats()
+
+        return _Section(self, name, stats)
+
+    def record(self, name: str, stats: SectionStats, duration: float) -> None:
+        stats.count += 1
+        stats.samples.append(duration)
+        if duration > stats.max:
+            stats.max = duration
+
+        if duration > self._budget:
+            stats.overruns += 1
+            self._overrun_logger.warning(
+                name,
+                "%s blocked the event loop for %.1f ms (budget %.1f ms)",
+                name,
+                duration * 1000,
+                self._budget * 1000,
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "budget_ms": self._budget * 1000,
+            "sections": {
+                name: stats.as_dict() for name, stats in sorted(self._sections.items())
+            },
+        }
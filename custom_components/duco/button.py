@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import inspect
 from dataclasses import dataclass
 from collections.abc import Awaitable, Callable
 
@@ -10,10 +9,11 @@ from homeassistant.components.button import (
     ButtonEntityDescription,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util.async_ import create_eager_task
 
 from . import DucoConfigEntry
-from .api.private.duco_client import DucoClient
 from .api.DTO.NodeInfoDTO import NodeDataDTO
 from .api.DTO.ActionDTO import ActionEnum
 from .const import DeviceResponseEntry, LOGGER
@@ -28,7 +28,7 @@ class DucoButtonEntityDescription(ButtonEntityDescription):
     action_state: str
     exists_fn: Callable[[DeviceResponseEntry, int, str], bool] = lambda x, y, z: True
     available_fn: Callable[[DeviceResponseEntry, int, str], bool]
-    set_fn: Callable[[DucoClient, int, str], Awaitable[None]]
+    set_fn: Callable[[DucoDeviceUpdateCoordinator, int, str], Awaitable[bool]]
 
 
 BUTTONS = [
@@ -52,8 +52,10 @@ BUTTONS = [
             if action.Action == node_action and action.Enum is not None
             for action_enum in action.Enum
         ),
-        set_fn=lambda api, nidx, node_action: api.set_node_action_state(
-            nidx, node_action, ActionEnum.AUTO.value
+        set_fn=lambda coordinator, nidx, node_action: (
+            coordinator.async_set_node_action_state(
+                nidx, node_action, ActionEnum.AUTO.value
+            )
         ),
     ),
     DucoButtonEntityDescription(
@@ -76,8 +78,10 @@ BUTTONS = [
             if action.Action == node_action and action.Enum is not None
             for action_enum in action.Enum
         ),
-        set_fn=lambda api, nidx, node_action: api.set_node_action_state(
-            nidx, node_action, ActionEnum.MAN1.value
+        set_fn=lambda coordinator, nidx, node_action: (
+            coordinator.async_set_node_action_state(
+                nidx, node_action, ActionEnum.MAN1.value
+            )
         ),
     ),
     DucoButtonEntityDescription(
@@ -100,8 +104,10 @@ BUTTONS = [
             if action.Action == node_action and action.Enum is not None
             for action_enum in action.Enum
         ),
-        set_fn=lambda api, nidx, node_action: api.set_node_action_state(
-            nidx, node_action, ActionEnum.MAN2.value
+        set_fn=lambda coordinator, nidx, node_action: (
+            coordinator.async_set_node_action_state(
+                nidx, node_action, ActionEnum.MAN2.value
+            )
         ),
     ),
     DucoButtonEntityDescription(
@@ -124,8 +130,10 @@ BUTTONS = [
             if action.Action == node_action and action.Enum is not None
             for action_enum in action.Enum
         ),
-        set_fn=lambda api, nidx, node_action: api.set_node_action_state(
-            nidx, node_action, ActionEnum.MAN3.value
+        set_fn=lambda coordinator, nidx, node_action: (
+            coordinator.async_set_node_action_state(
+                nidx, node_action, ActionEnum.MAN3.value
+            )
         ),
     ),
 ]
@@ -136,7 +144,7 @@ async def async_setup_entry(
     entry: DucoConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    LOGGER.debug(f"button:{inspect.currentframe().f_code.co_name}")
+    LOGGER.debug("button:async_setup_entry")
 
     """Set up the Identify button."""
     add_entities: list[DucoVentActionButtonEntity] = [
@@ -146,6 +154,7 @@ async def async_setup_entry(
         if button.exists_fn(entry.runtime_data.data, node.Node, button.action_state)
     ]
 
+    entry.runtime_data.async_track_entities(add_entities)
     async_add_entities(add_entities)
 
 
@@ -162,6 +171,8 @@ class DucoVentActionButtonEntity(DucoEntity, ButtonEntity):
     ) -> None:
         """Initialize button."""
         super().__init__(coordinator, node)
+        # Reads the supported actions, which the node poll does not refresh
+        self._fetch_target = None
 
         self._node_id = node.Node
         self._action_state = description.action_state
@@ -181,7 +192,20 @@ class DucoVentActionButtonEntity(DucoEntity, ButtonEntity):
 
     async def async_press(self) -> None:
         """Activate the ventilation action."""
-        await self.entity_description.set_fn(
-            self.coordinator.api, self._node_id, self._action_state
+        # Start eagerly so the optimistic state is applied before the first await
+        write = create_eager_task(
+            self.entity_description.set_fn(
+                self.coordinator,
+                self._node_id,
+                self._action_state,
+            )
         )
-        await self.coordinator.async_refresh()
+        self.coordinator.async_update_listeners()
+
+        if not await write:
+            self.coordinator.async_update_listeners()
+            raise HomeAssistantError(
+                f"Failed to set {self._action_state} for node {self._node_id}"
+            )
+
+        await self.coordinator.async_refresh_node(self._node_id)
@@ -0,0 +1,70 @@
+"""Last known good values for the Duco coordinator."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class CachedValue[V]:
+    value: V
+    updated: float
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.updated
+
+
+class LastKnownGoodCache[K, V]:
+    """Keeps the last successfully fetched value per key until it gets too old."""
+
+    _max_age: float
+    _entries: dict[K, CachedValue[V]]
+
+    def __init__(self, max_age: float) -> None:
+        self._max_age = max_age
+        self._entries = {}
+
+    @property
+    def max_age(self) -> float:
+        return self._max_age
+
+    @max_age.setter
+    def max_age(self, value: float):
+        self._max_age = value
+
+    def set(self, key: K, value: V) -> None:
+        self._entries[key] = CachedValue(value, time.monotonic())
+
+    def get(self, key: K) -> V | None:
+        if (entry := self._entries.get(key)) is None or entry.age > self._max_age:
+            return None
+
+        return entry.value
+
+    def age(self, key: K) -> float | None:
+        return entry.age if (entry := self._entries.get(key)) else None
+
+    def pop(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def expire(self) -> set[K]:
+        """Drop and return the keys whose value exceeded the max age."""
+        expired = {
+            key for key, entry in self._entries.items() if entry.age > self._max_age
+        }
+        for key in expired:
+            del self._entries[key]
+
+        return expired
+
+    def values(self) -> dict[K, V]:
+        return {
+            key: entry.value
+            for key, entry in self._entries.items()
+            if entry.age <= self._max_age
+        }
+
+    def ages(self) -> dict[K, float]:
+        return {key: round(entry.age, 1) for key, entry in self._entries.items()}
@@ -0,0 +1,78 @@
+"""On-demand recording of the traffic with the box."""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .api.private.duco_client import DucoClient
+from .api.private.recorder import TrafficRecorder
+from .const import DOMAIN, LOGGER
+
+
+class TrafficCapture:
+    """Records the requests of the client for a while and writes them to a file.
+
+    The recording is redacted (serials, MAC addresses, network names), so it
+    can be shared to reproduce an issue or benchmark against, see
+    ``tools/replay.py``.
+    """
+
+    _hass: HomeAssistant
+    _recorder: TrafficRecorder | None
+    _stop_unsub: CALLBACK_TYPE | None
+    _last_path: str | None
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._recorder = None
+        self._stop_unsub = None
+        self._last_path = None
+
+    @property
+    def active(self) -> bool:
+        return self._recorder is not None
+
+    @property
+    def last_path(self) -> str | None:
+        return self._last_path
+
+    def start(self, client: DucoClient, duration: float) -> None:
+        if self._recorder is not None:
+            LOGGER.warning("Traffic recording already in progress")
+            return
+
+        LOGGER.info("Recording the traffic with the box for %d seconds", duration)
+        self._recorder = client.recorder = TrafficRecorder()
+
+        @callback
+        def _async_stop(_: datetime) -> None:
+            self._stop_unsub = None
+            self.stop(client)
+
+        self._stop_unsub = async_call_later(self._hass, duration, _async_stop)
+
+    @callback
+    def stop(self, client: DucoClient) -> None:
+        if self._stop_unsub is not None:
+            self._stop_unsub()
+            self._stop_unsub = None
+
+        if (recorder := self._recorder) is None:
+            return
+
+        self._recorder = client.recorder = None
+        self._hass.async_create_background_task(
+            self._async_write(recorder), f"{DOMAIN} traffic recording"
+        )
+
+    async def _async_write(self, recorder: TrafficRecorder) -> None:
+        path = self._hass.config.path(
+            f"{DOMAIN}_traffic_{time.strftime('%Y%m%d_%H%M%S')}.jsonl.gz"
+        )
+        count = await self._hass.async_add_executor_job(recorder.write, path)
+        self._last_path = path
+        LOGGER.info("Recorded %d request(s) to %s", count, path)
@@ -1,5 +1,4 @@
 from typing import Any, Optional
-import inspect
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.config_entries import ConfigFlowResult
@@ -10,13 +9,17 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.selector import TextSelector
 from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
 
+from .api.const import API_PRIVATE_URL
 from .api.DTO.InfoDTO import InfoDTO
 from .api.private.duco_client import ApiError, DucoClient
 from .const import (
+    CONF_LOOP_BUDGET,
+    CONF_PIN_CERTIFICATE,
+    CONF_REQUEST_METRICS,
     DOMAIN,
     LOGGER,
+    LOOP_BUDGET_MS,
     MANUFACTURER,
-    API_PRIVATE_URL,
     UPDATE_INTERVAL,
 )
 
@@ -153,8 +156,8 @@ class DucoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         Make connection with device to test the connection
         and to get info for unique_id.
         """
+        duco_client = DucoClient(host)
         try:
-            duco_client = DucoClient(host)
             await duco_client.connect()
             info = await duco_client.get_info()
             assert info is not None, "InfoDTO not found"
@@ -169,6 +172,9 @@ class DucoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             LOGGER.exception("Unexpected exception")
             raise AbortFlow("unknown_error") from ex
 
+        finally:
+            await duco_client.disconnect()
+
 
 class DucoOptionsFlowHandler(config_entries.OptionsFlow):
     def __init__(self) -> None:
@@ -178,7 +184,7 @@ class DucoOptionsFlowHandler(config_entries.OptionsFlow):
     async def async_step_init(
         self, user_input: Optional[dict[str, Any]] = None
     ) -> ConfigFlowResult:
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")  # type: ignore
+        LOGGER.debug("async_step_init")
         """Manage the options for the integration."""
         errors: dict[str, str] = {}
 
@@ -186,6 +192,9 @@ class DucoOptionsFlowHandler(config_entries.OptionsFlow):
             # If the user has provided new data, update the config entry
             host = str(user_input.get("host"))
             update_interval = user_input.get("update_interval")
+            pin_certificate = bool(user_input.get(CONF_PIN_CERTIFICATE, False))
+            loop_budget = user_input.get(CONF_LOOP_BUDGET, LOOP_BUDGET_MS)
+            request_metrics = bool(user_input.get(CONF_REQUEST_METRICS, True))
 
             try:
                 self.hass.config_entries.async_update_entry(
@@ -193,6 +202,9 @@ class DucoOptionsFlowHandler(config_entries.OptionsFlow):
                     data={
                         "host": host,
                         "update_interval": update_interval,
+                        CONF_PIN_CERTIFICATE: pin_certificate,
+                        CONF_LOOP_BUDGET: loop_budget,
+                        CONF_REQUEST_METRICS: request_metrics,
                     },
                 )
                 return self.async_create_entry(
@@ -200,6 +212,9 @@ class DucoOptionsFlowHandler(config_entries.OptionsFlow):
                     data={
                         "host": host,
                         "update_interval": update_interval,
+                        CONF_PIN_CERTIFICATE: pin_certificate,
+                        CONF_LOOP_BUDGET: loop_budget,
+                        CONF_REQUEST_METRICS: request_metrics,
                     },
                 )
 
@@ -228,6 +243,20 @@ class DucoOptionsFlowHandler(config_entries.OptionsFlow):
                             "update_interval", int(UPDATE_INTERVAL.total_seconds())
                         ),
                     ): int,
+                    vol.Optional(
+                        CONF_PIN_CERTIFICATE,
+                        default=self.config_entry.data.get(CONF_PIN_CERTIFICATE, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_LOOP_BUDGET,
+                        default=self.config_entry.data.get(
+                            CONF_LOOP_BUDGET, LOOP_BUDGET_MS
+                        ),
+                    ): vol.All(int, vol.Range(min=1)),
+                    vol.Optional(
+                        CONF_REQUEST_METRICS,
+                        default=self.config_entry.data.get(CONF_REQUEST_METRICS, True),
+                    ): bool,
                 }
             ),
             errors=errors,
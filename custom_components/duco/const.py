@@ -12,6 +12,7 @@ from .api.DTO.NodeInfoDTO import NodeDataDTO
 from .api.DTO.ActionDTO import NodeActionDTO as ActionDTO
 from .api.DTO.NodeActionDTO import NodeActionsDTO
 from .api.DTO.NodeConfigDTO import NodeConfigDTO
+from .api.tracing import Tracer
 
 if TYPE_CHECKING:
     from .api.private.duco_client import DucoClient
@@ -19,21 +20,54 @@ if TYPE_CHECKING:
 DOMAIN = "duco"
 MANUFACTURER = "Duco"
 PLATFORMS = [Platform.BUTTON, Platform.NUMBER, Platform.SENSOR, Platform.SWITCH]
-API_LOCAL_IP = "192.168.5.4"
-API_PRIVATE_URL = f"https://{API_LOCAL_IP}"
-API_PUBLIC_URL = "https://vd-dev-weu-apim.azure-api.net/publicapi"
 
 LOGGER = logging.getLogger(__package__)
+TRACER = Tracer(LOGGER)
 
 # Time between data updates
 UPDATE_INTERVAL = timedelta(seconds=180)
 
+# Cached node and module data is served for at most this many update intervals
+CACHE_MAX_AGE_INTERVALS = 3
+# Sensors without a value are reported at most once per interval
+NO_VALUE_WARNING_INTERVAL = timedelta(hours=1)
+# Delay before nodes that failed during an update are fetched again
+FAILED_RETRY_DELAY = timedelta(seconds=15)
+INFO_MODULE = "info"
+
+SERVICE_PROFILE = "profile"
+ATTR_CYCLES = "cycles"
+SERVICE_RECORD_TRAFFIC = "record_traffic"
+ATTR_DURATION = "duration"
+# Share of the update interval a poll may take before pending requests are cancelled
+CYCLE_DEADLINE_RATIO = 0.8
+
+CONF_RESOLVED_HOST = "resolved_host"
+
+# Only accept the box certificate shipped in certs/api_cert.pem
+CONF_PIN_CERTIFICATE = "pin_certificate"
+# Synchronous sections (decode, diff, listeners, native_value) taking longer
+# than this many milliseconds on the event loop are flagged
+CONF_LOOP_BUDGET = "loop_budget"
+LOOP_BUDGET_MS = 20
+# Per-endpoint request counts, traffic and latency, in the diagnostics
+CONF_REQUEST_METRICS = "request_metrics"
+# Connections are opened this long before a poll, within the keep-alive timeout
+PREWARM_LEAD = timedelta(seconds=5)
+
+# Quiet period before queued config writes are merged and sent to a node
+CONFIG_WRITE_DELAY = timedelta(seconds=1)
+CONFIG_WRITE_PRESSURE_DELAY = timedelta(seconds=10)
+
+# Fallback for General.Modbus.DailyWriteReqCnt when the box config is unavailable
+DAILY_WRITE_LIMIT = 100
+WRITE_BUDGET_PRESSURE_RATIO = 0.2
+
 
 @dataclass
 class DeviceResponseEntry:
     """Dict describing a single response entry."""
 
-    _action_state: Any | None = None
     _config_name: str | None = None
 
     info: InfoDTO | None = None
@@ -41,17 +75,47 @@ class DeviceResponseEntry:
     actions: ActionDTO | None = None
     node_actions: dict[int, NodeActionsDTO] = field(default_factory=dict)
     node_configs: dict[int, NodeConfigDTO] = field(default_factory=dict)
-
-    @property
-    def action_state(self) -> str | None:
-        return self._action_state
+    node_action_states: dict[int, dict[str, Any]] = field(default_factory=dict)
 
     @property
     def config_name(self) -> str | None:
         return self._config_name
 
+    def action_state(self, nidx: int, node_action: str) -> Any | None:
+        return self.node_action_states.get(nidx, {}).get(node_action)
+
+    def reconcile_node(self, node: NodeDataDTO) -> None:
+        """Align the optimistic action states with what the node reports."""
+        node_states = self.node_action_states.setdefault(node.Node, {})
+
+        if node.General.Identify is not None:
+            node_states["SetIdentify"] = bool(node.General.Identify)
+
+        if node.Ventilation is not None:
+            node_states["SetVentilationState"] = node.Ventilation.State
+
     async def set_node_action_state(
         self, api: DucoClient, nidx: int, node_action: str, value: Any
-    ):
-        self._action_state = value
-        await api.set_node_action_state(nidx, node_action, value)
+    ) -> bool:
+        """Optimistically apply an action state, rolling back if the write fails."""
+        node_states = self.node_action_states.setdefault(nidx, {})
+        previous_state = node_states.get(node_action)
+        node_states[node_action] = value
+
+        ventilation = (
+            self.nodes[nidx].Ventilation
+            if node_action == "SetVentilationState" and nidx in self.nodes
+            else None
+        )
+        previous_ventilation_state = ventilation.State if ventilation else None
+        if ventilation is not None:
+            ventilation.State = value
+
+        if await api.set_node_action_state(nidx, node_action, value):
+            return True
+
+        node_states[node_action] = previous_state
+        if ventilation is not None and previous_ventilation_state is not None:
+            ventilation.State = previous_ventilation_state
+
+        return False
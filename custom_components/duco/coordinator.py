@@ -3,28 +3,65 @@
 from __future__ import annotations
 
 import asyncio
-import inspect
 import time
-from typing import Any, Coroutine
-from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Coroutine
+from collections.abc import Iterable
+from dataclasses import replace
+from datetime import datetime, timedelta
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
+from .api.const import API_LOCAL_IP
 from .api.DTO.InfoDTO import InfoDTO
 from .api.DTO.NodeInfoDTO import NodeDataDTO
 from .api.DTO.NodeActionDTO import NodeActionsDTO
-from .api.DTO.NodeConfigDTO import NodeConfigDTO
+from .api.DTO.NodeConfigDTO import NodeConfigDTO, ValRange
+from .api.private.config_writer import NodeConfigWriter
+from .api.private.decode_router import DecodeRouter
 from .api.private.duco_client import ApiError, DucoClient
+from .api.private.deadline import remaining_budget, request_deadline
+from .api.private.metrics import RequestMetrics
+from .api.watchdog import LoopWatchdog
+from .api.private.request_scheduler import RequestPriority, request_priority
+from .cache import LastKnownGoodCache
 from .const import (
     DOMAIN,
     LOGGER,
-    API_LOCAL_IP,
+    CACHE_MAX_AGE_INTERVALS,
+    CONF_LOOP_BUDGET,
+    CONF_PIN_CERTIFICATE,
+    CONF_REQUEST_METRICS,
+    CONF_RESOLVED_HOST,
+    CONFIG_WRITE_DELAY,
+    CONFIG_WRITE_PRESSURE_DELAY,
+    CYCLE_DEADLINE_RATIO,
+    FAILED_RETRY_DELAY,
+    INFO_MODULE,
+    LOOP_BUDGET_MS,
+    PREWARM_LEAD,
+    TRACER,
     UPDATE_INTERVAL,
     DeviceResponseEntry,
 )
+from .capture import TrafficCapture
+from .fetch_plan import FetchPlan
+from .profiler import CycleProfiler
+from .write_governor import DucoWriteGovernor
+
+if TYPE_CHECKING:
+    from .entity import DucoEntity
+
+
+@callback
+def _affects_fetch_plan(data: er.EventEntityRegistryUpdatedData) -> bool:
+    return data["action"] == "remove" or (
+        data["action"] == "update" and "disabled_by" in data["changes"]
+    )
 
 
 class DucoDeviceUpdateCoordinator(DataUpdateCoordinator[DeviceResponseEntry]):
@@ -33,6 +70,23 @@ class DucoDeviceUpdateCoordinator(DataUpdateCoordinator[DeviceResponseEntry]):
 
     _unsupported_error: bool
     _duco_nidxs: set[int]
+    _config_writer: NodeConfigWriter
+    _config_originals: dict[int, dict[str, ValRange]]
+    _config_writing: dict[int, dict[str, Any]]
+    _write_governor: DucoWriteGovernor
+    _node_cache: LastKnownGoodCache[int, NodeDataDTO]
+    _info_cache: LastKnownGoodCache[str, InfoDTO]
+    _retry_unsub: CALLBACK_TYPE | None
+    _retry_task: asyncio.Task[None] | None
+    _prewarm_unsub: CALLBACK_TYPE | None
+    _profiler: CycleProfiler
+    _capture: TrafficCapture
+    _fetch_plan: FetchPlan
+    _registry_unsub: CALLBACK_TYPE | None
+    _uptimes: dict[int | str, int]
+    _sw_versions: dict[int | str, str]
+    _restarted_nidxs: set[int]
+    _box_restarted: bool
 
     config_entry: ConfigEntry | None
     data: DeviceResponseEntry
@@ -68,7 +122,43 @@ class DucoDeviceUpdateCoordinator(DataUpdateCoordinator[DeviceResponseEntry]):
         self._duco_nidxs = set()
 
         self.api_key = api_key
-        self.api = DucoClient(host)
+        entry_data = self.config_entry.data if self.config_entry else {}
+        self.api = DucoClient(
+            host,
+            entry_data.get(CONF_RESOLVED_HOST),
+            pin_certificate=bool(entry_data.get(CONF_PIN_CERTIFICATE, False)),
+            request_metrics=bool(entry_data.get(CONF_REQUEST_METRICS, True)),
+        )
+        self.api.watchdog.budget = (
+            float(entry_data.get(CONF_LOOP_BUDGET, LOOP_BUDGET_MS)) / 1000
+        )
+        self.api.endpoint_resolver.on_resolved = self._async_store_resolved_host
+        self.api.decode_router.executor = hass.async_add_executor_job
+
+        self._config_writer = NodeConfigWriter(
+            self._async_write_node_config, CONFIG_WRITE_DELAY.total_seconds()
+        )
+        self._config_originals = {}
+        self._config_writing = {}
+        self._write_governor = DucoWriteGovernor(
+            hass, self.config_entry.entry_id if self.config_entry else None
+        )
+
+        max_age = (self.update_interval or UPDATE_INTERVAL) * CACHE_MAX_AGE_INTERVALS
+        self._node_cache = LastKnownGoodCache(max_age.total_seconds())
+        self._info_cache = LastKnownGoodCache(max_age.total_seconds())
+        self._retry_unsub = None
+        self._retry_task = None
+        self._prewarm_unsub = None
+        self._profiler = CycleProfiler(hass)
+        self._capture = TrafficCapture(hass)
+        self._fetch_plan = FetchPlan()
+        self._registry_unsub = None
+
+        self._uptimes = {}
+        self._sw_versions = {}
+        self._restarted_nidxs = set()
+        self._box_restarted = False
 
         self.data = DeviceResponseEntry()
 
@@ -76,33 +166,81 @@ class DucoDeviceUpdateCoordinator(DataUpdateCoordinator[DeviceResponseEntry]):
     def duco_nidxs(self) -> set[int]:
         return self._duco_nidxs
 
+    @property
+    def config_writer(self) -> NodeConfigWriter:
+        return self._config_writer
+
+    @property
+    def write_governor(self) -> DucoWriteGovernor:
+        return self._write_governor
+
+    @property
+    def profiler(self) -> CycleProfiler:
+        return self._profiler
+
+    @property
+    def capture(self) -> TrafficCapture:
+        return self._capture
+
+    @property
+    def fetch_plan(self) -> FetchPlan:
+        return self._fetch_plan
+
+    @property
+    def watchdog(self) -> LoopWatchdog:
+        return self.api.watchdog
+
+    @property
+    def decode_router(self) -> DecodeRouter:
+        return self.api.decode_router
+
+    @property
+    def cycle_budget(self) -> float:
+        """Seconds a poll may take, requests still pending after it are cancelled."""
+        interval = self.update_interval or UPDATE_INTERVAL
+        return interval.total_seconds() * CYCLE_DEADLINE_RATIO
+
+    @property
+    def request_metrics(self) -> RequestMetrics:
+        return self.api.metrics
+
+    @property
+    def cache_ages(self) -> dict[str, Any]:
+        return {
+            "max_age": self._node_cache.max_age,
+            INFO_MODULE: self._info_cache.age(INFO_MODULE),
+            "nodes": self._node_cache.ages(),
+        }
+
+    @callback
+    def _async_store_resolved_host(self, address: str) -> None:
+        """Keep the working address so a restart does not need to resolve again."""
+        if self.config_entry is None:
+            return
+
+        self.hass.config_entries.async_update_entry(
+            self.config_entry,
+            data={**self.config_entry.data, CONF_RESOLVED_HOST: address},
+        )
+
     async def create_api_connection(self) -> None:
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
+        LOGGER.debug("create_api_connection")
 
         try:
+            await self._write_governor.async_load()
             await self.api.connect(api_key=self.api_key)
 
-            api_results = await self.api.get_nodes()
-            if api_results is not None:
-                for node in api_results.Nodes:
-                    if node is not None:
-                        self.duco_nidxs.add(node.Node)
-                        self.data.nodes[node.Node] = node
-
-            calls: list[
-                Coroutine[Any, Any, InfoDTO | NodeActionsDTO | NodeConfigDTO | None]
-            ] = [self.api.get_node_supported_actions(idx) for idx in self.duco_nidxs]
-            calls.extend([self.api.get_node_config(idx) for idx in self.duco_nidxs])
-            calls.append(self.api.get_info())
-            api_results = await asyncio.gather(*calls)
+            if (config := await self.api.get_config()) is not None:
+                daily_write_req_cnt = (
+                    config.General.get("Modbus", {})
+                    .get("DailyWriteReqCnt", {})
+                    .get("Val")
+                )
+                if isinstance(daily_write_req_cnt, int):
+                    self._write_governor.daily_limit = daily_write_req_cnt
 
-            for result in api_results:
-                if isinstance(result, InfoDTO):
-                    self.data.info = result
-                elif isinstance(result, NodeActionsDTO):
-                    self.data.node_actions[result.Node] = result
-                elif isinstance(result, NodeConfigDTO):
-                    self.data.node_configs[result.Node] = result
+            await self._async_discover_nodes()
+            await self._async_discover_node_details(self.duco_nidxs, fetch_info=True)
 
         except ApiError as ex:
             LOGGER.error(f"Error creating connection to Duco API: {ex}")
@@ -118,33 +256,223 @@ class DucoDeviceUpdateCoordinator(DataUpdateCoordinator[DeviceResponseEntry]):
                 ex, translation_domain=DOMAIN, translation_key="communication_error"
             ) from ex
 
+    async def _async_discover_nodes(self) -> set[int]:
+        """Read the node list, returns the indices that were not known before."""
+        LOGGER.debug("_async_discover_nodes")
+
+        api_results = await self.api.get_nodes()
+        if api_results is None:
+            return set()
+
+        nidxs = {node.Node for node in api_results.Nodes if node is not None}
+        new_nidxs = nidxs - self.duco_nidxs
+        for nidx in self.duco_nidxs - nidxs:
+            LOGGER.warning(f"Node {nidx} is no longer reported by the box")
+            self.duco_nidxs.discard(nidx)
+            self._node_cache.pop(nidx)
+
+        for node in api_results.Nodes:
+            if node is not None:
+                self.duco_nidxs.add(node.Node)
+                self._async_detect_restart(
+                    node.Node, node.General.UpTime, node.General.SwVersion
+                )
+                if not self._fetch_plan.polls(node.Node):
+                    continue
+
+                self._node_cache.set(node.Node, node)
+                self.data.nodes[node.Node] = node
+                self.data.reconcile_node(node)
+
+        return new_nidxs
+
+    async def _async_discover_node_details(
+        self, nidxs: Iterable[int], fetch_info: bool = False
+    ) -> set[int]:
+        """Read the supported actions and config of nodes (and /info).
+
+        Returns the nodes of which the actions or config could not be read.
+        """
+        LOGGER.debug("_async_discover_node_details")
+
+        nidxs = set(nidxs)
+        missed_actions, missed_configs = set(nidxs), set(nidxs)
+
+        # Gathered at once, but queued node by node: the scheduler starts them in
+        # order, so a read cut short by the deadline mostly leaves whole nodes
+        calls: list[
+            Coroutine[Any, Any, InfoDTO | NodeActionsDTO | NodeConfigDTO | None]
+        ] = []
+        for idx in nidxs:
+            calls.append(self.api.get_node_supported_actions(idx))
+            calls.append(self.api.get_node_config(idx))
+        if fetch_info:
+            calls.append(self.api.get_info())
+        api_results = await asyncio.gather(*calls)
+
+        for result in api_results:
+            if isinstance(result, InfoDTO):
+                self._info_cache.set(INFO_MODULE, result)
+                self.data.info = result
+                self._async_detect_restart(
+                    INFO_MODULE,
+                    result.General.Board.UpTime,
+                    result.General.Board.SwVersionBox,
+                )
+            elif isinstance(result, NodeActionsDTO):
+                self.data.node_actions[result.Node] = result
+                missed_actions.discard(result.Node)
+            elif isinstance(result, NodeConfigDTO):
+                self._async_store_node_config(result.Node, result)
+                missed_configs.discard(result.Node)
+
+        return missed_actions | missed_configs
+
+    def _async_detect_restart(
+        self, key: int | str, uptime: int | None, sw_version: str | None
+    ) -> bool:
+        """Return True when the uptime went back or the firmware changed."""
+        previous_uptime = self._uptimes.get(key)
+        previous_sw_version = self._sw_versions.get(key)
+        if uptime is not None:
+            self._uptimes[key] = uptime
+        if sw_version is not None:
+            self._sw_versions[key] = sw_version
+
+        rebooted = (
+            uptime is not None
+            and previous_uptime is not None
+            and uptime < previous_uptime
+        )
+        upgraded = (
+            sw_version is not None
+            and previous_sw_version is not None
+            and sw_version != previous_sw_version
+        )
+
+        if rebooted or upgraded:
+            LOGGER.info(
+                f"Detected restart of {key} ({previous_uptime=}, {uptime=}, "
+                f"{previous_sw_version=}, {sw_version=})"
+            )
+
+        return rebooted or upgraded
+
+    async def _async_handle_restarts(self) -> None:
+        """Invalidate only what a box or node restart made stale."""
+        LOGGER.debug("_async_handle_restarts")
+
+        nidxs = set(self._restarted_nidxs)
+        self._restarted_nidxs.clear()
+
+        if self._box_restarted:
+            self._box_restarted = False
+
+            # Pooled connections and the key fallback state died with the box
+            await self.api.reset()
+
+            if await self._async_discover_nodes() and self.config_entry is not None:
+                LOGGER.info("New nodes found after restart, reloading the entry")
+                self.hass.config_entries.async_schedule_reload(
+                    self.config_entry.entry_id
+                )
+
+            nidxs = set(self.duco_nidxs)
+
+        for nidx in nidxs:
+            self.data.node_action_states.pop(nidx, None)
+            self._config_originals.pop(nidx, None)
+            # Keep the states of the node read after the restart, drop the rest
+            if (node := self._node_cache.get(nidx)) is not None:
+                self.data.reconcile_node(node)
+
+        missed = await self._async_discover_node_details(nidxs)
+        self.data.nodes = self._node_cache.values()
+
+        if (remaining := remaining_budget()) is not None and remaining <= 0:
+            # Cut short by the cycle deadline, read what is missing next cycle
+            self._restarted_nidxs |= missed
+
+    async def async_close(self) -> None:
+        """Flush queued config writes and close the connection to the box."""
+        LOGGER.debug("async_close")
+
+        self._async_cancel_retry()
+        self._async_cancel_prewarm()
+        if self._registry_unsub is not None:
+            self._registry_unsub()
+            self._registry_unsub = None
+        self._capture.stop(self.api)
+        await self._config_writer.flush_all()
+        await self.api.disconnect()
+
     async def _async_update_data(self) -> DeviceResponseEntry:
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
+        LOGGER.debug("_async_update_data")
 
+        self._profiler.begin_cycle()
         try:
-            loop_time = asyncio.get_event_loop().time()
-            current_time = time.time()
-            time_stamp = self.api.api_timestamp
-            LOGGER.debug(f"Loop started: {time.ctime(loop_time)} ({loop_time=})")
-            LOGGER.debug(f"Current time: {time.ctime(current_time)} ({current_time=})")
-            LOGGER.debug(f"Key valid until: {time.ctime(time_stamp)} ({time_stamp=})")
+            data = await self._async_update_cycle()
 
-            if current_time > time_stamp:
-                await self.api.update_key()
+        except BaseException:
+            # However a cycle fails, the profiler must not stay enabled on the loop
+            self._profiler.end_cycle()
+            raise
 
-            calls: list[Coroutine[Any, Any, NodeDataDTO | InfoDTO | None]] = [
-                self.api.get_node_info(idx) for idx in self.duco_nidxs
-            ]
-            calls.append(self.api.get_info())
-            api_results = await asyncio.gather(*calls)
+        # The listeners are updated right after returning, without yielding, so
+        # ending on the next loop iteration includes the entity state writes
+        self.hass.loop.call_soon(self._profiler.end_cycle)
+        return data
 
-            if api_results:
-                self.data.nodes.clear()
-            for result in api_results:
-                if isinstance(result, NodeDataDTO):
-                    self.data.nodes[result.Node] = result
-                elif isinstance(result, InfoDTO):
-                    self.data.info = result
+    async def _async_update_cycle(self) -> DeviceResponseEntry:
+        try:
+            current_time = time.time()
+            time_stamp = self.api.api_timestamp
+            if TRACER.enabled:
+                LOGGER.debug(
+                    "Current time: %s, key valid until: %s, box time: %s "
+                    "(drift=%.1fppm, error=%.1fs)",
+                    time.ctime(current_time),
+                    time.ctime(time_stamp),
+                    time.ctime(self.api.clock.box_time()),
+                    self.api.clock.drift * 1e6,
+                    self.api.clock.error,
+                )
+
+            self._async_cancel_retry()
+            with TRACER.cycle("update"):
+                with request_deadline(self.cycle_budget):
+                    if current_time > time_stamp:
+                        with TRACER.span("update_key"):
+                            await self.api.update_key()
+
+                    nidxs = self._fetch_plan.nidxs(self.duco_nidxs)
+                    fetch_info = self._fetch_plan.info
+                    if not fetch_info and self.api.clock.needs_resync:
+                        # The clock is sampled from /info, which is not polled
+                        with TRACER.span("sync_clock"):
+                            await self.api.sync_clock()
+
+                    with TRACER.span("fetch"):
+                        failed_nidxs, info_failed = await self._async_fetch(
+                            nidxs, fetch_info=fetch_info
+                        )
+
+                    if (
+                        (nidxs or fetch_info)
+                        and not self.data.nodes
+                        and self.data.info is None
+                    ):
+                        raise ApiError("No data received from any node or module")
+
+                    # Re-reading after a restart shares the budget of the cycle
+                    if self._box_restarted or self._restarted_nidxs:
+                        with TRACER.span("restarts"):
+                            # Like the poll, leave the last slot to user commands
+                            with request_priority(RequestPriority.BACKGROUND):
+                                await self._async_handle_restarts()
+
+            if failed_nidxs or info_failed:
+                self._async_schedule_retry(failed_nidxs, info_failed)
 
         except ApiError as ex:
             LOGGER.error(f"Error fetching data from Duco API: {ex}")
@@ -154,5 +482,306 @@ class DucoDeviceUpdateCoordinator(DataUpdateCoordinator[DeviceResponseEntry]):
             ) from ex
 
         self.api_disabled = False
+        self._async_schedule_prewarm()
 
         return self.data
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all listeners, timing the state writes they cause."""
+        with self.watchdog.section("listeners"):
+            super().async_update_listeners()
+
+    async def _async_fetch(
+        self, nidxs: Iterable[int], fetch_info: bool
+    ) -> tuple[set[int], bool]:
+        """Fetch nodes (and /info), keeping the last known good value on failure."""
+        nidxs = list(nidxs)
+        calls: list[Coroutine[Any, Any, NodeDataDTO | InfoDTO | None]] = [
+            self.api.get_node_info(idx) for idx in nidxs
+        ]
+        if fetch_info:
+            calls.append(self.api.get_info())
+
+        # Polling yields to user commands issued while the burst is running
+        with request_priority(RequestPriority.BACKGROUND):
+            api_results = await asyncio.gather(*calls, return_exceptions=True)
+
+        # Merging the results into the cache and entry does not yield
+        with self.watchdog.section("diff"):
+            failed_nidxs: set[int] = set()
+            for nidx, result in zip(nidxs, api_results):
+                if isinstance(result, NodeDataDTO):
+                    self._node_cache.set(nidx, result)
+                    self.data.reconcile_node(result)
+                    if self._async_detect_restart(
+                        nidx, result.General.UpTime, result.General.SwVersion
+                    ):
+                        self._restarted_nidxs.add(nidx)
+                else:
+                    failed_nidxs.add(nidx)
+
+            info_failed = False
+            if fetch_info:
+                if isinstance(result := api_results[-1], InfoDTO):
+                    self._info_cache.set(INFO_MODULE, result)
+                    if self._async_detect_restart(
+                        INFO_MODULE,
+                        result.General.Board.UpTime,
+                        result.General.Board.SwVersionBox,
+                    ):
+                        self._box_restarted = True
+                else:
+                    info_failed = True
+
+            if failed_nidxs or info_failed:
+                LOGGER.warning(
+                    f"Serving cached data for nodes {sorted(failed_nidxs)}"
+                    + (" and /info" if info_failed else "")
+                )
+
+            self._async_apply_cache()
+        return failed_nidxs, info_failed
+
+    @callback
+    def async_track_entities(self, entities: Iterable[DucoEntity]) -> None:
+        """Poll what these entities read, for as long as one of them is enabled."""
+        for entity in entities:
+            self._fetch_plan.track(
+                entity.unique_id,
+                entity.fetch_target,
+                entity.entity_registry_enabled_default,
+            )
+
+        if self._registry_unsub is None:
+            self._registry_unsub = self.hass.bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED,
+                self._async_registry_updated,
+                event_filter=_affects_fetch_plan,
+            )
+
+        self._async_rebuild_fetch_plan()
+
+    @callback
+    def _async_registry_updated(
+        self, _: Event[er.EventEntityRegistryUpdatedData]
+    ) -> None:
+        self._async_rebuild_fetch_plan()
+
+    @callback
+    def _async_rebuild_fetch_plan(self) -> None:
+        if self.config_entry is None:
+            return
+
+        polled = self._fetch_plan.nidxs(self.duco_nidxs)
+        self._fetch_plan.rebuild(er.async_get(self.hass), self.config_entry.entry_id)
+
+        # Nodes nobody reads anymore are dropped, not left to expire with a warning
+        for nidx in polled - self._fetch_plan.nidxs(self.duco_nidxs):
+            self._node_cache.pop(nidx)
+            self.data.nodes.pop(nidx, None)
+
+        LOGGER.debug("Fetch plan: %s", self._fetch_plan.as_dict(self.duco_nidxs))
+
+    def _async_apply_cache(self) -> None:
+        """Publish the last known good values that did not exceed the max age."""
+        for nidx in self._node_cache.expire():
+            LOGGER.warning(f"Cached data of node {nidx} expired, marking unavailable")
+
+        self.data.nodes = self._node_cache.values()
+        self.data.info = self._info_cache.get(INFO_MODULE)
+
+    def _async_schedule_retry(self, nidxs: set[int], fetch_info: bool) -> None:
+        """Retry only the failed nodes shortly, instead of a full interval later."""
+
+        async def _async_retry() -> None:
+            LOGGER.debug("Retrying failed nodes %s (fetch_info=%s)", nidxs, fetch_info)
+
+            with request_deadline(self.cycle_budget):
+                await self._async_fetch(nidxs, fetch_info)
+            self.async_update_listeners()
+
+        @callback
+        def _async_start_retry(_: datetime) -> None:
+            self._retry_unsub = None
+            self._retry_task = self.hass.async_create_background_task(
+                _async_retry(), f"{DOMAIN} retry of failed nodes"
+            )
+
+        self._async_cancel_retry()
+        self._retry_unsub = async_call_later(
+            self.hass, FAILED_RETRY_DELAY, _async_start_retry
+        )
+
+    def _async_cancel_retry(self) -> None:
+        """Cancel a pending retry, and one still running when the next poll starts."""
+        if self._retry_unsub is not None:
+            self._retry_unsub()
+            self._retry_unsub = None
+
+        if self._retry_task is not None:
+            self._retry_task.cancel()
+            self._retry_task = None
+
+    def _async_schedule_prewarm(self) -> None:
+        """Open a connection shortly before the next poll is due."""
+        self._async_cancel_prewarm()
+        if self.update_interval is None or self.update_interval <= PREWARM_LEAD:
+            return
+
+        async def _async_prewarm(_: datetime) -> None:
+            self._prewarm_unsub = None
+            with request_priority(RequestPriority.BACKGROUND):
+                await self.api.prewarm()
+
+        self._prewarm_unsub = async_call_later(
+            self.hass, self.update_interval - PREWARM_LEAD, _async_prewarm
+        )
+
+    def _async_cancel_prewarm(self) -> None:
+        if self._prewarm_unsub is not None:
+            self._prewarm_unsub()
+            self._prewarm_unsub = None
+
+    async def async_refresh_node(self, nidx: int) -> None:
+        """Re-read a single node after a write instead of polling everything."""
+        LOGGER.debug("async_refresh_node nidx=%s", nidx)
+
+        if not self._fetch_plan.polls(nidx):
+            # Nothing enabled reads the node, it would only expire in the cache
+            self.async_update_listeners()
+            return
+
+        if (node := await self.api.get_node_info(nidx)) is not None:
+            self._node_cache.set(nidx, node)
+            self.data.nodes[nidx] = node
+            self.data.reconcile_node(node)
+
+        # Not async_set_updated_data, that would push back the next poll
+        self.async_update_listeners()
+
+    async def async_refresh_node_config(self, nidx: int) -> None:
+        """Re-read the config of a single node after a config write."""
+        LOGGER.debug("async_refresh_node_config nidx=%s", nidx)
+
+        if (node_config := await self.api.get_node_config(nidx)) is not None:
+            self._async_store_node_config(nidx, node_config)
+
+        self.async_update_listeners()
+
+    def _async_store_node_config(self, nidx: int, config: NodeConfigDTO) -> None:
+        """Store a config read from the box, keeping the values not written yet.
+
+        The values read become the confirmed originals of the ones still
+        queued or in flight, which stay applied optimistically on top.
+        """
+        self.data.node_configs[nidx] = config
+
+        originals = self._config_originals.get(nidx, {})
+        unwritten = {
+            **self._config_writing.get(nidx, {}),
+            **self._config_writer.pending(nidx),
+        }
+        for node_config in list(originals):
+            current: ValRange | None = getattr(config, node_config, None)
+            if current is None or node_config not in unwritten:
+                del originals[node_config]
+                continue
+
+            originals[node_config] = current
+            setattr(config, node_config, replace(current, Val=unwritten[node_config]))
+
+    def async_queue_node_config_value(
+        self, nidx: int, node_config: str, value: int
+    ) -> asyncio.Future[bool]:
+        """Apply a config value optimistically and queue it for a merged write."""
+        LOGGER.debug("async_queue_node_config_value nidx=%s", nidx)
+
+        config = self.data.node_configs.get(nidx)
+        current: ValRange | None = getattr(config, node_config, None)
+        originals = self._config_originals.setdefault(nidx, {})
+        confirmed = originals.get(node_config, current)
+
+        if (
+            confirmed is not None
+            and confirmed.Val == value
+            and node_config not in self._config_writing.get(nidx, {})
+        ):
+            # The box already holds this value, drop the write (and any pending one)
+            LOGGER.debug(
+                "Skipping no-op write of %s=%s to %s", node_config, value, nidx
+            )
+            setattr(config, node_config, confirmed)
+            originals.pop(node_config, None)
+            return self._config_writer.discard(nidx, node_config)
+
+        if current is not None:
+            originals.setdefault(node_config, current)
+            setattr(config, node_config, replace(current, Val=value))
+
+        # Collapse more slider moves into one write when the budget runs low
+        self._config_writer.delay = (
+            CONFIG_WRITE_PRESSURE_DELAY
+            if self._write_governor.under_pressure
+            else CONFIG_WRITE_DELAY
+        ).total_seconds()
+
+        return self._config_writer.queue(nidx, node_config, value)
+
+    async def _async_write_node_config(self, nidx: int, values: dict[str, Any]) -> bool:
+        """Send the merged values of a node, then confirm or roll back.
+
+        The originals stay until the re-read config has landed, so values
+        queued in the meantime are still rolled back to what the box holds.
+        """
+        self._config_writing[nidx] = values
+        try:
+            written = self._write_governor.async_consume() and (
+                await self.api.set_node_config_values(nidx, values)
+            )
+
+        finally:
+            self._config_writing.pop(nidx, None)
+
+        if written:
+            # Accepted by the box, which counts until the re-read says otherwise
+            originals = self._config_originals.get(nidx, {})
+            for node_config, value in values.items():
+                if (original := originals.get(node_config)) is not None:
+                    originals[node_config] = replace(original, Val=value)
+
+            await self.async_refresh_node_config(nidx)
+            return True
+
+        # Values queued again after this write roll back when that one fails
+        config = self.data.node_configs.get(nidx)
+        originals = self._config_originals.get(nidx, {})
+        pending = self._config_writer.pending(nidx)
+        for node_config in values:
+            if node_config in pending:
+                continue
+
+            original = originals.pop(node_config, None)
+            if config is not None and original is not None:
+                setattr(config, node_config, original)
+
+        self.async_update_listeners()
+        return False
+
+    async def async_set_node_action_state(
+        self, nidx: int, node_action: str, value: Any
+    ) -> bool:
+        """Write an action state to a node within the daily write budget."""
+        LOGGER.debug("async_set_node_action_state nidx=%s", nidx)
+
+        if (
+            self._write_governor.under_pressure
+            and self.data.action_state(nidx, node_action) == value
+        ):
+            LOGGER.debug("Skipping redundant %s=%s for %s", node_action, value, nidx)
+            return True
+
+        if not self._write_governor.async_consume():
+            return False
+
+        return await self.data.set_node_action_state(self.api, nidx, node_action, value)
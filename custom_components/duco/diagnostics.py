@@ -10,9 +10,11 @@ from homeassistant.const import CONF_HOST
 from homeassistant.core import HomeAssistant
 
 from . import DucoConfigEntry
+from .const import CONF_RESOLVED_HOST, TRACER
 
 TO_REDACT = {
     CONF_HOST,
+    CONF_RESOLVED_HOST,
     "serial",
     "wifi_ssid",
 }
@@ -22,13 +24,22 @@ async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: DucoConfigEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
-    data = entry.runtime_data.data
+    coordinator = entry.runtime_data
+    data = coordinator.data
 
     redact_data: dict[str, Any] = {
         "entry": async_redact_data(entry.data, TO_REDACT),
         "data": {
             "info": asdict(data.info) if data.info else None,
-            "nodes": [asdict(node) for node in data.nodes],
+            "nodes": [asdict(node) for node in data.nodes.values()],
         },
+        "cache_ages": coordinator.cache_ages,
+        "fetch_plan": coordinator.fetch_plan.as_dict(coordinator.duco_nidxs),
+        "write_budget": coordinator.write_governor.as_dict(),
+        "request_metrics": coordinator.request_metrics.as_dict(),
+        "last_cycle_trace": TRACER.last_cycle,
+        "profile": coordinator.profiler.summary,
+        "loop_watchdog": coordinator.watchdog.as_dict(),
+        "decode_router": coordinator.decode_router.as_dict(),
     }
     return async_redact_data(redact_data, TO_REDACT)
@@ -10,7 +10,7 @@ from homeassistant.helpers.device_registry import (
 )
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, MANUFACTURER
+from .const import DOMAIN, INFO_MODULE, MANUFACTURER
 from .api.DTO.NodeInfoDTO import NodeDataDTO
 from .coordinator import DucoDeviceUpdateCoordinator
 
@@ -19,12 +19,14 @@ class DucoEntity(CoordinatorEntity[DucoDeviceUpdateCoordinator]):
     """Defines a Duco entity."""
 
     _attr_has_entity_name = True
+    _fetch_target: int | str | None
 
     def __init__(
         self, coordinator: DucoDeviceUpdateCoordinator, node: NodeDataDTO | None = None
     ) -> None:
         """Initialize the Duco entity."""
         super().__init__(coordinator)
+        self._fetch_target = node.Node if node is not None else INFO_MODULE
 
         if node is not None:
             self._attr_device_info = DeviceInfo(
@@ -65,3 +67,8 @@ class DucoEntity(CoordinatorEntity[DucoDeviceUpdateCoordinator]):
                     (CONNECTION_NETWORK_MAC, serial_number)
                 }
                 self._attr_device_info[ATTR_IDENTIFIERS] = {(DOMAIN, serial_number)}
+
+    @property
+    def fetch_target(self) -> int | str | None:
+        """The node index or module this entity reads, None if it reads neither."""
+        return self._fetch_target
@@ -0,0 +1,64 @@
+"""What the coordinator polls, derived from the enabled entities."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.helpers import entity_registry as er
+
+from .const import INFO_MODULE
+
+
+class FetchPlan:
+    """Polls only the nodes and modules that at least one enabled entity reads.
+
+    Entities declare what they read (a node index or a module) when they are
+    created; whether they are enabled comes from the entity registry, or from
+    their default when they are not registered yet. Until any entity is
+    known, everything is polled.
+    """
+
+    _demand: dict[str, tuple[int | str, bool]]
+    _targets: set[int | str] | None
+
+    def __init__(self) -> None:
+        self._demand = {}
+        self._targets = None
+
+    @property
+    def info(self) -> bool:
+        return self.polls(INFO_MODULE)
+
+    def polls(self, target: int | str) -> bool:
+        return self._targets is None or target in self._targets
+
+    def nidxs(self, known: set[int]) -> set[int]:
+        return {nidx for nidx in known if self.polls(nidx)}
+
+    def track(
+        self, unique_id: str | None, target: int | str | None, enabled_default: bool
+    ) -> None:
+        if unique_id is not None and target is not None:
+            self._demand[unique_id] = (target, enabled_default)
+
+    def rebuild(self, registry: er.EntityRegistry, config_entry_id: str) -> None:
+        if not self._demand:
+            return
+
+        disabled = {
+            entry.unique_id: entry.disabled
+            for entry in er.async_entries_for_config_entry(registry, config_entry_id)
+        }
+        self._targets = {
+            target
+            for unique_id, (target, enabled_default) in self._demand.items()
+            if not disabled.get(unique_id, not enabled_default)
+        }
+
+    def as_dict(self, known: set[int]) -> dict[str, Any]:
+        return {
+            "entities": len(self._demand),
+            "nodes": sorted(self.nidxs(known)),
+            "skipped_nodes": sorted(known - self.nidxs(known)),
+            "info": self.info,
+        }
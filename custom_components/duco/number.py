@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import inspect
 from dataclasses import dataclass
 from collections.abc import Awaitable, Callable
 
@@ -17,10 +16,10 @@ from homeassistant.const import (
     UnitOfVolumeFlowRate,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import DucoConfigEntry
-from .api.private.duco_client import DucoClient
 from .api.DTO.NodeInfoDTO import NodeDataDTO
 from .api.DTO.NodeConfigDTO import ValRange
 from .const import DeviceResponseEntry, LOGGER
@@ -35,7 +34,7 @@ class DucoNumberEntityDescription(NumberEntityDescription):
     node_config: str
     exists_fn: Callable[[DeviceResponseEntry, int, str], bool] = lambda x, y, z: True
     available_fn: Callable[[DeviceResponseEntry, int, str], bool] = lambda x, y, z: True
-    set_fn: Callable[[DucoClient, int, str, int], Awaitable[None]]
+    set_fn: Callable[[DucoDeviceUpdateCoordinator, int, str, int], Awaitable[bool]]
 
 
 NUMBERS = [
@@ -55,8 +54,8 @@ NUMBERS = [
             and hasattr(x.node_configs[nidx], node_config)
             and getattr(x.node_configs[nidx], node_config) is not None
         ),
-        set_fn=lambda api, nidx, node_config, value: api.set_node_config_value(
-            nidx, node_config, value
+        set_fn=lambda coordinator, nidx, node_config, value: (
+            coordinator.async_queue_node_config_value(nidx, node_config, value)
         ),
     ),
     DucoNumberEntityDescription(
@@ -75,8 +74,8 @@ NUMBERS = [
             and hasattr(x.node_configs[nidx], node_config)
             and getattr(x.node_configs[nidx], node_config) is not None
         ),
-        set_fn=lambda api, nidx, node_config, value: api.set_node_config_value(
-            nidx, node_config, value
+        set_fn=lambda coordinator, nidx, node_config, value: (
+            coordinator.async_queue_node_config_value(nidx, node_config, value)
         ),
     ),
     DucoNumberEntityDescription(
@@ -95,8 +94,8 @@ NUMBERS = [
             and hasattr(x.node_configs[nidx], node_config)
             and getattr(x.node_configs[nidx], node_config) is not None
         ),
-        set_fn=lambda api, nidx, node_config, value: api.set_node_config_value(
-            nidx, node_config, value
+        set_fn=lambda coordinator, nidx, node_config, value: (
+            coordinator.async_queue_node_config_value(nidx, node_config, value)
         ),
     ),
     DucoNumberEntityDescription(
@@ -115,8 +114,8 @@ NUMBERS = [
             and hasattr(x.node_configs[nidx], node_config)
             and getattr(x.node_configs[nidx], node_config) is not None
         ),
-        set_fn=lambda api, nidx, node_config, value: api.set_node_config_value(
-            nidx, node_config, value
+        set_fn=lambda coordinator, nidx, node_config, value: (
+            coordinator.async_queue_node_config_value(nidx, node_config, value)
         ),
     ),
     DucoNumberEntityDescription(
@@ -135,8 +134,8 @@ NUMBERS = [
             and hasattr(x.node_configs[nidx], node_config)
             and getattr(x.node_configs[nidx], node_config) is not None
         ),
-        set_fn=lambda api, nidx, node_config, value: api.set_node_config_value(
-            nidx, node_config, value
+        set_fn=lambda coordinator, nidx, node_config, value: (
+            coordinator.async_queue_node_config_value(nidx, node_config, value)
         ),
     ),
     DucoNumberEntityDescription(
@@ -155,8 +154,8 @@ NUMBERS = [
             and hasattr(x.node_configs[nidx], node_config)
             and getattr(x.node_configs[nidx], node_config) is not None
         ),
-        set_fn=lambda api, nidx, node_config, value: api.set_node_config_value(
-            nidx, node_config, value
+        set_fn=lambda coordinator, nidx, node_config, value: (
+            coordinator.async_queue_node_config_value(nidx, node_config, value)
         ),
     ),
     DucoNumberEntityDescription(
@@ -175,8 +174,8 @@ NUMBERS = [
             and hasattr(x.node_configs[nidx], node_config)
             and getattr(x.node_configs[nidx], node_config) is not None
         ),
-        set_fn=lambda api, nidx, node_config, value: api.set_node_config_value(
-            nidx, node_config, value
+        set_fn=lambda coordinator, nidx, node_config, value: (
+            coordinator.async_queue_node_config_value(nidx, node_config, value)
         ),
     ),
     DucoNumberEntityDescription(
@@ -194,8 +193,8 @@ NUMBERS = [
             and hasattr(x.node_configs[nidx], node_config)
             and getattr(x.node_configs[nidx], node_config) is not None
         ),
-        set_fn=lambda api, nidx, node_config, value: api.set_node_config_value(
-            nidx, node_config, value
+        set_fn=lambda coordinator, nidx, node_config, value: (
+            coordinator.async_queue_node_config_value(nidx, node_config, value)
         ),
     ),
     DucoNumberEntityDescription(
@@ -214,8 +213,8 @@ NUMBERS = [
             and hasattr(x.node_configs[nidx], node_config)
             and getattr(x.node_configs[nidx], node_config) is not None
         ),
-        set_fn=lambda api, nidx, node_config, value: api.set_node_config_value(
-            nidx, node_config, value
+        set_fn=lambda coordinator, nidx, node_config, value: (
+            coordinator.async_queue_node_config_value(nidx, node_config, value)
         ),
     ),
     DucoNumberEntityDescription(
@@ -233,8 +232,8 @@ NUMBERS = [
             and hasattr(x.node_configs[nidx], node_config)
             and getattr(x.node_configs[nidx], node_config) is not None
         ),
-        set_fn=lambda api, nidx, node_config, value: api.set_node_config_value(
-            nidx, node_config, value
+        set_fn=lambda coordinator, nidx, node_config, value: (
+            coordinator.async_queue_node_config_value(nidx, node_config, value)
         ),
     ),
     DucoNumberEntityDescription(
@@ -252,8 +251,8 @@ NUMBERS = [
             and hasattr(x.node_configs[nidx], node_config)
             and getattr(x.node_configs[nidx], node_config) is not None
         ),
-        set_fn=lambda api, nidx, node_config, value: api.set_node_config_value(
-            nidx, node_config, value
+        set_fn=lambda coordinator, nidx, node_config, value: (
+            coordinator.async_queue_node_config_value(nidx, node_config, value)
         ),
     ),
 ]
@@ -264,7 +263,7 @@ async def async_setup_entry(
     entry: DucoConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    LOGGER.debug(f"number:{inspect.currentframe().f_code.co_name}")
+    LOGGER.debug("number:async_setup_entry")
 
     """Set up the Identify button."""
     add_entities: list[DucoNumberEntity] = [
@@ -274,6 +273,7 @@ async def async_setup_entry(
         if number.exists_fn(entry.runtime_data.data, node.Node, number.node_config)
     ]
 
+    entry.runtime_data.async_track_entities(add_entities)
     async_add_entities(add_entities)
 
 
@@ -288,6 +288,8 @@ class DucoNumberEntity(DucoEntity, NumberEntity):
     ) -> None:
         """Initialize number."""
         super().__init__(coordinator, node)
+        # Reads the node config, which the node poll does not refresh
+        self._fetch_target = None
 
         self._node_id = node.Node
         self._node_config = description.node_config
@@ -343,25 +345,16 @@ class DucoNumberEntity(DucoEntity, NumberEntity):
         return round(value)
 
     async def async_set_native_value(self, value: float) -> None:
-        """Activate the ventilation action."""
-        LOGGER.debug(f"{inspect.currentframe().f_code.co_name}")
+        """Set the config value, showing it optimistically until confirmed."""
+        LOGGER.debug("async_set_native_value")
 
-        await self.entity_description.set_fn(
-            self.coordinator.api, self._node_id, self._node_config, int(value)
+        # Slider moves are debounced and merged per node by the coordinator
+        write = self.entity_description.set_fn(
+            self.coordinator, self._node_id, self._node_config, int(value)
         )
-        await self.coordinator.async_refresh()
+        self.async_write_ha_state()
 
-        node_config: ValRange | None = getattr(
-            self.coordinator.data.node_configs[self._node_id], self._node_config
-        )
-        if node_config is not None:
-            setattr(
-                self.coordinator.data.node_configs[self._node_id],
-                self._node_config,
-                ValRange(
-                    Val=int(value),
-                    Inc=node_config.Inc,
-                    Min=node_config.Min,
-                    Max=node_config.Max,
-                ),
+        if not await write:
+            raise HomeAssistantError(
+                f"Failed to set {self._node_config} for node {self._node_id}"
             )
@@ -0,0 +1,132 @@
+"""On-demand profiling of the Duco polling pipeline."""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, LOGGER
+
+SUMMARY_SIZE = 25
+
+
+class CycleProfiler:
+    """Profiles the next cycles of the coordinator with cProfile.
+
+    A cycle starts when the coordinator begins fetching and ends after its
+    listeners (the entity state writes) were called, or when the fetch
+    fails. The profiler is only enabled within cycles, so the rest of Home
+    Assistant is only included as far as it runs on the event loop during one.
+    """
+
+    _hass: HomeAssistant
+    _profile: cProfile.Profile | None
+    _remaining: int
+    _cycles: int
+    _enabled: bool
+    _started: float
+    _summary: dict[str, Any] | None
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._profile = None
+        self._remaining = 0
+        self._cycles = 0
+        self._enabled = False
+        self._started = 0.0
+        self._summary = None
+
+    @property
+    def active(self) -> bool:
+        return self._profile is not None
+
+    @property
+    def summary(self) -> dict[str, Any] | None:
+        return self._summary
+
+    def start(self, cycles: int) -> None:
+        if self._profile is not None:
+            LOGGER.warning("Profiling already in progress")
+            return
+
+        LOGGER.info("Profiling the next %d update cycle(s)", cycles)
+        self._profile = cProfile.Profile()
+        self._remaining = cycles
+        self._cycles = cycles
+        self._started = time.time()
+
+    def begin_cycle(self) -> None:
+        if self._profile is None or self._enabled:
+            return
+
+        try:
+            self._profile.enable()
+
+        except ValueError as e:
+            # Another profiler (e.g. the profiler integration) is running
+            LOGGER.warning("Cannot profile the update cycle: %s", e)
+            self._profile = None
+            return
+
+        self._enabled = True
+
+    def end_cycle(self) -> None:
+        if self._profile is None or not self._enabled:
+            return
+
+        self._profile.disable()
+        self._enabled = False
+        self._remaining -= 1
+        if self._remaining > 0:
+            return
+
+        profile, self._profile = self._profile, None
+        self._hass.async_create_background_task(
+            self._async_write_report(profile), f"{DOMAIN} profile report"
+        )
+
+    async def _async_write_report(self, profile: cProfile.Profile) -> None:
+        path = self._hass.config.path(
+            f"{DOMAIN}_profile_{time.strftime('%Y%m%d_%H%M%S')}.txt"
+        )
+        self._summary = await self._hass.async_add_executor_job(
+            self._write_report, profile, path
+        )
+        LOGGER.info("Profile of %d update cycle(s) written to %s", self._cycles, path)
+
+    def _write_report(self, profile: cProfile.Profile, path: str) -> dict[str, Any]:
+        stream = io.StringIO()
+        stats = pstats.Stats(profile, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats()
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(SUMMARY_SIZE)
+
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(stream.getvalue())
+
+        entries = sorted(
+            stats.stats.items(),  # type: ignore[attr-defined]
+            key=lambda item: item[1][3],
+            reverse=True,
+        )
+        return {
+            "started": self._started,
+            "cycles": self._cycles,
+            "report": path,
+            "total_time": stats.total_tt,  # type: ignore[attr-defined]
+            "top_cumulative": [
+                {
+                    "function": f"{file}:{line}({name})",
+                    "calls": calls,
+                    "tottime": round(tottime, 6),
+                    "cumtime": round(cumtime, 6),
+                }
+                for (file, line, name), (_, calls, tottime, cumtime, _) in entries[
+                    :SUMMARY_SIZE
+                ]
+            ],
+        }
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import inspect
 from collections.abc import Callable
 from dataclasses import dataclass
 
@@ -11,24 +10,30 @@ from homeassistant.components.sensor import (
 from homeassistant.components.sensor.const import SensorDeviceClass, SensorStateClass
 from homeassistant.const import (
     CONCENTRATION_PARTS_PER_MILLION,
+    EntityCategory,
     PERCENTAGE,
     REVOLUTIONS_PER_MINUTE,
     SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    UnitOfInformation,
     UnitOfPressure,
     UnitOfTemperature,
     UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
 from . import DucoConfigEntry
 from .api.DTO.InfoDTO import InfoDTO
 from .api.DTO.NodeInfoDTO import NodeDataDTO
-from .const import LOGGER
+from .api.tracing import ThrottledLogger
+from .const import LOGGER, NO_VALUE_WARNING_INTERVAL
 from .coordinator import DucoDeviceUpdateCoordinator
 from .entity import DucoEntity
 
+# Values are evaluated on every coordinator update, missing ones are reported sparingly
+_NO_VALUE_LOGGER = ThrottledLogger(LOGGER, NO_VALUE_WARNING_INTERVAL.total_seconds())
+
 
 @dataclass(kw_only=True, frozen=True)
 class DucoBoxSensorEntityDescription(SensorEntityDescription):
@@ -50,6 +55,13 @@ class DucoNodeSensorEntityDescription(SensorEntityDescription):
     value_fn: Callable[[NodeDataDTO], float | int | str | None] = lambda _: None
 
 
+@dataclass(kw_only=True, frozen=True)
+class DucoDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a Duco integration diagnostic sensor entity."""
+
+    value_fn: Callable[[DucoDeviceUpdateCoordinator], StateType]
+
+
 # Define the sensor types
 SENSORS_DUCOBOX: tuple[DucoBoxSensorEntityDescription, ...] = (
     DucoBoxSensorEntityDescription(
@@ -221,6 +233,61 @@ SENSORS_DUCOBOX: tuple[DucoBoxSensorEntityDescription, ...] = (
         and device.General.Lan.RssiWifi is not None,
     ),
 )
+SENSORS_DIAGNOSTIC: tuple[DucoDiagnosticSensorEntityDescription, ...] = (
+    DucoDiagnosticSensorEntityDescription(
+        key="write_budget_remaining",
+        name="Write budget remaining",
+        icon="mdi:counter",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.write_governor.remaining,
+    ),
+    DucoDiagnosticSensorEntityDescription(
+        key="request_latency",
+        name="Request latency",
+        icon="mdi:timer-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        value_fn=lambda coordinator: (
+            None
+            if (latency := coordinator.request_metrics.totals()["latency_mean"]) is None
+            else latency * 1000
+        ),
+    ),
+    DucoDiagnosticSensorEntityDescription(
+        key="request_retries",
+        name="Request retries",
+        icon="mdi:restart",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.request_metrics.totals()["retries"],
+    ),
+    DucoDiagnosticSensorEntityDescription(
+        key="request_errors",
+        name="Request errors",
+        icon="mdi:alert-circle-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.request_metrics.totals()["errors"],
+    ),
+    DucoDiagnosticSensorEntityDescription(
+        key="bytes_received",
+        name="Bytes received",
+        icon="mdi:download-network-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        value_fn=lambda coordinator: coordinator.request_metrics.totals()["bytes_in"],
+    ),
+)
 SENSORS_ZONES: dict[str, tuple[DucoNodeSensorEntityDescription, ...]] = {
     "BOX": (
         DucoNodeSensorEntityDescription(
@@ -534,7 +601,7 @@ async def async_setup_entry(
     entry: DucoConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    LOGGER.debug(f"sensor:{inspect.currentframe().f_code.co_name}")
+    LOGGER.debug("sensor:async_setup_entry")
 
     entities: list[DucoEntity] = [
         DucoBoxSensorEntity(entry.runtime_data, description)
@@ -548,7 +615,12 @@ async def async_setup_entry(
         if description.exists_fn(node)
     ]
     entities.extend(node_entities)
+    entities.extend(
+        DucoDiagnosticSensorEntity(entry.runtime_data, description)
+        for description in SENSORS_DIAGNOSTIC
+    )
 
+    entry.runtime_data.async_track_entities(entities)
     async_add_entities(entities)
 
 
@@ -574,35 +646,45 @@ class DucoBoxSensorEntity(DucoEntity, SensorEntity):
         ):
             self._attr_entity_registry_enabled_default = False
 
-    @property
-    def native_value(self) -> StateType:
-        """Return the sensor value."""
-        value = None
+        self._update_native_value()
 
-        try:
-            value = (
-                self.entity_description.value_fn(self.coordinator.data.info)
-                if self.coordinator.data.info
-                and self.entity_description.exists_fn(self.coordinator.data.info)
-                else None
-            )
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Evaluate the value once, then write the state."""
+        self._update_native_value()
+        super()._handle_coordinator_update()
 
-        except Exception as e:
-            LOGGER.error(
-                f"Error while processing sensor {self.entity_description.name}: {e}"
-            )
+    def _update_native_value(self) -> None:
+        """Evaluate the sensor value."""
+        with self.coordinator.watchdog.section("native_value"):
+            value = None
 
-        if value is None:
-            LOGGER.warning(
-                f"Sensor {self.entity_description.name} has no value. InfoNode: {self.coordinator.data.info}"
-            )
+            try:
+                value = (
+                    self.entity_description.value_fn(self.coordinator.data.info)
+                    if self.coordinator.data.info
+                    and self.entity_description.exists_fn(self.coordinator.data.info)
+                    else None
+                )
+
+            except Exception as e:
+                LOGGER.error(
+                    f"Error while processing sensor {self.entity_description.name}: {e}"
+                )
 
-        return value
+            if value is None:
+                _NO_VALUE_LOGGER.warning(
+                    self.unique_id,
+                    "Sensor %s has no value",
+                    self.entity_description.name,
+                )
+
+            self._attr_native_value = value
 
     @property
     def available(self) -> bool:
         """Return availability of meter."""
-        return super().available and self.native_value is not None
+        return super().available and self._attr_native_value is not None
 
 
 class DucoNodeSensorEntity(DucoEntity, SensorEntity):
@@ -629,33 +711,71 @@ class DucoNodeSensorEntity(DucoEntity, SensorEntity):
         if not description.enabled_fn(node):
             self._attr_entity_registry_enabled_default = False
 
-    @property
-    def native_value(self) -> StateType:
-        """Return the sensor value."""
-        value = None
-
-        try:
-            if self.node.Node in self.coordinator.data.nodes:
-                self.node = self.coordinator.data.nodes[self.node.Node]
-                value = (
-                    self.entity_description.value_fn(self.node)
-                    if self.entity_description.exists_fn(self.node)
-                    else None
+        self._update_native_value()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Evaluate the value once, then write the state."""
+        self._update_native_value()
+        super()._handle_coordinator_update()
+
+    def _update_native_value(self) -> None:
+        """Evaluate the sensor value."""
+        with self.coordinator.watchdog.section("native_value"):
+            value = None
+
+            try:
+                if self.node.Node in self.coordinator.data.nodes:
+                    self.node = self.coordinator.data.nodes[self.node.Node]
+                    value = (
+                        self.entity_description.value_fn(self.node)
+                        if self.entity_description.exists_fn(self.node)
+                        else None
+                    )
+
+            except Exception as e:
+                LOGGER.error(
+                    f"Error while processing sensor {self.entity_description.name}: {e}"
                 )
 
-        except Exception as e:
-            LOGGER.error(
-                f"Error while processing sensor {self.entity_description.name}: {e}"
-            )
-
-        if value is None:
-            LOGGER.warning(
-                f"Sensor {self.entity_description.name} has no value. Node: {self.node.Node}"
-            )
+            if value is None:
+                _NO_VALUE_LOGGER.warning(
+                    self.unique_id,
+                    "Sensor %s has no value. Node: %s",
+                    self.entity_description.name,
+                    self.node.Node,
+                )
 
-        return value
+            self._attr_native_value = value
 
     @property
     def available(self) -> bool:
         """Return availability of meter."""
-        return super().available and self.native_value is not None
+        return super().available and self._attr_native_value is not None
+
+
+class DucoDiagnosticSensorEntity(DucoEntity, SensorEntity):
+    """Representation of a Duco integration diagnostic sensor."""
+
+    entity_description: DucoDiagnosticSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: DucoDeviceUpdateCoordinator,
+        entity_description: DucoDiagnosticSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        # Reports on the integration itself, nothing needs to be polled for it
+        self._fetch_target = None
+
+        self.entity_description = entity_description
+        self._attr_unique_id = (
+            f"{coordinator.config_entry.unique_id}_{entity_description.key}"
+        )
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the sensor value."""
+        with self.coordinator.watchdog.section("native_value"):
+            return self.entity_description.value_fn(self.coordinator)
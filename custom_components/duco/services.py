@@ -0,0 +1,61 @@
+"""Services of the Duco integration."""
+
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    ATTR_CYCLES,
+    ATTR_DURATION,
+    DOMAIN,
+    SERVICE_PROFILE,
+    SERVICE_RECORD_TRAFFIC,
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=3): vol.All(
+            cv.positive_int, vol.Range(min=1, max=20)
+        ),
+    }
+)
+RECORD_TRAFFIC_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=300): vol.All(
+            cv.positive_int, vol.Range(min=10, max=3600)
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration, once."""
+    if hass.services.has_service(DOMAIN, SERVICE_PROFILE):
+        return
+
+    async def _async_profile(call: ServiceCall) -> None:
+        """Profile the next update cycles and the entity updates they cause."""
+        for entry in hass.config_entries.async_loaded_entries(DOMAIN):
+            coordinator = entry.runtime_data
+            coordinator.profiler.start(call.data[ATTR_CYCLES])
+            await coordinator.async_request_refresh()
+
+    async def _async_record_traffic(call: ServiceCall) -> None:
+        """Record the traffic with the box to a redacted file."""
+        for entry in hass.config_entries.async_loaded_entries(DOMAIN):
+            coordinator = entry.runtime_data
+            coordinator.capture.start(coordinator.api, call.data[ATTR_DURATION])
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, _async_profile, schema=PROFILE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECORD_TRAFFIC,
+        _async_record_traffic,
+        schema=RECORD_TRAFFIC_SCHEMA,
+    )
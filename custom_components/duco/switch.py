@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import inspect
 from typing import Any
 from dataclasses import dataclass
 from collections.abc import Awaitable, Callable
@@ -12,10 +11,11 @@ from homeassistant.components.switch import (
 )
 from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util.async_ import create_eager_task
 
 from . import DucoConfigEntry
-from .api.private.duco_client import DucoClient
 from .api.DTO.NodeInfoDTO import NodeDataDTO
 from .const import DeviceResponseEntry, LOGGER
 from .coordinator import DucoDeviceUpdateCoordinator
@@ -33,8 +33,8 @@ class DucoSwitchEntityDescription(SwitchEntityDescription):
     action_state: str
     exists_fn: Callable[[DeviceResponseEntry, int, str], bool] = lambda x, y, z: True
     available_fn: Callable[[DeviceResponseEntry, int, str], bool]
-    is_on_fn: Callable[[DeviceResponseEntry], bool | None]
-    set_fn: Callable[[DeviceResponseEntry, DucoClient, int, str, bool], Awaitable[None]]
+    is_on_fn: Callable[[DeviceResponseEntry, int, str], bool | None]
+    set_fn: Callable[[DucoDeviceUpdateCoordinator, int, str, bool], Awaitable[bool]]
 
 
 SWITCHES = [
@@ -57,9 +57,11 @@ SWITCHES = [
             for action in x.node_actions[nidx].Actions
             if action.Action == node_action
         ),
-        is_on_fn=lambda x: str_to_bool(x.action_state),
-        set_fn=lambda x, api, nidx, node_action, value: x.set_node_action_state(
-            api, nidx, node_action, value
+        is_on_fn=lambda x, nidx, node_action: str_to_bool(
+            x.action_state(nidx, node_action)
+        ),
+        set_fn=lambda coordinator, nidx, node_action, value: (
+            coordinator.async_set_node_action_state(nidx, node_action, value)
         ),
     ),
 ]
@@ -70,7 +72,7 @@ async def async_setup_entry(
     entry: DucoConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    LOGGER.debug(f"button:{inspect.currentframe().f_code.co_name}")
+    LOGGER.debug("switch:async_setup_entry")
 
     """Set up the Identify button."""
     add_entities: list[DucoSwitchEntity] = [
@@ -80,6 +82,7 @@ async def async_setup_entry(
         if switch.exists_fn(entry.runtime_data.data, node.Node, switch.action_state)
     ]
 
+    entry.runtime_data.async_track_entities(add_entities)
     async_add_entities(add_entities)
 
 
@@ -116,26 +119,35 @@ class DucoSwitchEntity(DucoEntity, SwitchEntity):
     @property
     def is_on(self) -> bool | None:
         """Return state of the switch."""
-        return self.entity_description.is_on_fn(self.coordinator.data)
+        return self.entity_description.is_on_fn(
+            self.coordinator.data, self._node_id, self._action_state
+        )
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
-        await self.entity_description.set_fn(
-            self.coordinator.data,
-            self.coordinator.api,
-            self._node_id,
-            self.entity_description.action_state,
-            True,
-        )
-        await self.coordinator.async_refresh()
+        await self._async_set_state(True)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
-        await self.entity_description.set_fn(
-            self.coordinator.data,
-            self.coordinator.api,
-            self._node_id,
-            self.entity_description.action_state,
-            False,
+        await self._async_set_state(False)
+
+    async def _async_set_state(self, value: bool) -> None:
+        """Write the state optimistically and confirm it by re-reading the node."""
+        # Start eagerly so the optimistic state is applied before the first await
+        write = create_eager_task(
+            self.entity_description.set_fn(
+                self.coordinator,
+                self._node_id,
+                self.entity_description.action_state,
+                value,
+            )
         )
-        await self.coordinator.async_refresh()
+        self.async_write_ha_state()
+
+        if not await write:
+            self.async_write_ha_state()
+            raise HomeAssistantError(
+                f"Failed to set {self._action_state} for node {self._node_id}"
+            )
+
+        await self.coordinator.async_refresh_node(self._node_id)
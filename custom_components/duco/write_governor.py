@@ -0,0 +1,110 @@
+"""Daily write budget for the Duco box."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DAILY_WRITE_LIMIT,
+    DOMAIN,
+    LOGGER,
+    WRITE_BUDGET_PRESSURE_RATIO,
+)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.write_budget"
+STORAGE_SAVE_DELAY = 10  # seconds
+
+
+def _storage_key(entry_id: str | None) -> str:
+    # The budget is per box, so every entry counts its writes in its own file
+    return f"{STORAGE_KEY}.{entry_id}" if entry_id is not None else STORAGE_KEY
+
+
+async def async_remove_write_budget(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the stored write count of a config entry that was removed."""
+    await Store(hass, STORAGE_VERSION, _storage_key(entry_id)).async_remove()
+
+
+class DucoWriteGovernor:
+    """Counts the writes sent to the box per day and keeps them within budget."""
+
+    _store: Store[dict[str, Any]]
+    _daily_limit: int
+    _day: str
+    _count: int
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str | None,
+        daily_limit: int = DAILY_WRITE_LIMIT,
+    ):
+        self._store = Store(hass, STORAGE_VERSION, _storage_key(entry_id))
+        self._daily_limit = daily_limit
+        self._day = dt_util.now().date().isoformat()
+        self._count = 0
+
+    @property
+    def daily_limit(self) -> int:
+        return self._daily_limit
+
+    @daily_limit.setter
+    def daily_limit(self, value: int):
+        self._daily_limit = value if value > 0 else DAILY_WRITE_LIMIT
+
+    @property
+    def used(self) -> int:
+        self._rollover()
+        return self._count
+
+    @property
+    def remaining(self) -> int:
+        return max(self._daily_limit - self.used, 0)
+
+    @property
+    def under_pressure(self) -> bool:
+        """Return True once most of today's budget has been spent."""
+        return self.remaining <= self._daily_limit * WRITE_BUDGET_PRESSURE_RATIO
+
+    async def async_load(self) -> None:
+        LOGGER.debug("async_load")
+
+        if (data := await self._store.async_load()) is not None:
+            self._day = data.get("day", self._day)
+            self._count = int(data.get("count", 0))
+
+        self._rollover()
+
+    def async_consume(self) -> bool:
+        """Account for one write, returns False when the budget is exhausted."""
+        if self.remaining <= 0:
+            LOGGER.warning(
+                f"Daily write budget of {self._daily_limit} writes exhausted, skipping write"
+            )
+            return False
+
+        self._count += 1
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+        return True
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "day": self._day,
+            "daily_limit": self._daily_limit,
+            "used": self.used,
+            "remaining": self.remaining,
+            "under_pressure": self.under_pressure,
+        }
+
+    def _rollover(self) -> None:
+        if (today := dt_util.now().date().isoformat()) != self._day:
+            self._day = today
+            self._count = 0
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"day": self._day, "count": self._count}
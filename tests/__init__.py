@@ -0,0 +1 @@
+"""Tests for the Duco integration."""
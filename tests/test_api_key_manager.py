@@ -0,0 +1,114 @@
+"""Tests for the fallback of the API key manager after a 401."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
+import pytest
+from aiohttp import RequestInfo
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from custom_components.duco.api.private.api_key_manager import (
+    SECONDS_PER_DAY,
+    ApiKeyManager,
+)
+from custom_components.duco.api.private.box_clock import BoxClock
+from custom_components.duco.api.private.middleware import Request, Response
+from custom_components.duco.api.private.rest_handler import RestHandler
+
+DAY = 20745
+
+
+def _manager(seconds_into_day: float) -> ApiKeyManager:
+    clock = BoxClock()
+    now = time.time()
+    clock.add_sample(DAY * SECONDS_PER_DAY + seconds_into_day, now, now)
+    return ApiKeyManager("RS2315040973", "a4:cf:12:34:56:78", clock)
+
+
+def test_fallback_tries_the_nearest_day() -> None:
+    late = _manager(SECONDS_PER_DAY - 600)
+    late.fallback_key(late.api_key)
+    assert late.box_day == DAY + 1
+
+    early = _manager(600)
+    early.fallback_key(early.api_key)
+    assert early.box_day == DAY - 1
+
+
+def test_fallback_after_a_shift_restores_the_tracked_day() -> None:
+    manager = _manager(SECONDS_PER_DAY - 600)
+    manager.fallback_key(manager.api_key)
+    manager.fallback_key(manager.api_key)
+
+    assert manager.box_day == DAY
+
+
+def test_fallback_ignores_a_key_that_was_already_replaced() -> None:
+    manager = _manager(SECONDS_PER_DAY - 600)
+    rejected = manager.api_key
+
+    shifted = manager.fallback_key(rejected)
+    assert manager.fallback_key(rejected) == shifted
+    assert manager.box_day == DAY + 1
+    assert shifted == manager.key_for_day(DAY + 1) != rejected
+
+
+def test_sync_drops_the_shift() -> None:
+    manager = _manager(SECONDS_PER_DAY - 600)
+    manager.fallback_key(manager.api_key)
+    manager.sync()
+
+    assert manager.box_day == DAY
+
+
+class DayRolloverBox:
+    """Only accepts the key of the next day, like a box that just rolled over."""
+
+    accepted_key: str
+    sent_keys: list[str]
+
+    def __init__(self, accepted_key: str) -> None:
+        self.accepted_key = accepted_key
+        self.sent_keys = []
+
+    async def send(self, request: Request) -> Response:
+        key = request.headers["Api-Key"]
+        self.sent_keys.append(key)
+        # Let the other request of the burst go out with the same key
+        await asyncio.sleep(0)
+
+        url = URL(request.request_url)
+        return Response(
+            200 if key == self.accepted_key else 401,
+            b"{}",
+            RequestInfo(url, request.method, CIMultiDictProxy(CIMultiDict()), url),
+        )
+
+
+@pytest.fixture
+async def handler() -> AsyncIterator[RestHandler]:
+    handler = RestHandler("http://duco.invalid", {})
+    yield handler
+    await handler.close()
+
+
+async def test_concurrent_401s_shift_once(
+    handler: RestHandler, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    manager = _manager(SECONDS_PER_DAY - 600)
+    rejected = manager.api_key
+    box = DayRolloverBox(manager.key_for_day(DAY + 1))
+    monkeypatch.setattr(handler, "_send", box.send)
+    handler.api_key_manager = manager  # rebuilds the chain around the stub
+
+    assert await asyncio.gather(
+        handler.get_with_retries("http://duco.invalid/info/nodes/1"),
+        handler.get_with_retries("http://duco.invalid/info/nodes/2"),
+    ) == [{}, {}]
+
+    assert box.sent_keys == [rejected, rejected, box.accepted_key, box.accepted_key]
+    assert manager.box_day == DAY + 1
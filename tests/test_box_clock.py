@@ -0,0 +1,46 @@
+"""Tests for the estimate of the box clock."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.duco.api.private.box_clock import BoxClock
+
+START = 1_700_000_000.0
+
+
+def _sample(clock: BoxClock, local_time: float, offset: float, drift: float) -> None:
+    box_time = local_time + offset + drift * (local_time - START)
+    # A round trip of zero, Board.Time is truncated to whole seconds
+    clock.add_sample(box_time - 0.5, local_time, local_time)
+
+
+def test_to_local_inverts_box_time_with_an_offset() -> None:
+    clock = BoxClock()
+    _sample(clock, START, 3600.0, 0.0)
+
+    assert clock.box_time(START + 100) == pytest.approx(START + 3700)
+    assert clock.to_local(START + 3700) == pytest.approx(START + 100)
+
+
+def test_to_local_inverts_box_time_with_drift() -> None:
+    clock = BoxClock()
+    for step in range(4):
+        _sample(clock, START + step * 600, 120.0, 50e-6)
+
+    assert clock.drift == pytest.approx(50e-6)
+    for local_time in (START, START + 86_400, START + 30 * 86_400):
+        assert clock.to_local(clock.box_time(local_time)) == pytest.approx(
+            local_time, abs=1e-3
+        )
+
+
+def test_a_clock_step_resets_the_estimate() -> None:
+    clock = BoxClock()
+    for step in range(3):
+        _sample(clock, START + step * 600, 120.0, 50e-6)
+
+    _sample(clock, START + 1800, 7320.0, 0.0)
+
+    assert clock.drift == 0.0
+    assert clock.box_time(START + 1800) == pytest.approx(START + 1800 + 7320.0)
@@ -0,0 +1,64 @@
+"""Tests for the last known good cache of the coordinator."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.duco import cache
+from custom_components.duco.cache import LastKnownGoodCache
+
+
+class FakeTime:
+    now = 1000.0
+
+    @classmethod
+    def monotonic(cls) -> float:
+        return cls.now
+
+
+@pytest.fixture(autouse=True)
+def fake_time(monkeypatch: pytest.MonkeyPatch) -> type[FakeTime]:
+    FakeTime.now = 1000.0
+    monkeypatch.setattr(cache, "time", FakeTime)
+    return FakeTime
+
+
+def test_values_are_served_up_to_the_max_age(fake_time: type[FakeTime]) -> None:
+    nodes: LastKnownGoodCache[int, str] = LastKnownGoodCache(90)
+    nodes.set(1, "box")
+    fake_time.now += 60
+    nodes.set(2, "valve")
+
+    fake_time.now += 30
+    assert nodes.get(1) == "box"
+    assert nodes.values() == {1: "box", 2: "valve"}
+    assert nodes.ages() == {1: 90.0, 2: 30.0}
+
+    fake_time.now += 1
+    assert nodes.get(1) is None
+    assert nodes.values() == {2: "valve"}
+
+
+def test_expire_drops_and_returns_the_old_keys(fake_time: type[FakeTime]) -> None:
+    nodes: LastKnownGoodCache[int, str] = LastKnownGoodCache(90)
+    nodes.set(1, "box")
+    nodes.set(2, "valve")
+    fake_time.now += 60
+    nodes.set(2, "valve")
+
+    fake_time.now += 31
+    assert nodes.expire() == {1}
+    assert nodes.age(1) is None
+    assert nodes.expire() == set()
+    assert nodes.values() == {2: "valve"}
+
+
+def test_a_new_value_restarts_the_age(fake_time: type[FakeTime]) -> None:
+    nodes: LastKnownGoodCache[int, str] = LastKnownGoodCache(90)
+    nodes.set(1, "box")
+    fake_time.now += 100
+    assert nodes.get(1) is None
+
+    nodes.set(1, "box again")
+    assert nodes.get(1) == "box again"
+    assert nodes.age(1) == 0.0
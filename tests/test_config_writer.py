@@ -0,0 +1,103 @@
+"""Tests for the debounced, merged config writes."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from custom_components.duco.api.private.config_writer import NodeConfigWriter
+
+
+class Recorder:
+    """Write function that records the merged writes."""
+
+    writes: list[tuple[int, dict[str, Any]]]
+    result: bool | Exception
+
+    def __init__(self, result: bool | Exception = True) -> None:
+        self.writes = []
+        self.result = result
+
+    async def __call__(self, node_id: int, values: dict[str, Any]) -> bool:
+        self.writes.append((node_id, dict(values)))
+        if isinstance(self.result, Exception):
+            raise self.result
+
+        return self.result
+
+
+async def test_values_of_a_node_are_merged() -> None:
+    recorder = Recorder()
+    writer = NodeConfigWriter(recorder, delay=0.01)
+
+    first = writer.queue(2, "FlowLvlMan1", 20)
+    second = writer.queue(2, "FlowLvlMan2", 60)
+    third = writer.queue(2, "FlowLvlMan1", 25)
+    other = writer.queue(3, "TimeMan", 30)
+    assert writer.pending(2) == {"FlowLvlMan1": 25, "FlowLvlMan2": 60}
+
+    assert await asyncio.gather(first, second, third, other) == [True] * 4
+    assert sorted(recorder.writes) == [
+        (2, {"FlowLvlMan1": 25, "FlowLvlMan2": 60}),
+        (3, {"TimeMan": 30}),
+    ]
+    assert writer.pending(2) == {}
+
+
+async def test_every_queue_restarts_the_delay() -> None:
+    recorder = Recorder()
+    writer = NodeConfigWriter(recorder, delay=0.05)
+
+    writer.queue(2, "FlowLvlMan1", 20)
+    await asyncio.sleep(0.03)
+    last = writer.queue(2, "FlowLvlMan1", 25)
+    await asyncio.sleep(0.03)
+    assert recorder.writes == []
+
+    assert await last
+    assert recorder.writes == [(2, {"FlowLvlMan1": 25})]
+
+
+async def test_discarding_the_last_value_releases_the_waiters() -> None:
+    recorder = Recorder()
+    writer = NodeConfigWriter(recorder, delay=0.01)
+
+    queued = writer.queue(2, "FlowLvlMan1", 20)
+    assert await writer.discard(2, "FlowLvlMan1")
+    assert await queued
+
+    await asyncio.sleep(0.02)
+    assert recorder.writes == []
+    assert writer.pending(2) == {}
+
+
+async def test_discarding_one_value_keeps_the_others() -> None:
+    recorder = Recorder()
+    writer = NodeConfigWriter(recorder, delay=0.01)
+
+    kept = writer.queue(2, "FlowLvlMan2", 60)
+    writer.queue(2, "FlowLvlMan1", 20)
+    assert await writer.discard(2, "FlowLvlMan1")
+    assert await writer.discard(2, "TimeMan")
+
+    assert await kept
+    assert recorder.writes == [(2, {"FlowLvlMan2": 60})]
+
+
+async def test_failed_write_resolves_the_waiters_false() -> None:
+    writer = NodeConfigWriter(Recorder(False), delay=0.01)
+    assert not await writer.queue(2, "FlowLvlMan1", 20)
+
+    writer = NodeConfigWriter(Recorder(RuntimeError("box gone")), delay=0.01)
+    assert not await writer.queue(2, "FlowLvlMan1", 20)
+
+
+async def test_flush_all_writes_what_is_pending() -> None:
+    recorder = Recorder()
+    writer = NodeConfigWriter(recorder, delay=60)
+
+    queued = writer.queue(2, "FlowLvlMan1", 20)
+    await writer.flush_all()
+
+    assert queued.done() and queued.result()
+    assert recorder.writes == [(2, {"FlowLvlMan1": 20})]
@@ -0,0 +1,191 @@
+"""Tests for the coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.duco.api.DTO.NodeConfigDTO import NodeConfigDTO, ValRange
+from custom_components.duco import coordinator as coordinator_module
+from custom_components.duco.coordinator import DucoDeviceUpdateCoordinator
+
+NIDX = 2
+
+
+def _node_config(flow_lvl_man1: int) -> NodeConfigDTO:
+    return NodeConfigDTO(
+        Node=NIDX,
+        SerialBoard=None,
+        SerialDuco=None,
+        FlowLvlAutoMin=None,
+        FlowLvlAutoMax=None,
+        FlowMax=None,
+        FlowLvlMan1=ValRange(Val=flow_lvl_man1, Min=0, Inc=5, Max=50),
+        FlowLvlMan2=None,
+        FlowLvlMan3=None,
+        TimeMan=None,
+        UcErrorMode=None,
+        Co2SetPoint=None,
+        TempDepEnable=None,
+        ShowSensorLvl=None,
+        Name=None,
+    )
+
+
+class FakeBox:
+    """Stands in for the config calls of the client, writes wait for an answer."""
+
+    config: NodeConfigDTO
+    writes: asyncio.Queue[tuple[dict[str, Any], asyncio.Future[bool]]]
+
+    def __init__(self, flow_lvl_man1: int) -> None:
+        self.config = _node_config(flow_lvl_man1)
+        self.writes = asyncio.Queue()
+
+    async def set_node_config_values(self, nidx: int, values: dict[str, Any]) -> bool:
+        answer: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        await self.writes.put((values, answer))
+        if accepted := await answer:
+            self.config = replace(
+                self.config,
+                **{
+                    name: replace(getattr(self.config, name), Val=value)
+                    for name, value in values.items()
+                },
+            )
+
+        return accepted
+
+    async def get_node_config(self, nidx: int) -> NodeConfigDTO:
+        return replace(self.config)
+
+    async def answer(self, accepted: bool) -> dict[str, Any]:
+        values, answer = await self.writes.get()
+        answer.set_result(accepted)
+        return values
+
+
+@pytest.fixture
+async def box() -> FakeBox:
+    return FakeBox(15)
+
+
+@pytest.fixture
+async def coordinator(
+    tmp_path: Path, box: FakeBox
+) -> AsyncIterator[DucoDeviceUpdateCoordinator]:
+    hass = HomeAssistant(str(tmp_path))
+    coordinator = DucoDeviceUpdateCoordinator(hass)
+    coordinator.api.set_node_config_values = box.set_node_config_values  # type: ignore[method-assign]
+    coordinator.api.get_node_config = box.get_node_config  # type: ignore[method-assign]
+    coordinator.data.node_configs[NIDX] = await box.get_node_config(NIDX)
+    yield coordinator
+    await hass.async_stop(force=True)
+
+
+def _shown(coordinator: DucoDeviceUpdateCoordinator) -> int:
+    return coordinator.data.node_configs[NIDX].FlowLvlMan1.Val
+
+
+async def test_failed_write_rolls_back(
+    coordinator: DucoDeviceUpdateCoordinator, box: FakeBox
+) -> None:
+    write = coordinator.async_queue_node_config_value(NIDX, "FlowLvlMan1", 30)
+    assert _shown(coordinator) == 30
+
+    flush = asyncio.create_task(coordinator.config_writer.flush(NIDX))
+    assert await box.answer(False) == {"FlowLvlMan1": 30}
+
+    assert not await flush
+    assert not await write
+    assert _shown(coordinator) == 15
+
+
+async def test_move_during_write_rolls_back_to_confirmed_value(
+    coordinator: DucoDeviceUpdateCoordinator, box: FakeBox
+) -> None:
+    first = coordinator.async_queue_node_config_value(NIDX, "FlowLvlMan1", 30)
+    first_flush = asyncio.create_task(coordinator.config_writer.flush(NIDX))
+    await asyncio.sleep(0)
+
+    # The slider moves again while the first PATCH is in flight
+    second = coordinator.async_queue_node_config_value(NIDX, "FlowLvlMan1", 40)
+    assert _shown(coordinator) == 40
+
+    await box.answer(True)
+    assert await first
+    assert await first_flush
+    # The re-read config replaced the object, the queued value stays on top
+    assert _shown(coordinator) == 40
+
+    second_flush = asyncio.create_task(coordinator.config_writer.flush(NIDX))
+    assert await box.answer(False) == {"FlowLvlMan1": 40}
+    assert not await second_flush
+    assert not await second
+    assert _shown(coordinator) == 30
+
+
+async def test_setting_back_during_write_is_written(
+    coordinator: DucoDeviceUpdateCoordinator, box: FakeBox
+) -> None:
+    coordinator.async_queue_node_config_value(NIDX, "FlowLvlMan1", 30)
+    flush = asyncio.create_task(coordinator.config_writer.flush(NIDX))
+    await asyncio.sleep(0)
+
+    # Back to the value the box held before, the write in flight changes it
+    back = coordinator.async_queue_node_config_value(NIDX, "FlowLvlMan1", 15)
+    await box.answer(True)
+    await flush
+
+    assert coordinator.config_writer.pending(NIDX) == {"FlowLvlMan1": 15}
+    assert _shown(coordinator) == 15
+
+    second_flush = asyncio.create_task(coordinator.config_writer.flush(NIDX))
+    await box.answer(True)
+    assert await second_flush
+    assert await back
+    assert box.config.FlowLvlMan1.Val == 15
+
+
+async def test_confirming_a_write_leaves_the_poll_alone(
+    coordinator: DucoDeviceUpdateCoordinator, box: FakeBox
+) -> None:
+    coordinator.last_update_success = False
+
+    write = coordinator.async_queue_node_config_value(NIDX, "FlowLvlMan1", 30)
+    flush = asyncio.create_task(coordinator.config_writer.flush(NIDX))
+    await box.answer(True)
+
+    assert await flush and await write
+    assert _shown(coordinator) == 30
+    # A failing box stays reported as failing, no refresh was scheduled
+    assert not coordinator.last_update_success
+    assert coordinator._unsub_refresh is None
+
+
+async def test_a_running_retry_is_cancelled_by_the_next_poll(
+    coordinator: DucoDeviceUpdateCoordinator, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    started = asyncio.Event()
+
+    async def slow_node_info(nidx: int) -> None:
+        started.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(coordinator_module, "FAILED_RETRY_DELAY", 0)
+    monkeypatch.setattr(coordinator.api, "get_node_info", slow_node_info)
+    coordinator._async_schedule_retry({NIDX}, False)
+    await asyncio.wait_for(started.wait(), 1)
+    retry = coordinator._retry_task
+    assert retry is not None and not retry.done()
+
+    # What the start of a poll does first
+    coordinator._async_cancel_retry()
+    with pytest.raises(asyncio.CancelledError):
+        await retry
@@ -0,0 +1,145 @@
+"""Tests for the slots and priorities of the request scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.duco.api.private.request_scheduler import (
+    RequestPriority,
+    RequestScheduler,
+)
+
+BACKGROUND = RequestPriority.BACKGROUND
+INTERACTIVE_READ = RequestPriority.INTERACTIVE_READ
+INTERACTIVE_WRITE = RequestPriority.INTERACTIVE_WRITE
+
+
+class Holder:
+    """Takes a slot in a task and keeps it until released."""
+
+    started: asyncio.Event
+    done: asyncio.Event
+    task: asyncio.Task[None]
+
+    def __init__(
+        self,
+        scheduler: RequestScheduler,
+        priority: RequestPriority,
+        order: list[str] | None = None,
+        name: str = "",
+    ) -> None:
+        self.started = asyncio.Event()
+        self.done = asyncio.Event()
+
+        async def hold() -> None:
+            async with scheduler.slot(priority):
+                if order is not None:
+                    order.append(name)
+                self.started.set()
+                await self.done.wait()
+
+        self.task = asyncio.create_task(hold())
+
+    async def release(self) -> None:
+        self.done.set()
+        await self.task
+
+
+async def test_background_leaves_the_last_slot_free() -> None:
+    scheduler = RequestScheduler(3)
+    background = [Holder(scheduler, BACKGROUND) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    assert scheduler.active == 2
+    assert scheduler.queued == 1
+
+    read = Holder(scheduler, INTERACTIVE_READ)
+    await asyncio.wait_for(read.started.wait(), 1)
+    assert scheduler.active == 3
+
+    await read.release()
+    await background[0].release()
+    await asyncio.wait_for(background[2].started.wait(), 1)
+    assert scheduler.active == 2
+
+    for holder in background[1:]:
+        await holder.release()
+    assert scheduler.active == 0
+
+
+async def test_single_slot_still_serves_background() -> None:
+    scheduler = RequestScheduler(1)
+    holder = Holder(scheduler, BACKGROUND)
+
+    await asyncio.wait_for(holder.started.wait(), 1)
+    await holder.release()
+    assert scheduler.active == 0
+
+
+async def test_free_slots_go_to_the_highest_priority() -> None:
+    scheduler = RequestScheduler(1)
+    order: list[str] = []
+    first = Holder(scheduler, INTERACTIVE_READ, order, "first")
+    await first.started.wait()
+
+    waiting = [
+        Holder(scheduler, BACKGROUND, order, "background"),
+        Holder(scheduler, INTERACTIVE_READ, order, "read"),
+        Holder(scheduler, INTERACTIVE_WRITE, order, "write"),
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.queued == 3
+
+    await first.release()
+    for holder in reversed(waiting):
+        await asyncio.wait_for(holder.started.wait(), 1)
+        await holder.release()
+
+    assert order == ["first", "write", "read", "background"]
+
+
+async def test_cancelled_waiter_gives_up_its_place() -> None:
+    scheduler = RequestScheduler(1)
+    first = Holder(scheduler, INTERACTIVE_READ)
+    await first.started.wait()
+
+    cancelled = Holder(scheduler, INTERACTIVE_WRITE)
+    waiting = Holder(scheduler, BACKGROUND)
+    await asyncio.sleep(0)
+
+    cancelled.task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled.task
+    assert scheduler.queued == 1
+
+    await first.release()
+    await asyncio.wait_for(waiting.started.wait(), 1)
+    await waiting.release()
+    assert scheduler.active == 0
+    assert scheduler.queued == 0
+
+
+async def test_cancelled_after_handover_releases_the_slot() -> None:
+    scheduler = RequestScheduler(1)
+    first = Holder(scheduler, INTERACTIVE_READ)
+    await first.started.wait()
+
+    cancelled = Holder(scheduler, INTERACTIVE_READ)
+    await asyncio.sleep(0)
+
+    # The slot is handed over, the waiter is cancelled before it resumes
+    first.done.set()
+    await asyncio.sleep(0)
+    assert first.task.done()
+    cancelled.task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled.task
+
+    assert not cancelled.started.is_set()
+    assert scheduler.active == 0
+
+    last = Holder(scheduler, BACKGROUND)
+    await asyncio.wait_for(last.started.wait(), 1)
+    await last.release()
@@ -0,0 +1,91 @@
+"""Tests for the retries of the REST handler."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+import pytest
+from aiohttp import ClientResponseError, RequestInfo
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from custom_components.duco.api.private.duco_client import DucoClient
+from custom_components.duco.api.private.middleware import Handler, Request, Response
+
+
+class StubBox:
+    """Middleware that answers every attempt itself, nothing is sent."""
+
+    statuses: list[int]
+    requests: list[Request]
+
+    def __init__(self, *statuses: int) -> None:
+        self.statuses = list(statuses)
+        self.requests = []
+
+    async def __call__(self, request: Request, call_next: Handler) -> Response:
+        self.requests.append(request)
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        url = URL(request.request_url)
+        return Response(
+            status,
+            b'{"Code": 0, "Result": "SUCCESS"}',
+            RequestInfo(url, request.method, CIMultiDictProxy(CIMultiDict()), url),
+            reason="stub",
+        )
+
+
+@pytest.fixture
+async def box() -> AsyncIterator[StubBox]:
+    yield StubBox(200)
+
+
+@pytest.fixture
+async def client(box: StubBox) -> AsyncIterator[DucoClient]:
+    client = DucoClient("http://duco.invalid", middleware=(box,))
+    await client.connect(api_key="key")
+    client.rest_handler.base_delay = 0
+    yield client
+    await client.disconnect()
+
+
+async def test_write_succeeds_after_503(client: DucoClient, box: StubBox) -> None:
+    box.statuses = [503, 503, 200]
+
+    assert await client.set_node_action_state(2, "SetVentilationState", "MAN1")
+    assert len(box.requests) == 3
+
+
+async def test_write_fails_when_retries_run_out(
+    client: DucoClient, box: StubBox
+) -> None:
+    box.statuses = [503]
+
+    with pytest.raises(ClientResponseError):
+        await client.rest_handler.post("/action/nodes/2", {"Action": "x"})
+
+    assert len(box.requests) == client.rest_handler.max_retries
+    assert not await client.set_node_action_state(2, "SetVentilationState", "MAN1")
+    assert not await client.set_node_config_values(2, {"FlowLvlMan1": 60})
+
+
+async def test_read_returns_nothing_when_retries_run_out(
+    client: DucoClient, box: StubBox
+) -> None:
+    box.statuses = [503]
+
+    assert await client.rest_handler.get("/info") == {}
+
+
+async def test_nothing_is_counted_with_metrics_disabled(
+    client: DucoClient, box: StubBox
+) -> None:
+    client.rest_handler.request_metrics = False
+    box.statuses = [503, 200]
+
+    assert await client.rest_handler.get("/info") == {"Code": 0, "Result": "SUCCESS"}
+    box.statuses = [400]
+    with pytest.raises(ClientResponseError):
+        await client.rest_handler.post("/action/nodes/2", {"Action": "x"})
+
+    assert client.metrics.as_dict()["endpoints"] == {}
@@ -0,0 +1,55 @@
+"""Tests for the daily write budget of the boxes."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.duco.write_governor import (
+    DucoWriteGovernor,
+    async_remove_write_budget,
+)
+
+
+@pytest.fixture
+async def hass(tmp_path: Path) -> AsyncIterator[HomeAssistant]:
+    hass = HomeAssistant(str(tmp_path))
+    yield hass
+    await hass.async_stop(force=True)
+
+
+async def _save(governor: DucoWriteGovernor) -> None:
+    await governor._store.async_save(governor._data_to_save())
+
+
+async def test_every_box_has_its_own_budget(hass: HomeAssistant) -> None:
+    first = DucoWriteGovernor(hass, "first", daily_limit=10)
+    second = DucoWriteGovernor(hass, "second", daily_limit=10)
+    for _ in range(3):
+        assert first.async_consume()
+    assert second.async_consume()
+    await _save(first)
+    await _save(second)
+
+    first = DucoWriteGovernor(hass, "first", daily_limit=10)
+    second = DucoWriteGovernor(hass, "second", daily_limit=10)
+    await first.async_load()
+    await second.async_load()
+
+    assert first.used == 3
+    assert second.used == 1
+
+
+async def test_removed_entry_starts_over(hass: HomeAssistant) -> None:
+    governor = DucoWriteGovernor(hass, "removed", daily_limit=10)
+    assert governor.async_consume()
+    await _save(governor)
+
+    await async_remove_write_budget(hass, "removed")
+
+    governor = DucoWriteGovernor(hass, "removed", daily_limit=10)
+    await governor.async_load()
+    assert governor.used == 0
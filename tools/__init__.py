@@ -0,0 +1 @@
+"""Development tools for the Duco integration, run with ``python -m tools.<name>``."""
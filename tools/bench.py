@@ -0,0 +1,310 @@
+"""Benchmarks of the poll-to-state pipeline against the simulator.
+
+    python -m tools.bench --nodes 1,10,50,200 --save bench.json
+    python -m tools.bench --compare bench.json
+
+Every benchmark is timed first and then repeated a few times under
+tracemalloc, so the allocation tracking does not skew the timings. Results can
+be stored as a baseline and a later run compared against it; the run fails
+when the median of a benchmark regressed more than the threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .simulator import DucoBoxSimulator, SimulatorConfig
+
+_MANIFEST_PATH = (
+    Path(__file__).resolve().parents[1] / "custom_components/duco/manifest.json"
+)
+
+NODE_COUNTS = (1, 10, 50, 200)
+ALLOCATION_RUNS = 5
+
+
+@dataclass
+class BenchResult:
+    name: str
+    nodes: int
+    samples: list[float]
+    alloc_peak: int  # bytes, largest peak of one run
+    alloc_retained: int  # bytes, still allocated after one run on average
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.nodes}"
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def as_dict(self) -> dict[str, Any]:
+        mean = statistics.fmean(self.samples)
+        return {
+            "runs": len(self.samples),
+            "mean_ms": mean * 1000,
+            "p50_ms": self.percentile(0.5) * 1000,
+            "p95_ms": self.percentile(0.95) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+            "ops_per_s": 1 / mean if mean else None,
+            "alloc_peak_kib": self.alloc_peak / 1024,
+            "alloc_retained_kib": self.alloc_retained / 1024,
+        }
+
+
+class Bench:
+    """Runs the benchmarks for one node count."""
+
+    _iterations: int
+    _results: list[BenchResult]
+
+    def __init__(self, iterations: int) -> None:
+        self._iterations = iterations
+        self._results = []
+
+    @property
+    def results(self) -> list[BenchResult]:
+        return self._results
+
+    def run_sync(
+        self, name: str, nodes: int, func: Callable[[], Any], iterations: int = 0
+    ) -> None:
+        samples = []
+        for _ in range(iterations or self._iterations):
+            started = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - started)
+
+        peak, retained = 0, 0
+        tracemalloc.start()
+        for _ in range(ALLOCATION_RUNS):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            func()
+            current, run_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, run_peak - before)
+            retained += current - before
+        tracemalloc.stop()
+
+        self._add(BenchResult(name, nodes, samples, peak, retained // ALLOCATION_RUNS))
+
+    async def run_async(
+        self,
+        name: str,
+        nodes: int,
+        func: Callable[[], Awaitable[Any]],
+        iterations: int = 0,
+    ) -> None:
+        samples = []
+        for _ in range(iterations or self._iterations):
+            started = time.perf_counter()
+            await func()
+            samples.append(time.perf_counter() - started)
+
+        peak, retained = 0, 0
+        tracemalloc.start()
+        for _ in range(ALLOCATION_RUNS):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            await func()
+            current, run_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, run_peak - before)
+            retained += current - before
+        tracemalloc.stop()
+
+        self._add(BenchResult(name, nodes, samples, peak, retained // ALLOCATION_RUNS))
+
+    def _add(self, result: BenchResult) -> None:
+        self._results.append(result)
+        stats = result.as_dict()
+        print(
+            f"{result.key:<32} p50 {stats['p50_ms']:9.3f} ms  p95 {stats['p95_ms']:9.3f} ms"
+            f"  p99 {stats['p99_ms']:9.3f} ms  {stats['ops_per_s']:10.1f}/s"
+            f"  peak {stats['alloc_peak_kib']:9.1f} KiB"
+        )
+
+
+async def _bench_nodes(bench: Bench, nodes: int, cycles: int) -> None:
+    # Home Assistant is only imported here, the simulator runs without it
+    from dacite import from_dict
+
+    from custom_components.duco.api.DTO.InfoDTO import InfoDTO
+    from custom_components.duco.api.DTO.NodeActionDTO import NodeActionsDTO
+    from custom_components.duco.api.DTO.NodeConfigDTO import NodeConfigDTO
+    from custom_components.duco.api.DTO.NodeInfoDTO import NodeDataDTO
+    from custom_components.duco.api.utils import remove_fields
+    from custom_components.duco.sensor import (
+        SENSORS_DUCOBOX,
+        SENSORS_ZONES,
+        DucoBoxSensorEntity,
+        DucoNodeSensorEntity,
+    )
+
+    from .harness import (
+        async_setup_coordinator,
+        async_unload,
+        create_entry,
+        create_hass,
+    )
+
+    simulator = DucoBoxSimulator(SimulatorConfig(nodes=nodes))
+    server = await simulator.start()
+    hass = create_hass("bench")
+    entry = create_entry(server.url, "bench")
+
+    try:
+        coordinator = await async_setup_coordinator(hass, entry)
+        rest_handler = coordinator.api.rest_handler
+
+        # Request overhead against a box without latency
+        await bench.run_async(
+            "request", nodes, lambda: rest_handler.get("/info/nodes/1")
+        )
+
+        # Decoding, on the payloads as served
+        info = await rest_handler.get("/info")
+        node = await rest_handler.get(f"/info/nodes/{nodes}")
+        nodes_list = await rest_handler.get("/info/nodes")
+        actions = await rest_handler.get(f"/action/nodes/{nodes}")
+        node_config = await rest_handler.get(f"/config/nodes/{nodes}")
+
+        bench.run_sync("remove_fields/info", nodes, lambda: remove_fields(info))
+        bench.run_sync("remove_fields/nodes", nodes, lambda: remove_fields(nodes_list))
+        for dto, payload in (
+            (InfoDTO, remove_fields(info)),
+            (NodeDataDTO, remove_fields(node)),
+            (NodeActionsDTO, actions),
+            (NodeConfigDTO, remove_fields(node_config)),
+        ):
+            bench.run_sync(
+                f"from_dict/{dto.__name__}",
+                nodes,
+                lambda dto=dto, payload=payload: from_dict(dto, payload),
+            )
+
+        # A complete poll, requests included
+        await bench.run_async(
+            "update_cycle", nodes, coordinator._async_update_data, cycles
+        )
+
+        # State evaluation of every sensor after a poll
+        entities: list[Any] = [
+            DucoBoxSensorEntity(coordinator, description)
+            for description in SENSORS_DUCOBOX
+            if description.exists_fn(coordinator.data.info)
+        ]
+        entities.extend(
+            DucoNodeSensorEntity(coordinator, description, node_dto)
+            for node_dto in coordinator.data.nodes.values()
+            for description in SENSORS_ZONES.get(node_dto.General.Type, ())
+            if description.exists_fn(node_dto)
+        )
+
+        def evaluate() -> None:
+            for entity in entities:
+                entity._update_native_value()
+                entity.available
+
+        bench.run_sync("entities", nodes, evaluate)
+
+    finally:
+        await async_unload(hass, entry)
+        await server.close()
+        await hass.async_stop(force=True)
+
+
+def compare(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    threshold: float,
+) -> list[str]:
+    """Print the change against the baseline, returns the regressed benchmarks."""
+    regressions = []
+    print(f"\n{'benchmark':<32} {'p50':>12} {'p95':>12} {'peak':>12}")
+    for key, stats in results.items():
+        if (base := baseline.get(key)) is None:
+            print(f"{key:<32} {'new':>12}")
+            continue
+
+        changes = [
+            (stats[metric] - base[metric]) / base[metric] if base[metric] else 0.0
+            for metric in ("p50_ms", "p95_ms", "alloc_peak_kib")
+        ]
+        regressed = changes[0] > threshold
+        if regressed:
+            regressions.append(key)
+
+        print(
+            f"{key:<32}"
+            + "".join(f" {change:>+11.1%}" for change in changes)
+            + ("  REGRESSION" if regressed else "")
+        )
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--nodes",
+        default=",".join(str(count) for count in NODE_COUNTS),
+        help="comma separated node counts",
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--cycles", type=int, default=20, help="update cycles to time")
+    parser.add_argument("--save", type=Path, help="store the results as a baseline")
+    parser.add_argument("--compare", type=Path, help="baseline to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed p50 regression"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    async def run() -> Bench:
+        bench = Bench(args.iterations)
+        for nodes in (int(count) for count in args.nodes.split(",")):
+            await _bench_nodes(bench, nodes, args.cycles)
+        return bench
+
+    bench = asyncio.run(run())
+    results = {result.key: result.as_dict() for result in bench.results}
+
+    if args.save:
+        args.save.write_text(
+            json.dumps(
+                {
+                    "meta": {
+                        "version": json.loads(_MANIFEST_PATH.read_text())["version"],
+                        "python": platform.python_version(),
+                        "machine": platform.machine(),
+                        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    },
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+        print(f"\nBaseline written to {args.save}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if compare(results, baseline["results"], args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Import the API client of the integration without Home Assistant.
+
+Importing ``custom_components.duco.api`` runs the ``__init__`` of the
+integration first, which imports Home Assistant. The API package does not
+need it, so the tools load the package directory on its own, as ``duco_api``.
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+API_PATH = Path(__file__).resolve().parents[1] / "custom_components/duco/api"
+API_PACKAGE = "duco_api"
+
+
+def load_api() -> ModuleType:
+    if (module := sys.modules.get(API_PACKAGE)) is not None:
+        return module
+
+    spec = importlib.util.spec_from_file_location(
+        API_PACKAGE,
+        API_PATH / "__init__.py",
+        submodule_search_locations=[str(API_PATH)],
+    )
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[API_PACKAGE] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def import_api(name: str) -> ModuleType:
+    """Import a module of the API package, e.g. ``private.recorder``."""
+    load_api()
+    return importlib.import_module(f"{API_PACKAGE}.{name}")
@@ -0,0 +1,319 @@
+"""Command line client for a Duco box (or the simulator), without Home Assistant.
+
+    python -m tools.ducocli --host https://192.168.5.4 info
+    python -m tools.ducocli --host http://127.0.0.1:8080 nodes
+    python -m tools.ducocli watch --interval 10
+    python -m tools.ducocli bench --cycles 100 --concurrency 3
+    python -m tools.ducocli dump --output snapshot.json --redact
+
+It is built on the ``DucoClient`` of the integration, so requests go through
+the same scheduler, retries and middleware, and payloads through the same
+decoders. A poll cycle is the one of the integration: every node and /info
+at once, at background priority.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from dataclasses import asdict
+from typing import Any
+
+from .duco_api import import_api, load_api
+
+
+class LatencyProbe:
+    """Middleware that keeps the latency of every attempt that got a response."""
+
+    samples: list[float]
+
+    def __init__(self) -> None:
+        self.samples = []
+
+    async def __call__(self, request: Any, call_next: Any) -> Any:
+        started = time.perf_counter()
+        response = await call_next(request)
+        self.samples.append(time.perf_counter() - started)
+        return response
+
+    def take(self) -> list[float]:
+        samples, self.samples = self.samples, []
+        return samples
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def _ms(samples: list[float], q: float) -> float | None:
+    return percentile(samples, q) * 1000 if samples else None
+
+
+def _as_dict(dto: Any) -> Any:
+    return asdict(dto) if dto is not None else None
+
+
+async def _connect(args: argparse.Namespace, probe: LatencyProbe) -> Any:
+    client = load_api().DucoClient(
+        args.host,
+        pin_certificate=args.pin_certificate,
+        middleware=(probe,),
+        max_concurrent_requests=getattr(args, "concurrency", None),
+    )
+    await client.connect()
+    if client.api_key_manager is None:
+        await client.disconnect()
+        raise SystemExit(f"Could not reach the box at {args.host}")
+
+    return client
+
+
+async def _nidxs(client: Any) -> list[int]:
+    nodes = await client.get_nodes()
+    if nodes is None:
+        raise SystemExit("Could not read the node list")
+
+    return sorted(node.Node for node in nodes.Nodes if node is not None)
+
+
+async def _poll(client: Any, nidxs: list[int]) -> int:
+    """One poll cycle, returns the number of nodes and modules that failed."""
+    scheduler = import_api("private.request_scheduler")
+
+    if time.time() > client.api_timestamp:
+        await client.update_key()
+
+    with scheduler.request_priority(scheduler.RequestPriority.BACKGROUND):
+        results = await asyncio.gather(
+            *(client.get_node_info(nidx) for nidx in nidxs), client.get_info()
+        )
+
+    return sum(result is None for result in results)
+
+
+async def _info(client: Any, args: argparse.Namespace) -> None:
+    print(json.dumps(_as_dict(await client.get_info()), indent=2, default=str))
+
+
+async def _nodes(client: Any, args: argparse.Namespace) -> None:
+    nidxs = await _nidxs(client)
+    nodes = await asyncio.gather(*(client.get_node_info(nidx) for nidx in nidxs))
+
+    print(
+        f"{'node':>4} {'type':<8} {'name':<16} {'state':<7} {'temp':>6} {'co2':>6} {'rh':>4}"
+    )
+    for nidx, node in zip(nidxs, nodes):
+        if node is None:
+            print(f"{nidx:>4} (unavailable)")
+            continue
+
+        sensor = node.Sensor
+        print(
+            f"{nidx:>4} {node.General.Type:<8} {node.General.Name or '':<16.16}"
+            f" {node.Ventilation.State if node.Ventilation else '':<7}"
+            f" {_value(sensor and sensor.Temp):>6} {_value(sensor and sensor.Co2):>6}"
+            f" {_value(sensor and sensor.Rh):>4}"
+        )
+
+
+def _value(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+async def _watch(client: Any, args: argparse.Namespace) -> None:
+    probe: LatencyProbe = args.probe
+    nidxs = await _nidxs(client)
+    probe.take()
+
+    while True:
+        started = time.perf_counter()
+        failed = await _poll(client, nidxs)
+        elapsed = time.perf_counter() - started
+        latencies = probe.take()
+        print(
+            f"{time.strftime('%H:%M:%S')}  cycle {elapsed * 1000:7.1f} ms"
+            f"  requests {len(latencies):3d}"
+            f"  p50 {_ms(latencies, 0.5) or 0:6.1f} ms"
+            f"  max {max(latencies, default=0) * 1000:6.1f} ms"
+            f"  failed {failed}",
+            flush=True,
+        )
+        await asyncio.sleep(max(args.interval - elapsed, 0))
+
+
+async def _bench(client: Any, args: argparse.Namespace) -> None:
+    probe: LatencyProbe = args.probe
+    nidxs = await _nidxs(client)
+
+    # The first cycle opens the connections, it is not timed
+    await _poll(client, nidxs)
+    probe.take()
+    totals_before = client.metrics.totals()
+
+    cycles: list[float] = []
+    failed = 0
+    started = time.perf_counter()
+    for _ in range(args.cycles):
+        cycle_started = time.perf_counter()
+        failed += await _poll(client, nidxs)
+        cycles.append(time.perf_counter() - cycle_started)
+
+    elapsed = time.perf_counter() - started
+    latencies = probe.take()
+    totals = client.metrics.totals()
+    result = {
+        "host": args.host,
+        "nodes": len(nidxs),
+        "cycles": len(cycles),
+        "concurrency": client.rest_handler.scheduler.max_concurrent,
+        "cycle_ms": {
+            "mean": statistics.fmean(cycles) * 1000,
+            "p50": _ms(cycles, 0.5),
+            "p95": _ms(cycles, 0.95),
+            "p99": _ms(cycles, 0.99),
+            "max": max(cycles) * 1000,
+        },
+        "request_ms": {
+            "p50": _ms(latencies, 0.5),
+            "p95": _ms(latencies, 0.95),
+            "p99": _ms(latencies, 0.99),
+            "max": max(latencies, default=0) * 1000,
+        },
+        "requests_per_s": len(latencies) / elapsed,
+        "failed": failed,
+        "retries": totals["retries"] - totals_before["retries"],
+        "errors": totals["errors"] - totals_before["errors"],
+    }
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(
+        f"{result['cycles']} cycles of {result['nodes']} node(s) at concurrency"
+        f" {result['concurrency']}, {result['requests_per_s']:.1f} requests/s"
+    )
+    for name in ("cycle_ms", "request_ms"):
+        print(
+            f"  {name[:-3]:<8}"
+            + "".join(
+                f"  {key} {value:8.1f} ms"
+                for key, value in result[name].items()
+                if value is not None
+            )
+        )
+    print(
+        f"  failed {result['failed']}, retries {result['retries']},"
+        f" errors {result['errors']}"
+    )
+
+
+async def _dump(client: Any, args: argparse.Namespace) -> None:
+    nidxs = await _nidxs(client)
+
+    async def node_snapshot(nidx: int) -> dict[str, Any]:
+        node, actions, config = await asyncio.gather(
+            client.get_node_info(nidx),
+            client.get_node_supported_actions(nidx),
+            client.get_node_config(nidx),
+        )
+        return {
+            "info": _as_dict(node),
+            "actions": _as_dict(actions),
+            "config": _as_dict(config),
+        }
+
+    api_info, info, config, *nodes = await asyncio.gather(
+        client.get_api_info(),
+        client.get_info(),
+        client.get_config(),
+        *(node_snapshot(nidx) for nidx in nidxs),
+    )
+    snapshot: dict[str, Any] = {
+        "host": args.host,
+        "taken": time.time(),
+        "api": _as_dict(api_info),
+        "info": _as_dict(info),
+        "config": _as_dict(config),
+        "nodes": {str(nidx): node for nidx, node in zip(nidxs, nodes)},
+    }
+    if args.redact:
+        snapshot = import_api("private.recorder").Redactor().redact(snapshot)
+
+    text = json.dumps(snapshot, indent=2, default=str)
+    if args.output == "-":
+        print(text)
+        return
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        file.write(text)
+
+    print(f"Wrote {len(nidxs)} node(s) to {args.output}", file=sys.stderr)
+
+
+async def _run(args: argparse.Namespace) -> None:
+    args.probe = LatencyProbe()
+    client = await _connect(args, args.probe)
+    try:
+        await args.command(client, args)
+
+    finally:
+        await client.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--host", default=import_api("const").API_PRIVATE_URL, help="URL of the box"
+    )
+    parser.add_argument(
+        "--pin-certificate",
+        action="store_true",
+        help="only accept the box certificate shipped with the integration",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="debug logging")
+    commands = parser.add_subparsers(required=True)
+
+    command = commands.add_parser("info", help="print /info")
+    command.set_defaults(command=_info)
+
+    command = commands.add_parser("nodes", help="list the nodes and their readings")
+    command.set_defaults(command=_nodes)
+
+    command = commands.add_parser("watch", help="poll at an interval")
+    command.add_argument("--interval", type=float, default=10.0, help="seconds")
+    command.set_defaults(command=_watch)
+
+    command = commands.add_parser("bench", help="time back-to-back poll cycles")
+    command.add_argument("--cycles", type=int, default=50)
+    command.add_argument(
+        "--concurrency", type=int, default=None, help="concurrent requests"
+    )
+    command.add_argument("--json", action="store_true", help="print the raw results")
+    command.set_defaults(command=_bench)
+
+    command = commands.add_parser("dump", help="write a snapshot of everything")
+    command.add_argument("--output", default="-", help="file, - for stdout")
+    command.add_argument(
+        "--redact", action="store_true", help="replace serials, MACs and network names"
+    )
+    command.set_defaults(command=_dump)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.CRITICAL)
+
+    try:
+        asyncio.run(_run(args))
+
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Runs the coordinator of the integration outside of a Home Assistant install."""
+
+from __future__ import annotations
+
+import tempfile
+from types import MappingProxyType
+
+from homeassistant import config_entries
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from custom_components.duco.const import DOMAIN
+from custom_components.duco.coordinator import DucoDeviceUpdateCoordinator
+
+
+def create_hass(name: str) -> HomeAssistant:
+    return HomeAssistant(tempfile.mkdtemp(prefix=f"duco_{name}_"))
+
+
+def create_entry(url: str, name: str) -> config_entries.ConfigEntry:
+    return config_entries.ConfigEntry(
+        data={CONF_HOST: url},
+        discovery_keys=MappingProxyType({}),
+        domain=DOMAIN,
+        minor_version=1,
+        options={},
+        source=config_entries.SOURCE_USER,
+        subentries_data=None,
+        title=name,
+        unique_id=name,
+        version=1,
+    )
+
+
+async def async_setup_coordinator(
+    hass: HomeAssistant, entry: config_entries.ConfigEntry
+) -> DucoDeviceUpdateCoordinator:
+    """Connect and poll once, like the setup of the entry does."""
+    token = config_entries.current_entry.set(entry)
+    try:
+        coordinator = DucoDeviceUpdateCoordinator(hass)
+
+    finally:
+        config_entries.current_entry.reset(token)
+
+    await coordinator.create_api_connection()
+    coordinator.data = await coordinator._async_update_data()
+    entry.async_on_unload(coordinator.async_close)
+    return coordinator
+
+
+async def async_unload(hass: HomeAssistant, entry: config_entries.ConfigEntry) -> None:
+    """Run the unload callbacks of the entry, which close the coordinator."""
+    await entry._async_process_on_unload(hass)
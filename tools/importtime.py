@@ -0,0 +1,90 @@
+"""Cold-start import time of the API client, with and without Home Assistant.
+
+    python -m tools.importtime --runs 10
+
+Every import is timed in a fresh interpreter, so nothing is cached in
+``sys.modules`` (the bytecode cache on disk is, as in a real start). The
+integration case imports the client the way Home Assistant does, through the
+package of the integration; the standalone cases load the API package on its
+own, see ``tools/duco_api.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parents[1]
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": elapsed,
+    "modules": len(sys.modules),
+    "homeassistant": any(name.startswith("homeassistant") for name in sys.modules),
+}}))
+"""
+
+CASES = {
+    "integration": "import custom_components.duco.api.private.duco_client",
+    "api": "from tools.duco_api import load_api; load_api().DucoClient",
+    "api (lazy)": "from tools.duco_api import load_api; load_api()",
+}
+
+
+def _probe(statement: str) -> dict[str, float | int | bool]:
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(statement=statement)],
+        cwd=_ROOT,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print the raw results")
+    args = parser.parse_args()
+
+    # Warm the bytecode cache, the first import would be timed with compiling
+    for statement in CASES.values():
+        _probe(statement)
+
+    results = {}
+    for name, statement in CASES.items():
+        probes = [_probe(statement) for _ in range(args.runs)]
+        results[name] = {
+            "median_ms": statistics.median(probe["seconds"] for probe in probes) * 1000,
+            "min_ms": min(probe["seconds"] for probe in probes) * 1000,
+            "modules": probes[-1]["modules"],
+            "homeassistant": probes[-1]["homeassistant"],
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    baseline = results["integration"]["median_ms"]
+    print(
+        f"{'':12} {'median ms':>10} {'min ms':>9} {'modules':>8} {'saving':>7}  homeassistant"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:12} {result['median_ms']:10.1f} {result['min_ms']:9.1f}"
+            f" {result['modules']:8d} {1 - result['median_ms'] / baseline:7.0%}"
+            f"  {'yes' if result['homeassistant'] else 'no'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
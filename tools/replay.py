@@ -0,0 +1,128 @@
+"""Serve a traffic recording of a real box, made with ``duco.record_traffic``.
+
+    python -m tools.replay duco_traffic_20250101_120000.jsonl.gz --speed 10
+
+Every endpoint answers with its recorded responses in the order they were
+recorded, starting over when they run out, after the recorded latency divided
+by the speed (0 answers at once). The box time in /info is moved to the
+present, so the integration keeps a sane clock; API keys are not checked.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter, deque
+from typing import Any
+
+from aiohttp import web
+
+from .duco_api import load_api
+from .simulator import SimulatorServer
+
+
+class ReplayServer:
+    """Answers requests with the recorded responses of the same endpoint."""
+
+    _speed: float
+    _header: dict[str, Any]
+    _responses: dict[tuple[str, str], deque[dict[str, Any]]]
+    requests: Counter[str]
+    misses: Counter[str]
+
+    def __init__(self, path: str, speed: float = 1.0) -> None:
+        self._speed = speed
+        self._header, entries = load_api().read_recording(path)
+        self._responses = {}
+        for entry in entries:
+            self._responses.setdefault((entry["m"], entry["p"]), deque()).append(entry)
+
+        self.requests = Counter()
+        self.misses = Counter()
+
+    @property
+    def header(self) -> dict[str, Any]:
+        return self._header
+
+    @property
+    def endpoints(self) -> int:
+        return len(self._responses)
+
+    def _next(self, method: str, path: str) -> dict[str, Any] | None:
+        if (responses := self._responses.get((method, path))) is None:
+            return None
+
+        entry = responses[0]
+        responses.rotate(-1)
+        return entry
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests[f"{request.method} {request.path_qs}"] += 1
+
+        if (entry := self._next(request.method, request.path_qs)) is None:
+            self.misses[f"{request.method} {request.path_qs}"] += 1
+            if request.method == "GET":
+                raise web.HTTPNotFound()
+
+            # Writes that were not recorded are accepted like the box does
+            return web.json_response({"Code": 0, "Result": "SUCCESS"})
+
+        if self._speed:
+            await asyncio.sleep(entry["l"] / self._speed)
+
+        if "b" in entry:
+            body = entry["b"]
+            board = (
+                body.get("General", {}).get("Board") if isinstance(body, dict) else None
+            )
+            if isinstance(board, dict) and isinstance(board.get("Time"), dict):
+                body = json.loads(json.dumps(body))
+                body["General"]["Board"]["Time"]["Val"] = int(time.time())
+
+            return web.json_response(body, status=entry["s"])
+
+        return web.Response(text=entry.get("r", ""), status=entry["s"])
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> SimulatorServer:
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self._handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return SimulatorServer(runner, False)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    replay = ReplayServer(args.recording, args.speed)
+    server = await replay.start(args.host, args.port)
+    print(
+        f"Replaying {replay.header['requests']} request(s) on {replay.endpoints}"
+        f" endpoint(s) at {server.url} (speed {args.speed})"
+    )
+    try:
+        await asyncio.Event().wait()
+
+    finally:
+        print(json.dumps({"requests": replay.requests, "misses": replay.misses}))
+        await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording")
+    parser.add_argument("--speed", type=float, default=1.0, help="0 for no delay")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_serve(args))
+
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Resilience benchmark of the polling pipeline under injected faults.
+
+    python -m tools.resilience --nodes 20 --disconnect 0.1 --error-503 0.05
+    python -m tools.resilience --policies 5:1,3:0.5,2:0.25,1:0 --latency-fault 0.2
+
+Faults are injected on the client side (see ``FaultInjector``), against a
+healthy simulator. Per retry policy (max retries:base delay in seconds) it
+reports how much the poll cycles inflate and how many fail or serve stale
+data compared to a run without faults, and how long it takes until every
+node and /info is fresh again after an outage ends.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from dataclasses import dataclass, fields
+from typing import Any
+
+from .simulator import DucoBoxSimulator, SimulatorConfig
+
+RECOVERY_CYCLES = 50
+
+
+@dataclass
+class RetryPolicy:
+    max_retries: int
+    base_delay: float
+
+    @classmethod
+    def parse(cls, value: str) -> RetryPolicy:
+        max_retries, _, base_delay = value.partition(":")
+        return cls(int(max_retries), float(base_delay or 1))
+
+    def __str__(self) -> str:
+        return f"{self.max_retries}:{self.base_delay:g}"
+
+
+@dataclass
+class CycleStats:
+    durations: list[float]
+    failed: int  # the cycle raised, nothing was received
+    stale: int  # some nodes or /info were served from the cache
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self.durations)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "cycles": len(self.durations),
+            "mean_ms": statistics.fmean(self.durations) * 1000,
+            "p50_ms": self.percentile(0.5) * 1000,
+            "p95_ms": self.percentile(0.95) * 1000,
+            "failed": self.failed,
+            "stale": self.stale,
+        }
+
+
+async def _run_cycles(coordinator: Any, cycles: int) -> CycleStats:
+    stats = CycleStats([], 0, 0)
+    for _ in range(cycles):
+        started = time.perf_counter()
+        try:
+            coordinator.data = await coordinator._async_update_data()
+
+        except Exception as e:
+            stats.failed += 1
+            logging.getLogger(__name__).debug("Cycle failed: %s", e)
+
+        else:
+            if coordinator._retry_unsub is not None:
+                stats.stale += 1
+
+        stats.durations.append(time.perf_counter() - started)
+
+    return stats
+
+
+def _fresh(coordinator: Any, since: float) -> bool:
+    """Whether every node and /info was fetched after the given moment."""
+    elapsed = time.monotonic() - since
+    ages = coordinator.cache_ages
+    return (
+        ages["info"] is not None
+        and ages["info"] < elapsed
+        and all(age < elapsed for age in ages["nodes"].values())
+    )
+
+
+async def _recovery(coordinator: Any, outage: Any, healthy: Any) -> float | None:
+    """Seconds from the end of an outage until all data is fresh again."""
+    from custom_components.duco.api.private.faults import FaultInjector
+
+    coordinator.api.faults = FaultInjector(outage)
+    await _run_cycles(coordinator, 2)
+
+    coordinator.api.faults = FaultInjector(healthy)
+    ended = time.monotonic()
+    for _ in range(RECOVERY_CYCLES):
+        await _run_cycles(coordinator, 1)
+        if _fresh(coordinator, ended):
+            return time.monotonic() - ended
+
+    return None
+
+
+async def _run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    # Home Assistant is only imported here, the simulator runs without it
+    from custom_components.duco.api.private.faults import FaultConfig, FaultInjector
+
+    from .harness import (
+        async_setup_coordinator,
+        async_unload,
+        create_entry,
+        create_hass,
+    )
+
+    faults = FaultConfig(
+        **{
+            field.name: getattr(args, field.name)
+            for field in fields(FaultConfig)
+            if hasattr(args, field.name)
+        }
+    )
+    simulator = DucoBoxSimulator(SimulatorConfig(nodes=args.nodes))
+    server = await simulator.start()
+    hass = create_hass("resilience")
+    results: list[dict[str, Any]] = []
+    try:
+        for policy in args.policies:
+            entry = create_entry(server.url, f"resilience_{policy}")
+            coordinator = await async_setup_coordinator(hass, entry)
+            try:
+                rest_handler = coordinator.api.rest_handler
+                rest_handler.max_retries = policy.max_retries
+                rest_handler.base_delay = policy.base_delay
+
+                baseline = await _run_cycles(coordinator, args.cycles)
+
+                injector = coordinator.api.faults = FaultInjector(faults)
+                faulty = await _run_cycles(coordinator, args.cycles)
+                coordinator.api.faults = None
+
+                recovery = await _recovery(
+                    coordinator,
+                    FaultConfig(disconnect=1.0, seed=args.seed),
+                    FaultConfig(seed=args.seed),
+                )
+
+            finally:
+                await async_unload(hass, entry)
+
+            results.append(
+                {
+                    "policy": str(policy),
+                    "baseline": baseline.as_dict(),
+                    "faults": faulty.as_dict(),
+                    "inflation_p50": faulty.percentile(0.5) / baseline.percentile(0.5),
+                    "inflation_p95": faulty.percentile(0.95)
+                    / baseline.percentile(0.95),
+                    "injected": injector.as_dict(),
+                    "recovery_s": recovery,
+                }
+            )
+
+    finally:
+        await server.close()
+        await hass.async_stop(force=True)
+
+    return results
+
+
+def _print_table(results: list[dict[str, Any]]) -> None:
+    print(
+        f"{'policy':>8} {'p50 ms':>9} {'p95 ms':>9} {'x p50':>7} {'x p95':>7}"
+        f" {'failed':>7} {'stale':>6} {'recovery s':>11}  injected"
+    )
+    for result in results:
+        faulty = result["faults"]
+        recovery = result["recovery_s"]
+        print(
+            f"{result['policy']:>8} {faulty['p50_ms']:9.1f} {faulty['p95_ms']:9.1f}"
+            f" {result['inflation_p50']:7.2f} {result['inflation_p95']:7.2f}"
+            f" {faulty['failed']:7d} {faulty['stale']:6d}"
+            f" {'never' if recovery is None else f'{recovery:.2f}':>11}"
+            f"  {json.dumps(result['injected'])}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=10, help="1 to 200")
+    parser.add_argument("--cycles", type=int, default=50)
+    parser.add_argument(
+        "--policies",
+        type=lambda value: [RetryPolicy.parse(item) for item in value.split(",")],
+        default=[RetryPolicy(5, 1), RetryPolicy(3, 0.5), RetryPolicy(1, 0)],
+        help="comma separated max_retries:base_delay",
+    )
+    parser.add_argument(
+        "--latency-fault",
+        dest="latency",
+        type=float,
+        default=0.0,
+        help="probability per attempt",
+    )
+    parser.add_argument("--latency-delay", type=float, default=1.0, help="seconds")
+    parser.add_argument(
+        "--error-503", type=float, default=0.05, help="probability per attempt"
+    )
+    parser.add_argument(
+        "--disconnect", type=float, default=0.05, help="probability per attempt"
+    )
+    parser.add_argument(
+        "--connect-error", type=float, default=0.0, help="probability per attempt"
+    )
+    parser.add_argument(
+        "--truncate", type=float, default=0.0, help="probability per attempt"
+    )
+    parser.add_argument(
+        "--slow-read", type=float, default=0.0, help="probability per attempt"
+    )
+    parser.add_argument("--slow-read-delay", type=float, default=5.0, help="seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the raw results")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+
+    results = asyncio.run(_run(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_table(results)
+
+    if any(result["recovery_s"] is None for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,739 @@
+"""Stand-in Duco box for offline development and benchmarking.
+
+Serves the endpoints the integration uses with payloads shaped like the ones
+of a real box (the samples in the DTO modules), for any number of nodes:
+
+    python -m tools.simulator --nodes 50 --latency lognormal:0.08:0.5 --error-503 0.02
+
+The simulator is seeded, so a run with the same options serves the same data
+and injects the same faults in the same order of requests.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import ssl
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import web
+
+from .duco_api import import_api
+
+SECONDS_PER_DAY = 86400
+MAX_NODES = 200
+
+# Node types in the order they are assigned to the nodes after the box
+NODE_TYPES = ("UCCO2", "BSRH", "UCBAT", "UCCO2", "UCBAT")
+
+VENTILATION_STATES = (
+    "AUTO",
+    "AUT1",
+    "AUT2",
+    "AUT3",
+    "MAN1",
+    "MAN2",
+    "MAN3",
+    "EMPT",
+    "CNT1",
+    "CNT2",
+    "CNT3",
+    "MAN1x2",
+    "MAN2x2",
+    "MAN3x2",
+    "MAN1x3",
+    "MAN2x3",
+    "MAN3x3",
+)
+
+
+def _load_key_generator() -> Any:
+    return import_api("private.api_key_generator").ApiKeyGenerator()
+
+
+def v(value: Any) -> dict[str, Any]:
+    return {"Val": value}
+
+
+def val_range(value: int, min_value: int, inc: int, max_value: int) -> dict[str, int]:
+    return {"Val": value, "Min": min_value, "Inc": inc, "Max": max_value}
+
+
+class LatencyModel:
+    """Response delay, parsed from ``fixed:<s>``, ``uniform:<low>:<high>``,
+    ``lognormal:<median>:<sigma>`` or ``exponential:<mean>``."""
+
+    _kind: str
+    _args: tuple[float, ...]
+
+    def __init__(self, spec: str = "fixed:0") -> None:
+        kind, *args = spec.split(":")
+        expected = {"fixed": 1, "uniform": 2, "lognormal": 2, "exponential": 1}
+        if kind not in expected or len(args) != expected[kind]:
+            raise ValueError(f"Invalid latency distribution: {spec}")
+
+        self._kind = kind
+        self._args = tuple(float(arg) for arg in args)
+
+    def __str__(self) -> str:
+        return ":".join((self._kind, *(str(arg) for arg in self._args)))
+
+    def sample(self, rng: random.Random) -> float:
+        if self._kind == "uniform":
+            return rng.uniform(*self._args)
+
+        if self._kind == "lognormal":
+            median, sigma = self._args
+            return median * rng.lognormvariate(0, sigma)
+
+        if self._kind == "exponential":
+            return rng.expovariate(1 / self._args[0]) if self._args[0] else 0.0
+
+        return self._args[0]
+
+
+@dataclass
+class SimulatorConfig:
+    nodes: int = 10
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    error_503: float = 0.0
+    disconnect: float = 0.0
+    require_api_key: bool = True
+    scan_wifi: int = 10
+    seed: int = 0
+    board_serial: str = "RS2315040973"
+    mac_address: str = "a4:cf:12:00:00:01"
+
+
+class DucoBoxSimulator:
+    """State and request handling of one simulated box."""
+
+    _config: SimulatorConfig
+    _rng: random.Random
+    _started: float
+    _generator: Any
+    _keys: dict[int, str]
+    _info: dict[str, Any]
+    _nodes: dict[int, dict[str, Any]]
+    _node_configs: dict[int, dict[str, Any]]
+    _config_box: dict[str, Any]
+    requests: Counter[str]
+    faults: Counter[str]
+
+    def __init__(self, config: SimulatorConfig) -> None:
+        if not 1 <= config.nodes <= MAX_NODES:
+            raise ValueError(f"Node count must be between 1 and {MAX_NODES}")
+
+        self._config = config
+        self._rng = random.Random(config.seed)
+        self._started = time.time()
+        self._generator = _load_key_generator()
+        self._keys = {}
+        self.requests = Counter()
+        self.faults = Counter()
+
+        self._info = self._create_info()
+        self._nodes = {}
+        self._node_configs = {}
+        for nidx in range(1, config.nodes + 1):
+            node_type = "BOX" if nidx == 1 else NODE_TYPES[(nidx - 2) % len(NODE_TYPES)]
+            self._nodes[nidx] = self._create_node(nidx, node_type)
+            self._node_configs[nidx] = self._create_node_config(nidx, node_type)
+        self._config_box = self._create_config()
+
+    @property
+    def config(self) -> SimulatorConfig:
+        return self._config
+
+    @property
+    def nodes(self) -> dict[int, dict[str, Any]]:
+        return self._nodes
+
+    @property
+    def info(self) -> dict[str, Any]:
+        return self._info
+
+    def restart(self) -> None:
+        """Reset the uptimes, like a reboot of the box would."""
+        self._started = time.time()
+
+    def uptime(self) -> int:
+        return int(time.time() - self._started)
+
+    def api_key(self, box_time: float | None = None) -> str:
+        day = int((time.time() if box_time is None else box_time) // SECONDS_PER_DAY)
+        if (key := self._keys.get(day)) is None:
+            key = self._keys[day] = self._generator.generate_api_key(
+                self._config.board_serial,
+                self._config.mac_address,
+                day * SECONDS_PER_DAY,
+            )
+
+        return key
+
+    def _create_info(self) -> dict[str, Any]:
+        board = {
+            "ApiVersion": "2.5",
+            "ApiAccessSecurityLvl": 1,
+            "PublicApiVersion": "2.5",
+            "SwVersionComm": "18293.12.5.0",
+            "SwVersionCommBoot": "1.4.0.0",
+            "SwVersionBox": "16056.10.4.0",
+            "SwVersionBoxBoot": "2.0.0.0",
+            "BoxName": "ENERGY",
+            "BoxSubType": 1,
+            "CommSubType": 2,
+            "BoxSubTypeName": "PREMIUM_400",
+            "CommSubTypeName": "CONNECTIVITY_BOARD",
+            "ProductIdBox": 33,
+            "ProductIdComm": 34,
+            "SerialBoardBox": self._config.board_serial,
+            "SerialBoardComm": "RS2310001234",
+            "SerialDucoBox": "P284655-231018-008",
+            "SerialDucoComm": "P301234-230901-001",
+            "UpTime": 0,
+            "Time": 0,
+        }
+        lan = {
+            "Mode": "WIFI_CLIENT",
+            "Ip": "192.168.1.20",
+            "NetMask": "255.255.255.0",
+            "DefaultGateway": "192.168.1.1",
+            "Dns": "192.168.1.1",
+            "Mac": self._config.mac_address,
+            "HostName": "duco_000001",
+            "DucoClientIp": "0.0.0.0",
+            "WifiClientSsid": "Simulated",
+            "RssiWifi": -55,
+        }
+        scan_wifi = [
+            {
+                "Ssid": v(f"Network {i}"),
+                "Rssi": v(-40 - i % 50),
+                "Enc": v("WPA2"),
+                "Channel": v(1 + i % 13),
+            }
+            for i in range(self._config.scan_wifi)
+        ]
+        return {
+            "General": {
+                "Board": {key: v(value) for key, value in board.items()},
+                "Lan": {key: v(value) for key, value in lan.items()}
+                | {"ScanWifi": scan_wifi},
+                "NetworkDuco": {"HomeId": v("0x1a2b3c4d"), "State": v("OPERATIONAL")},
+            },
+            "Diag": {
+                "Errors": [],
+                "SubSystems": [
+                    {"Component": v(component), "Status": v("Ok")}
+                    for component in (
+                        "Ventilation",
+                        "NightBoost",
+                        "VentCool",
+                        "HeatRecovery",
+                        "Azure",
+                        "WeatherHandler",
+                    )
+                ],
+            },
+            "HeatRecovery": {
+                "General": {"TimeFilterRemain": v(152)},
+                "Bypass": {"Pos": v(0), "TempSupTgt": v(210)},
+                "ProtectFrost": {
+                    "State": v(0),
+                    "PressReduct": v(0),
+                    "HeaterOdaPresent": v(False),
+                },
+            },
+            "Ventilation": {
+                "Sensor": {
+                    "TempOda": v(112),
+                    "TempSup": v(198),
+                    "TempEta": v(215),
+                    "TempEha": v(131),
+                },
+                "Fan": {
+                    "SpeedSup": v(1290),
+                    "PressSupTgt": v(86),
+                    "PressSup": v(85),
+                    "PwmLvlSup": v(31),
+                    "PwmSup": v(310),
+                    "SpeedEha": v(1315),
+                    "PressEha": v(90),
+                    "PressEhaTgt": v(91),
+                    "PwmEha": v(320),
+                    "PwmLvlEha": v(32),
+                },
+                "Calibration": {
+                    "Valid": v(True),
+                    "State": v("IDLE"),
+                    "Status": v("SUCCESS"),
+                    "Error": v(0),
+                    "ResistSupZone1": v(113),
+                    "ResistEha": v(118),
+                    "PressSupCfgZone1": v(110),
+                    "PressEha": v(120),
+                    "PressEhaCfg": v(120),
+                    "FlowEhaCfg": v(325),
+                },
+            },
+            "NightBoost": {
+                "General": {
+                    "TempOutsideAvgThs": v(120),
+                    "TempOutsideAvg": v(115),
+                    "TempOutside": v(112),
+                    "TempComfort": v(215),
+                    "TimeCond": v(False),
+                    "TempZone1": v(215),
+                    "FlowLvlReqZone1": v(0),
+                }
+            },
+            "VentCool": {
+                "General": {
+                    "State": v(0),
+                    "TempOutsideAvgThs": v(120),
+                    "TempOutsideAvg": v(115),
+                    "TempInside": v(215),
+                    "TempInsideMin": v(200),
+                    "TempInsideMax": v(240),
+                    "TempComfort": v(215),
+                    "TempOutside": v(112),
+                    "Co2Cond": v(False),
+                }
+            },
+            "WeatherHandler": {
+                "WeatherStation": {"Type": v(0)},
+                "WeatherStationDiag": {"Enable": v(False)},
+            },
+            "Azure": {
+                "Connection": {
+                    "State": v(1),
+                    "Id": v(0),
+                    "HostName": v("duco.azure-devices.net"),
+                    "DeviceId": v(self._config.board_serial),
+                }
+            },
+        }
+
+    def _create_node(self, nidx: int, node_type: str) -> dict[str, Any]:
+        sensor: dict[str, Any] | None = None
+        if node_type == "UCCO2":
+            sensor = {"Temp": 21.5, "Co2": 640, "IaqCo2": 80}
+        elif node_type == "BSRH":
+            sensor = {"Temp": 20.1, "Rh": 55, "IaqRh": 90}
+        elif node_type == "BOX":
+            sensor = {"IaqRh": 85}
+
+        node = {
+            "Node": nidx,
+            "General": {
+                "Type": v(node_type),
+                "SubType": v(0),
+                "NetworkType": v("VIRT" if node_type == "BOX" else "RF"),
+                "Addr": v(nidx),
+                "SubAddr": v(0),
+                "Parent": v(0 if node_type == "BOX" else 1),
+                "Asso": v(0),
+                "SwVersion": v("16056.10.4.0" if node_type == "BOX" else "2.1.0.0"),
+                "SerialBoard": v(
+                    self._config.board_serial if node_type == "BOX" else "n/a"
+                ),
+                "UpTime": v(0),
+                "Identify": v(0),
+                "LinkMode": v(0),
+                "ProductId": v(33 if node_type == "BOX" else 0),
+                "SerialDuco": v("n/a" if nidx > 1 else "P284655-231018-008"),
+                "Name": v(""),
+            },
+            "NetworkDuco": {
+                "CommErrorCtr": v(0),
+                "RssiRfN2M": v(None if node_type == "BOX" else -60),
+                "HopRf": v(None if node_type == "BOX" else 1),
+                "RssiRfN2H": v(None if node_type == "BOX" else -62),
+            },
+            "Ventilation": {
+                "State": v("AUTO"),
+                "TimeStateRemain": v(0),
+                "TimeStateEnd": v(0),
+                "FlowLvlOvrl": v(0),
+                "FlowLvlReqSensor": v(20),
+                "Mode": v("AUTO"),
+                "FlowLvlTgt": v(30),
+                "Pos": v(None),
+            },
+            "Diag": {"Errors": []},
+        }
+        if sensor is not None:
+            node["Sensor"] = {key: v(value) for key, value in sensor.items()}
+
+        return node
+
+    def _create_node_config(self, nidx: int, node_type: str) -> dict[str, Any]:
+        node_config: dict[str, Any] = {
+            "Node": nidx,
+            "SerialBoard": self._config.board_serial if node_type == "BOX" else "n/a",
+            "SerialDuco": "P284655-231018-008" if node_type == "BOX" else "n/a",
+        }
+        if node_type == "BOX":
+            node_config |= {
+                "FlowLvlAutoMin": val_range(30, 10, 5, 100),
+                "FlowLvlAutoMax": val_range(100, 30, 5, 100),
+                "FlowMax": val_range(0, 0, 5, 750),
+            }
+        elif node_type == "UCCO2":
+            node_config |= {"Co2SetPoint": val_range(800, 0, 10, 2000)}
+
+        node_config |= {
+            "FlowLvlMan1": val_range(15, 0, 5, 50),
+            "FlowLvlMan2": val_range(50, 15, 5, 100),
+            "FlowLvlMan3": val_range(100, 50, 5, 100),
+            "TimeMan": val_range(15, 5, 5, 720),
+        }
+        if node_type != "UCBAT":
+            node_config |= {"UcErrorMode": val_range(1, 0, 1, 2)}
+        if node_type == "UCCO2":
+            node_config |= {
+                "TempDepEnable": val_range(1, 0, 1, 1),
+                "ShowSensorLvl": val_range(0, 0, 5, 100),
+            }
+
+        node_config |= {"Name": v("")}
+        return node_config
+
+    def _create_node_actions(self, nidx: int) -> dict[str, Any]:
+        return {
+            "Type": self._nodes[nidx]["General"]["Type"]["Val"],
+            "Node": nidx,
+            "Actions": [
+                {
+                    "Action": "SetVentilationState",
+                    "ValType": "Enum",
+                    "Enum": list(VENTILATION_STATES),
+                },
+                {"Action": "SetParent", "ValType": "Integer"},
+                {"Action": "SetAsso", "ValType": "Integer"},
+                {"Action": "SetLinkMode", "ValType": "Boolean"},
+                {"Action": "SetIdentify", "ValType": "Boolean"},
+                {"Action": "Reboot", "ValType": "None"},
+                {"Action": "ResetConfig", "ValType": "None"},
+            ],
+        }
+
+    def _create_config(self) -> dict[str, Any]:
+        return {
+            "General": {
+                "Time": {
+                    "TimeZone": val_range(1, -11, 1, 12),
+                    "Dst": val_range(1, 0, 1, 1),
+                    "NtpServer": v("pool.ntp.org"),
+                },
+                "Modbus": {
+                    "Addr": val_range(1, 1, 1, 254),
+                    "Offset": val_range(1, 0, 1, 1),
+                    "DailyWriteReqCnt": val_range(100, 0, 1, 10000),
+                },
+                "NodeData": {"UpdateRate": val_range(60, 5, 1, 3600)},
+            },
+            "Ventilation": {
+                "Ctrl": {
+                    "TempDepEnable": val_range(1, 0, 1, 1),
+                    "TempDepThsLow": val_range(160, 100, 1, 240),
+                    "TempDepThsHigh": val_range(240, 160, 1, 350),
+                }
+            },
+            "HeatRecovery": {},
+            "VentCool": {},
+            "NightBoost": {},
+            "WeatherHandler": {},
+            "Firmware": {},
+            "Azure": {},
+        }
+
+    def _drift(self, node: dict[str, Any]) -> None:
+        """Let the sensor values wander a little between reads."""
+        if (sensor := node.get("Sensor")) is None:
+            return
+
+        if "Temp" in sensor:
+            sensor["Temp"]["Val"] = round(
+                min(max(sensor["Temp"]["Val"] + self._rng.uniform(-0.2, 0.2), 15), 28),
+                1,
+            )
+        if "Co2" in sensor:
+            sensor["Co2"]["Val"] = int(
+                min(max(sensor["Co2"]["Val"] + self._rng.randint(-25, 25), 400), 2000)
+            )
+        if "Rh" in sensor:
+            sensor["Rh"]["Val"] = int(
+                min(max(sensor["Rh"]["Val"] + self._rng.randint(-2, 2), 30), 95)
+            )
+
+    def _node_payload(self, nidx: int) -> dict[str, Any]:
+        node = self._nodes[nidx]
+        self._drift(node)
+        node["General"]["UpTime"]["Val"] = self.uptime()
+
+        ventilation = node["Ventilation"]
+        if (end := ventilation["TimeStateEnd"]["Val"]) and end <= time.time():
+            ventilation["State"]["Val"] = "AUTO"
+            ventilation["Mode"]["Val"] = "AUTO"
+            ventilation["TimeStateEnd"]["Val"] = 0
+
+        ventilation["TimeStateRemain"]["Val"] = max(
+            int(ventilation["TimeStateEnd"]["Val"] - time.time()), 0
+        )
+        return node
+
+    def _info_payload(self, module: str | None, submodule: str | None) -> Any:
+        board = self._info["General"]["Board"]
+        board["UpTime"]["Val"] = self.uptime()
+        board["Time"]["Val"] = int(time.time())
+
+        if module is None:
+            return self._info
+
+        info = {module: self._info.get(module) or {}}
+        if submodule is not None:
+            info[module] = {submodule: info[module].get(submodule)}
+
+        return info
+
+    @web.middleware
+    async def _middleware(
+        self, request: web.Request, handler: Any
+    ) -> web.StreamResponse:
+        resource = request.match_info.route.resource
+        endpoint = resource.canonical if resource is not None else request.path
+        self.requests[f"{request.method} {endpoint}"] += 1
+
+        if delay := self._config.latency.sample(self._rng):
+            await asyncio.sleep(delay)
+
+        if self._rng.random() < self._config.error_503:
+            self.faults["503"] += 1
+            raise web.HTTPServiceUnavailable()
+
+        if self._rng.random() < self._config.disconnect:
+            self.faults["disconnect"] += 1
+            if request.transport is not None:
+                request.transport.close()
+            return web.Response()
+
+        public = request.path in ("/api", "/info") and request.method == "GET"
+        if self._config.require_api_key and not public:
+            if request.headers.get("Api-Key") != self.api_key():
+                self.faults["unauthorized"] += 1
+                raise web.HTTPUnauthorized()
+
+        return await handler(request)
+
+    async def _handle_api(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "ApiVersion": v("2.5"),
+                "PublicApiVersion": v("2.5"),
+                "ApiInfo": [
+                    {"Url": v(url), "QueryParameters": [], "Methods": [v("GET")]}
+                    for url in ("/info", "/info/nodes", "/config", "/action")
+                ],
+            }
+        )
+
+    async def _handle_info(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            self._info_payload(
+                request.query.get("module"), request.query.get("submodule")
+            )
+        )
+
+    async def _handle_nodes(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"Nodes": [self._node_payload(nidx) for nidx in self._nodes]}
+        )
+
+    def _nidx(self, request: web.Request) -> int:
+        nidx = int(request.match_info["nidx"])
+        if nidx not in self._nodes:
+            raise web.HTTPNotFound()
+
+        return nidx
+
+    async def _handle_node(self, request: web.Request) -> web.Response:
+        return web.json_response(self._node_payload(self._nidx(request)))
+
+    async def _handle_node_actions(self, request: web.Request) -> web.Response:
+        return web.json_response(self._create_node_actions(self._nidx(request)))
+
+    async def _handle_node_action(self, request: web.Request) -> web.Response:
+        nidx = self._nidx(request)
+        body = await request.json()
+        action, value = body.get("Action"), body.get("Val")
+
+        node = self._nodes[nidx]
+        if action == "SetVentilationState":
+            if value not in VENTILATION_STATES:
+                raise web.HTTPBadRequest(text=f"Invalid state {value}")
+
+            time_man = self._node_configs[nidx]["TimeMan"]["Val"]
+            node["Ventilation"]["State"]["Val"] = value
+            node["Ventilation"]["Mode"]["Val"] = "AUTO" if value == "AUTO" else "MANU"
+            node["Ventilation"]["TimeStateEnd"]["Val"] = (
+                0 if value == "AUTO" else int(time.time()) + time_man * 60
+            )
+
+        elif action == "SetIdentify":
+            node["General"]["Identify"]["Val"] = int(bool(value))
+
+        elif action == "Reboot":
+            node["General"]["UpTime"]["Val"] = 0
+
+        return web.json_response({"Code": 0, "Result": "SUCCESS"})
+
+    async def _handle_node_config(self, request: web.Request) -> web.Response:
+        return web.json_response(self._node_configs[self._nidx(request)])
+
+    async def _handle_node_config_patch(self, request: web.Request) -> web.Response:
+        node_config = self._node_configs[self._nidx(request)]
+        body = await request.json()
+        for key, value in body.items():
+            current = node_config.get(key)
+            if not isinstance(current, dict):
+                raise web.HTTPBadRequest(text=f"Unknown parameter {key}")
+
+            value = value.get("Val") if isinstance(value, dict) else value
+            if "Min" in current and not current["Min"] <= value <= current["Max"]:
+                raise web.HTTPBadRequest(text=f"{key} out of range")
+
+        for key, value in body.items():
+            node_config[key]["Val"] = (
+                value.get("Val") if isinstance(value, dict) else value
+            )
+
+        return web.json_response({"Code": 0, "Result": "SUCCESS"})
+
+    async def _handle_config(self, request: web.Request) -> web.Response:
+        return web.json_response(self._config_box)
+
+    def create_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/api", self._handle_api)
+        app.router.add_get("/info", self._handle_info)
+        app.router.add_get("/info/nodes", self._handle_nodes)
+        app.router.add_get("/info/nodes/{nidx}", self._handle_node)
+        app.router.add_get("/action/nodes/{nidx}", self._handle_node_actions)
+        app.router.add_post("/action/nodes/{nidx}", self._handle_node_action)
+        app.router.add_get("/config/nodes/{nidx}", self._handle_node_config)
+        app.router.add_patch("/config/nodes/{nidx}", self._handle_node_config_patch)
+        app.router.add_get("/config", self._handle_config)
+        return app
+
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        ssl_context: ssl.SSLContext | None = None,
+    ) -> SimulatorServer:
+        runner = web.AppRunner(self.create_app(), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port, ssl_context=ssl_context)
+        await site.start()
+        return SimulatorServer(runner, ssl_context is not None)
+
+
+class SimulatorServer:
+    """A running simulator, ``url`` is what to configure as the box host."""
+
+    _runner: web.AppRunner
+    _url: str
+
+    def __init__(self, runner: web.AppRunner, https: bool) -> None:
+        self._runner = runner
+        host, port = runner.addresses[0][:2]
+        self._url = f"{'https' if https else 'http'}://{host}:{port}"
+
+    @property
+    def url(self) -> str:
+        return self._url
+
+    async def close(self) -> None:
+        await self._runner.cleanup()
+
+
+def add_simulator_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--nodes", type=int, default=10, help="1 to 200, node 1 is the box"
+    )
+    parser.add_argument(
+        "--latency",
+        type=LatencyModel,
+        default=LatencyModel(),
+        help="fixed:<s>, uniform:<low>:<high>, lognormal:<median>:<sigma> or exponential:<mean>",
+    )
+    parser.add_argument(
+        "--error-503", type=float, default=0.0, help="probability per request"
+    )
+    parser.add_argument(
+        "--disconnect", type=float, default=0.0, help="probability per request"
+    )
+    parser.add_argument(
+        "--no-api-key", action="store_true", help="accept requests without a valid key"
+    )
+    parser.add_argument("--scan-wifi", type=int, default=10, help="networks in /info")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def config_from_arguments(args: argparse.Namespace) -> SimulatorConfig:
+    return SimulatorConfig(
+        nodes=args.nodes,
+        latency=args.latency,
+        error_503=args.error_503,
+        disconnect=args.disconnect,
+        require_api_key=not args.no_api_key,
+        scan_wifi=args.scan_wifi,
+        seed=args.seed,
+    )
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    ssl_context = None
+    if args.certfile:
+        ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ssl_context.load_cert_chain(args.certfile, args.keyfile)
+
+    simulator = DucoBoxSimulator(config_from_arguments(args))
+    server = await simulator.start(args.host, args.port, ssl_context)
+    print(
+        f"Simulating a box with {args.nodes} node(s) at {server.url}"
+        f" (latency {args.latency}, 503 {args.error_503}, disconnect {args.disconnect})"
+    )
+    try:
+        await asyncio.Event().wait()
+
+    finally:
+        print(json.dumps({"requests": simulator.requests, "faults": simulator.faults}))
+        await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_simulator_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--certfile", help="serve https with this certificate")
+    parser.add_argument("--keyfile")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_serve(args))
+
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
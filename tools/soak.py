@@ -0,0 +1,236 @@
+"""Long-running soak test for memory, socket and session leaks.
+
+    python -m tools.soak --cycles 5000 --nodes 20 --reload-every 100 --flow-every 50
+
+Polls a simulated box for thousands of cycles, with entry reloads and config
+flow attempts in between, and samples the RSS, tracemalloc, the open file
+descriptors, the open aiohttp sessions and the sessions collected without
+being closed along the way. Fails when one of them keeps growing: when
+everything the last third of the run sampled lies above everything the first
+third (after the warm-up) sampled, plus a tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any
+
+from .simulator import DucoBoxSimulator, add_simulator_arguments, config_from_arguments
+
+WARMUP_SAMPLES = 3
+TOP_ALLOCATIONS = 10
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+    except OSError:
+        # Peak instead of current, still only grows with a leak
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def open_fds() -> int:
+    for path in ("/proc/self/fd", "/dev/fd"):
+        if os.path.isdir(path):
+            return len(os.listdir(path))
+
+    return -1
+
+
+def open_sessions() -> int:
+    from aiohttp import ClientSession
+
+    gc.collect()
+    return sum(
+        1
+        for obj in gc.get_objects()
+        if isinstance(obj, ClientSession) and not obj.closed
+    )
+
+
+@dataclass
+class Metric:
+    name: str
+    unit: str
+    tolerance: float
+    samples: list[float] = field(default_factory=list)
+
+    def growing(self) -> bool:
+        samples = self.samples[WARMUP_SAMPLES:]
+        if len(samples) < 6:
+            return False
+
+        third = len(samples) // 3
+        return min(samples[-third:]) > max(samples[:third]) + self.tolerance
+
+    def describe(self) -> str:
+        first, last = self.samples[0], self.samples[-1]
+        return (
+            f"{self.name:<12} {first:>12.1f} -> {last:>12.1f} {self.unit:<4}"
+            f" (max {max(self.samples):.1f})" + ("  GROWING" if self.growing() else "")
+        )
+
+
+class Soak:
+    """Drives the integration against the simulator and tracks its resources."""
+
+    _args: argparse.Namespace
+    _metrics: dict[str, Metric]
+    _baseline: tracemalloc.Snapshot | None
+    _errors: int
+    _unclosed: int
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self._args = args
+        self._metrics = {
+            "rss": Metric("rss", "MiB", args.rss_tolerance),
+            "tracemalloc": Metric("tracemalloc", "MiB", args.heap_tolerance),
+            "fds": Metric("fds", "", 2),
+            "sessions": Metric("sessions", "", 0),
+            "unclosed": Metric("unclosed", "", 0),
+        }
+        self._baseline = None
+        self._errors = 0
+        self._unclosed = 0
+
+    def sample(self, cycle: int) -> None:
+        gc.collect()
+        values = {
+            "rss": rss_bytes() / 2**20,
+            "tracemalloc": tracemalloc.get_traced_memory()[0] / 2**20,
+            "fds": open_fds(),
+            "sessions": open_sessions(),
+            "unclosed": self._unclosed,
+        }
+        for name, value in values.items():
+            self._metrics[name].samples.append(value)
+
+        if len(self._metrics["rss"].samples) == WARMUP_SAMPLES + 1:
+            self._baseline = tracemalloc.take_snapshot()
+
+        print(
+            f"cycle {cycle:>6}: "
+            + ", ".join(f"{name} {value:.1f}" for name, value in values.items())
+            + f", errors {self._errors}",
+            flush=True,
+        )
+
+    def report(self) -> bool:
+        print()
+        for metric in self._metrics.values():
+            print(metric.describe())
+
+        if self._baseline is not None:
+            print("\nTop allocations since the warm-up:")
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                (tracemalloc.Filter(False, tracemalloc.__file__),)
+            )
+            for stat in snapshot.compare_to(self._baseline, "lineno")[:TOP_ALLOCATIONS]:
+                print(f"  {stat}")
+
+        leaking = [m.name for m in self._metrics.values() if m.growing()]
+        if leaking:
+            print(f"\nUnbounded growth of: {', '.join(leaking)}")
+
+        return not leaking
+
+    async def run(self) -> bool:
+        from custom_components.duco.config_flow import DucoConfigFlow
+
+        from .harness import (
+            async_setup_coordinator,
+            async_unload,
+            create_entry,
+            create_hass,
+        )
+
+        args = self._args
+        simulator = DucoBoxSimulator(config_from_arguments(args))
+        server = await simulator.start()
+        hass = create_hass("soak")
+        entry = create_entry(server.url, "soak")
+
+        # Sessions nobody closed are only noticed when they are collected
+        loop = asyncio.get_running_loop()
+
+        def exception_handler(
+            loop: asyncio.AbstractEventLoop, context: dict[str, Any]
+        ) -> None:
+            if context.get("message", "").startswith("Unclosed"):
+                self._unclosed += 1
+            else:
+                loop.default_exception_handler(context)
+
+        loop.set_exception_handler(exception_handler)
+        tracemalloc.start(args.frames)
+        coordinator = await async_setup_coordinator(hass, entry)
+        started = time.monotonic()
+        try:
+            for cycle in range(1, args.cycles + 1):
+                try:
+                    coordinator.data = await coordinator._async_update_data()
+
+                except Exception as e:
+                    self._errors += 1
+                    logging.getLogger(__name__).debug("Cycle failed: %s", e)
+
+                if args.flow_every and cycle % args.flow_every == 0:
+                    try:
+                        await DucoConfigFlow._async_try_connect(server.url)
+
+                    except Exception:
+                        self._errors += 1
+
+                if args.reload_every and cycle % args.reload_every == 0:
+                    await async_unload(hass, entry)
+                    coordinator = await async_setup_coordinator(hass, entry)
+
+                if cycle % args.sample_every == 0:
+                    self.sample(cycle)
+
+        finally:
+            await async_unload(hass, entry)
+            await server.close()
+            await hass.async_stop(force=True)
+
+        print(
+            f"\n{args.cycles} cycles in {time.monotonic() - started:.0f} s,"
+            f" {sum(simulator.requests.values())} requests, faults {dict(simulator.faults)}"
+        )
+        ok = self.report()
+        tracemalloc.stop()
+        return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_simulator_arguments(parser)
+    parser.add_argument("--cycles", type=int, default=5000)
+    parser.add_argument("--reload-every", type=int, default=100, help="0 to disable")
+    parser.add_argument("--flow-every", type=int, default=50, help="0 to disable")
+    parser.add_argument("--sample-every", type=int, default=100)
+    parser.add_argument("--frames", type=int, default=5, help="tracemalloc depth")
+    parser.add_argument("--rss-tolerance", type=float, default=16, help="MiB")
+    parser.add_argument("--heap-tolerance", type=float, default=2, help="MiB")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+
+    if not asyncio.run(Soak(args).run()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()